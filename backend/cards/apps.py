@@ -6,5 +6,8 @@ class CardsConfig(AppConfig):
     name = 'cards'
 
     def ready(self):
-        """应用启动时导入信号处理器"""
+        """应用启动时导入信号处理器，初始化本地汉字数据库"""
         import cards.signals
+        from cards.services.hanzi_db import init_schema
+
+        init_schema()
@@ -0,0 +1,69 @@
+"""
+回填卡片语义指纹命令
+
+为 semantic_hash 为空的卡片计算指纹。按 id 顺序分批处理，每批提交一次；
+中断后重新运行会从未回填的卡片继续（也可用 --start-id 指定起点）。
+与已有卡片重复的卡片保持为空（见 models.clear_taken_semantic_hashes）。
+
+用法:
+    python manage.py backfill_semantic_hashes
+    python manage.py backfill_semantic_hashes --batch-size 2000 --start-id 150000
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from cards.models import Card, clear_taken_semantic_hashes
+from cards.services.import_export import bulk_update_cards
+
+
+class Command(BaseCommand):
+    help = '为语义指纹为空的卡片回填指纹'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='每批处理的卡片数 (默认 1000)'
+        )
+        parser.add_argument(
+            '--start-id',
+            type=int,
+            default=0,
+            help='从大于该 id 的卡片开始 (默认 0)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = options['start_id']
+
+        pending = Card.objects.filter(semantic_hash='').order_by('id').only('id', 'user_id', 'word', 'metadata')
+
+        start_time = time.time()
+        processed = 0
+        filled = 0
+
+        while True:
+            # 按 id 游标分页，边读边写也不会漏掉或重复处理
+            batch = list(pending.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+
+            for card in batch:
+                card.semantic_hash = card.compute_semantic_hash()
+            with transaction.atomic():
+                clear_taken_semantic_hashes(batch)
+                bulk_update_cards(batch, ['semantic_hash'])
+
+            processed += len(batch)
+            filled += sum(1 for card in batch if card.semantic_hash)
+            last_id = batch[-1].id
+            self.stdout.write(f'已处理 {processed} 张卡片 (最后 id: {last_id})')
+
+        elapsed = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'回填完成！处理 {processed} 张，写入指纹 {filled} 张，'
+                f'{processed - filled} 张与已有卡片重复，耗时 {elapsed:.2f} 秒'
+            )
+        )
@@ -0,0 +1,63 @@
+"""
+ECDICT 查询性能基准
+
+对比原先的 word__iexact（SQLite 中为 LIKE，无法使用索引）与
+LOWER(word) 表达式索引查询在主数据库 ecdict 表上的平均耗时。
+未命中（字典中不存在的词）是全表扫描最坏的情况，也是缓存无法覆盖的情况。
+
+用法:
+    python manage.py benchmark_ecdict_lookup
+    python manage.py benchmark_ecdict_lookup --lookups 200
+"""
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Value
+from django.db.models.functions import Lower
+from cards.models import ECDict
+
+
+class Command(BaseCommand):
+    help = '对比 ECDICT 不区分大小写查询的耗时（命中与未命中）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lookups',
+            type=int,
+            default=100,
+            help='每种情况的查询次数 (默认 100)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['lookups']
+        total = ECDict.objects.count()
+        if not total:
+            self.stdout.write(self.style.ERROR('ecdict 表为空，请先执行 import_ecdict'))
+            return
+
+        step = max(total // count, 1)
+        hits = [word.upper() for word in ECDict.objects.values_list('word', flat=True)[::step][:count]]
+        misses = [f'zz-missing-{random.randrange(10 ** 9)}' for _ in range(count)]
+
+        lookups = [
+            ('iexact', lambda word: ECDict.objects.filter(word__iexact=word).first()),
+            ('LOWER 索引', lambda word: (
+                ECDict.objects.annotate(word_lower=Lower('word'))
+                .filter(word_lower=Lower(Value(word)))
+                .first()
+            )),
+        ]
+
+        self.stdout.write(f'ecdict 共 {total} 条，每种情况查询 {count} 次')
+        results = {}
+        for name, lookup in lookups:
+            for case, words in [('命中', hits), ('未命中', misses)]:
+                start = time.perf_counter()
+                for word in words:
+                    lookup(word)
+                results[name, case] = (time.perf_counter() - start) / len(words) * 1000
+                self.stdout.write(f'{name:<10} {case:<4} 平均 {results[name, case]:9.3f} 毫秒')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'未命中查询提速 {results["iexact", "未命中"] / max(results["LOWER 索引", "未命中"], 1e-9):.0f} 倍'
+        ))
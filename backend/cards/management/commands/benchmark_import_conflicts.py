@@ -0,0 +1,96 @@
+"""
+导入冲突处理性能基准
+
+在一个最终回滚的事务中创建临时用户和卡片，分别用逐条 save() 和
+ImportExportService 的批量写回处理同一批重复卡片，对比耗时和 SQL 条数。
+
+用法:
+    python manage.py benchmark_import_conflicts
+    python manage.py benchmark_import_conflicts --duplicates 10000 --strategy merge
+"""
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from cards.models import Card, Deck
+from cards.services.import_export import ImportExportService
+
+
+class Command(BaseCommand):
+    help = '对比逐条保存与批量写回处理导入冲突的耗时'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--duplicates',
+            type=int,
+            default=10000,
+            help='重复卡片数量 (默认 10000)'
+        )
+        parser.add_argument(
+            '--strategy',
+            choices=['overwrite', 'merge'],
+            default='overwrite',
+            help='冲突处理策略 (默认 overwrite)'
+        )
+
+    def handle(self, *args, **options):
+        count = options['duplicates']
+        strategy = options['strategy']
+
+        with transaction.atomic():
+            user = User.objects.create_user(username='__benchmark_import__', password=None)
+            deck = Deck.objects.create(user=user, name='benchmark')
+            card_data_list = [
+                ImportExportService.convert_anki_to_card_data(
+                    {'Front': f'word{i}', 'Back': f'meaning{i}', 'Tags': 'imported'}, user, deck
+                )
+                for i in range(count)
+            ]
+            Card.objects.bulk_create(
+                [Card(**{**data, 'tags': ['existing']}) for data in card_data_list], batch_size=1000
+            )
+
+            legacy = self._measure(lambda: self._legacy_resolve(card_data_list, user, strategy))
+            bulk = self._measure(lambda: ImportExportService._import_batch(
+                card_data_list, 0, user, strategy, ImportExportService._empty_result()
+            ))
+
+            transaction.set_rollback(True)
+
+        for name, (elapsed, queries) in [('逐条 save()', legacy), ('批量写回', bulk)]:
+            self.stdout.write(f'{name:<12} {elapsed:8.3f} 秒  {queries:6d} 条 SQL')
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} 条重复卡片 ({strategy}): 提速 {legacy[0] / max(bulk[0], 1e-9):.1f} 倍'
+        ))
+
+    @staticmethod
+    def _measure(func):
+        """在保存点内执行并回滚，返回 (耗时, SQL 条数)"""
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        sid = transaction.savepoint()
+        with connection.execute_wrapper(count_queries):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        transaction.savepoint_rollback(sid)
+        return elapsed, len(queries)
+
+    @staticmethod
+    def _legacy_resolve(card_data_list, user, strategy):
+        """原实现: 对每张重复卡片单独 save()"""
+        duplicates = ImportExportService.check_duplicates(card_data_list, user)['duplicates']
+        for idx, existing_card in duplicates:
+            card_data = card_data_list[idx]
+            if strategy == 'overwrite':
+                for key, value in card_data.items():
+                    if key not in ['user', 'semantic_hash']:
+                        setattr(existing_card, key, value)
+            else:
+                existing_card.tags = list(set(existing_card.tags) | set(card_data['tags']))
+                existing_card.metadata.update(card_data['metadata'])
+            existing_card.save()
@@ -0,0 +1,48 @@
+"""
+生成本地汉字字典快照命令
+
+把 data/hanzi_local.db 中合并后的汉字数据写入紧凑的只读快照文件，
+汉字查询直接在内存映射中查找，不再访问 SQLite。本地数据库更新（如 prefetch_hanzi）后重新生成。
+
+用法:
+    python manage.py build_hanzi_blob
+    python manage.py build_hanzi_blob --output ../data/hanzi_local.bin
+"""
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from cards.services.hanzi_blob import build_blob
+
+
+class Command(BaseCommand):
+    help = '生成本地汉字字典的只读快照'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='快照文件路径 (默认 HANZI_BLOB_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['output'] or settings.HANZI_BLOB_PATH
+        if not path:
+            self.stdout.write(self.style.ERROR('未配置 HANZI_BLOB_PATH，请通过 --output 指定文件路径'))
+            return
+
+        start = time.time()
+        try:
+            result = build_blob(path)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'生成失败: {str(e)}'))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'快照已生成: {path}\n'
+                f'汉字: {result["entries"]} 个\n'
+                f'大小: {result["size"] / 1024:.1f} KB\n'
+                f'耗时: {time.time() - start:.2f} 秒'
+            )
+        )
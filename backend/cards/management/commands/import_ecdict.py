@@ -1,13 +1,18 @@
 """
 ECDICT 字典数据导入命令
 
+先写入暂存表，全部写完后再原子替换 ecdict 表，导入期间查询不受影响。
+中断后重新运行同一文件会从上次提交的位置继续（--restart 重新开始）。
+--sidecar 导入到独立的只读字典文件（默认 settings.ECDICT_SIDECAR_PATH）。
+
 用法:
     python manage.py import_ecdict /path/to/stardict.csv
+    python manage.py import_ecdict /path/to/stardict.csv --restart
+    python manage.py import_ecdict /path/to/stardict.csv --sidecar ../data/ecdict.db
 """
-import csv
-import time
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from cards.models import ECDict
+from cards.services.ecdict_loader import LOAD_BATCH_SIZE, build_sidecar, load_ecdict
 
 
 class Command(BaseCommand):
@@ -22,8 +27,8 @@ class Command(BaseCommand):
         parser.add_argument(
             '--batch-size',
             type=int,
-            default=1000,
-            help='批量导入大小 (默认 1000)'
+            default=LOAD_BATCH_SIZE,
+            help=f'每批提交的行数 (默认 {LOAD_BATCH_SIZE})'
         )
         parser.add_argument(
             '--limit',
@@ -31,80 +36,59 @@ class Command(BaseCommand):
             default=None,
             help='限制导入数量 (用于测试)'
         )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='忽略上次中断的进度，重新导入'
+        )
+        parser.add_argument(
+            '--sidecar',
+            nargs='?',
+            const='',
+            default=None,
+            help='导入到独立字典文件 (不指定路径时使用 ECDICT_SIDECAR_PATH)'
+        )
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
-        batch_size = options['batch_size']
-        limit = options['limit']
-
-        self.stdout.write(self.style.SUCCESS(f'开始导入 ECDICT 数据: {csv_file}'))
-        start_time = time.time()
+        sidecar = options['sidecar']
+        if sidecar == '':
+            sidecar = settings.ECDICT_SIDECAR_PATH
+            if not sidecar:
+                self.stdout.write(self.style.ERROR('未配置 ECDICT_SIDECAR_PATH，请在 --sidecar 后指定文件路径'))
+                return
 
-        # 清空现有数据
-        self.stdout.write('清空现有数据...')
-        ECDict.objects.all().delete()
+        target = sidecar or '主数据库'
+        self.stdout.write(self.style.SUCCESS(f'开始导入 ECDICT 数据: {csv_file} -> {target}'))
 
-        # 读取 CSV 文件
-        batch = []
-        total = 0
-        skipped = 0
+        def report(records, rows):
+            self.stdout.write(f'已读取 {records} 行，写入 {rows} 条记录...')
 
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                # ECDICT CSV 格式:
-                # word,phonetic,definition,translation,pos,collins,oxford,tag,bnc,frq,exchange,detail,audio
-                reader = csv.DictReader(f)
-
-                for row in reader:
-                    if limit and total >= limit:
-                        break
-
-                    word = row.get('word', '').strip()
-                    if not word:
-                        skipped += 1
-                        continue
-
-                    # 创建字典对象
-                    entry = ECDict(
-                        word=word,
-                        phonetic=row.get('phonetic', '').strip(),
-                        definition=row.get('definition', '').strip(),
-                        translation=row.get('translation', '').strip(),
-                        pos=row.get('pos', '').strip(),
-                        collins=int(row.get('collins', 0) or 0),
-                        oxford=row.get('oxford', '').strip().lower() in ['1', 'true', 'yes'],
-                        tag=row.get('tag', '').strip(),
-                        bnc=int(row.get('bnc') or 0) if row.get('bnc', '').strip() else None,
-                        frq=int(row.get('frq') or 0) if row.get('frq', '').strip() else None,
-                        exchange=row.get('exchange', '').strip(),
-                        detail=row.get('detail', '').strip(),
-                        audio=row.get('audio', '').strip(),
-                    )
-
-                    batch.append(entry)
-                    total += 1
-
-                    # 批量插入
-                    if len(batch) >= batch_size:
-                        ECDict.objects.bulk_create(batch, ignore_conflicts=True)
-                        batch = []
-                        self.stdout.write(f'已导入 {total} 条记录...')
-
-                # 插入剩余数据
-                if batch:
-                    ECDict.objects.bulk_create(batch, ignore_conflicts=True)
-
-            elapsed = time.time() - start_time
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'\n导入完成！\\n'
-                    f'总计: {total} 条\\n'
-                    f'跳过: {skipped} 条\\n'
-                    f'耗时: {elapsed:.2f} 秒'
-                )
-            )
-
+            kwargs = {
+                'batch_size': options['batch_size'],
+                'limit': options['limit'],
+                'restart': options['restart'],
+                'progress_callback': report,
+            }
+            if sidecar:
+                result = build_sidecar(csv_file, sidecar, **kwargs)
+            else:
+                result = load_ecdict(csv_file, settings.DATABASES['default']['NAME'], **kwargs)
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'文件不存在: {csv_file}'))
+            return
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'导入失败: {str(e)}'))
+            self.stdout.write(self.style.ERROR(f'导入失败: {str(e)}（重新运行可从中断处继续）'))
+            return
+
+        if result['resumed_from']:
+            self.stdout.write(f'从第 {result["resumed_from"]} 行继续导入')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'导入完成！\n'
+                f'总计: {result["rows"]} 条\n'
+                f'跳过: {result["records"] - result["rows"]} 条\n'
+                f'耗时: {result["elapsed"]:.2f} 秒 ({result["rows_per_sec"]:.0f} 行/秒)'
+            )
+        )
@@ -0,0 +1,87 @@
+"""
+预取百度汉语数据命令
+
+按字频顺序遍历本地 hanzi 表，把 hanzi_baidu 中还没有的字提前从百度汉语查好存入本地，
+线上查询就不必在请求线程里等待百度汉语。已有的字会跳过，中断后重新运行即可继续。
+
+用法:
+    python manage.py prefetch_hanzi
+    python manage.py prefetch_hanzi --limit 3000 --workers 4 --rate 5
+"""
+from django.core.management.base import BaseCommand
+from cards.services.hanzi_prefetch import PREFETCH_RATE, PREFETCH_WORKERS, pending_chars, prefetch_hanzi
+
+
+class Command(BaseCommand):
+    help = '预取百度汉语数据到本地汉字数据库'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='只预取字频最高的前 N 个字 (默认全部)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=PREFETCH_WORKERS,
+            help=f'并发请求数 (默认 {PREFETCH_WORKERS})'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=PREFETCH_RATE,
+            help=f'每秒最多请求次数 (默认 {PREFETCH_RATE:g})'
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            default=None,
+            help='百度汉语接口地址 (默认使用线上地址)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            chars = pending_chars(options['limit'])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'读取本地汉字数据库失败: {str(e)}'))
+            return
+
+        if not chars:
+            self.stdout.write(self.style.SUCCESS('没有需要预取的字'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'开始预取 {len(chars)} 个字'))
+
+        reported = [0]
+
+        def report(done, total):
+            if done - reported[0] >= 100 or done == total:
+                reported[0] = done
+                self.stdout.write(f'已完成 {done}/{total}...')
+
+        try:
+            result = prefetch_hanzi(
+                chars,
+                workers=options['workers'],
+                rate=options['rate'],
+                base_url=options['base_url'],
+                progress_callback=report,
+            )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'预取失败: {str(e)}（重新运行可从中断处继续）'))
+            return
+
+        if result['remaining']:
+            self.stdout.write(self.style.WARNING(
+                f'百度汉语不可用，已停止，剩余 {result["remaining"]} 个字（稍后重新运行可继续）'
+            ))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'预取完成！\n'
+                f'保存: {result["saved"]} 个\n'
+                f'未收录: {len(result["not_found"])} 个\n'
+                f'失败: {result["failed"]} 个\n'
+                f'耗时: {result["elapsed"]:.2f} 秒'
+            )
+        )
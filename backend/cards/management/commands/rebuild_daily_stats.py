@@ -0,0 +1,41 @@
+"""
+重建每日复习统计命令
+
+用法:
+    python manage.py rebuild_daily_stats
+    python manage.py rebuild_daily_stats --user alice
+"""
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from cards.services.daily_stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = '根据复习记录为所有用户重建每日复习统计'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            default=None,
+            help='只重建指定用户名的统计'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.all().order_by('id')
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        start_time = time.time()
+        total = 0
+
+        for user in users.iterator():
+            days = rebuild_daily_stats(user)
+            total += 1
+            self.stdout.write(f'{user.username}: {days} 天')
+
+        elapsed = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f'重建完成！共 {total} 个用户，耗时 {elapsed:.2f} 秒')
+        )
@@ -0,0 +1,48 @@
+"""
+重建物化复习队列命令
+
+用法:
+    python manage.py rebuild_review_queues
+    python manage.py rebuild_review_queues --user alice --limit 50
+"""
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from cards.services.review_queue import rebuild_review_queue
+
+
+class Command(BaseCommand):
+    help = '为所有用户重建物化复习队列'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            default=None,
+            help='只重建指定用户名的队列'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=50,
+            help='队列大小限制 (默认 50)'
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        users = User.objects.all().order_by('id')
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        start_time = time.time()
+        total = 0
+
+        for user in users.iterator():
+            queue = rebuild_review_queue(user, limit)
+            total += 1
+            self.stdout.write(f'{user.username}: {len(queue.entries)} 张卡片')
+
+        elapsed = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f'重建完成！共 {total} 个用户，耗时 {elapsed:.2f} 秒')
+        )
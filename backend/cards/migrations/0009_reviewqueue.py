@@ -0,0 +1,36 @@
+# Generated by Django 5.0 on 2026-10-17 17:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0008_aiconfig_custom_chinese_prompt'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entries', models.JSONField(default=list, verbose_name='队列条目')),
+                ('total_new', models.IntegerField(default=0, verbose_name='总新卡数')),
+                ('session_limit', models.IntegerField(default=50, verbose_name='构建时的队列上限')),
+                ('new_quota', models.IntegerField(default=20, verbose_name='新卡配额')),
+                ('valid_until', models.DateTimeField(blank=True, null=True, verbose_name='有效期至')),
+                ('is_stale', models.BooleanField(default=False, verbose_name='需要重建')),
+                ('built_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='构建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review_queue', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '复习队列',
+                'verbose_name_plural': '复习队列',
+            },
+        ),
+    ]
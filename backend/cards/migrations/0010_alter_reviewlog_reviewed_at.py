@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 17:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0009_reviewqueue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reviewlog',
+            name='reviewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='复习时间'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-17 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0010_alter_reviewlog_reviewed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deck',
+            name='scheduler',
+            field=models.CharField(choices=[('sm2', 'SM-2'), ('fsrs', 'FSRS')], default='sm2', max_length=10, verbose_name='调度算法'),
+        ),
+        migrations.AddField(
+            model_name='deck',
+            name='scheduler_params',
+            field=models.JSONField(blank=True, default=dict, verbose_name='调度参数'),
+        ),
+        migrations.AddField(
+            model_name='reviewlog',
+            name='before_difficulty',
+            field=models.FloatField(default=0, verbose_name='复习前难度'),
+        ),
+        migrations.AddField(
+            model_name='reviewlog',
+            name='before_stability',
+            field=models.FloatField(default=0, verbose_name='复习前稳定度'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-17 17:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0011_deck_scheduler'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReviewStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('reviews', models.IntegerField(default=0, verbose_name='复习次数')),
+                ('again_count', models.IntegerField(default=0, verbose_name='Again 次数')),
+                ('hard_count', models.IntegerField(default=0, verbose_name='Hard 次数')),
+                ('good_count', models.IntegerField(default=0, verbose_name='Good 次数')),
+                ('easy_count', models.IntegerField(default=0, verbose_name='Easy 次数')),
+                ('time_spent', models.BigIntegerField(default=0, verbose_name='耗时(毫秒)')),
+                ('new_cards', models.IntegerField(default=0, verbose_name='新学卡片数')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '每日复习统计',
+                'verbose_name_plural': '每日复习统计',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyreviewstats',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_user_daily_stats'),
+        ),
+    ]
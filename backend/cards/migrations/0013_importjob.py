@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-17 17:27
+
+import cards.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0012_dailyreviewstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(blank=True, storage=cards.models.ImportUploadStorage(), upload_to='%Y%m%d/', verbose_name='上传文件')),
+                ('file_name', models.CharField(blank=True, max_length=255, verbose_name='原始文件名')),
+                ('file_size', models.BigIntegerField(default=0, verbose_name='文件大小')),
+                ('file_format', models.CharField(max_length=10, verbose_name='文件格式')),
+                ('card_type', models.CharField(default='en', max_length=2, verbose_name='卡片类型')),
+                ('conflict_strategy', models.CharField(default='skip', max_length=10, verbose_name='冲突处理策略')),
+                ('status', models.CharField(choices=[('pending', '等待中'), ('running', '导入中'), ('completed', '已完成'), ('failed', '失败')], default='pending', max_length=10, verbose_name='状态')),
+                ('total', models.IntegerField(default=0, verbose_name='已处理数')),
+                ('imported', models.IntegerField(default=0, verbose_name='导入成功数')),
+                ('skipped', models.IntegerField(default=0, verbose_name='跳过数')),
+                ('failed', models.IntegerField(default=0, verbose_name='失败数')),
+                ('batches', models.IntegerField(default=0, verbose_name='已处理批次')),
+                ('errors', models.JSONField(default=list, verbose_name='错误列表')),
+                ('duplicates', models.JSONField(default=list, verbose_name='重复项详情')),
+                ('error_message', models.TextField(blank=True, verbose_name='任务失败原因')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('deck', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='cards.deck')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '导入任务',
+                'verbose_name_plural': '导入任务',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='cards_impor_user_id_b7a9c7_idx'), models.Index(fields=['status'], name='cards_impor_status_49310b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0 on 2026-10-17 17:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def clear_duplicate_hashes(apps, schema_editor):
+    """同一用户下重复的语义指纹只保留最早的卡片，其余清空以便创建唯一约束"""
+    Card = apps.get_model('cards', 'Card')
+    groups = (
+        Card.objects.exclude(semantic_hash='')
+        .values('user_id', 'semantic_hash')
+        .annotate(n=Count('id'), first_id=Min('id'))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    for group in groups.iterator():
+        Card.objects.filter(
+            user_id=group['user_id'], semantic_hash=group['semantic_hash']
+        ).exclude(id=group['first_id']).update(semantic_hash='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0013_importjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_duplicate_hashes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='card',
+            name='semantic_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32, verbose_name='语义指纹'),
+        ),
+        migrations.AddConstraint(
+            model_name='card',
+            constraint=models.UniqueConstraint(condition=models.Q(('semantic_hash', ''), _negated=True), fields=('user', 'semantic_hash'), name='unique_user_semantic_hash'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 17:52
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0014_card_unique_semantic_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ecdict',
+            index=models.Index(django.db.models.functions.text.Lower('word'), name='ecdict_word_lower_idx'),
+        ),
+    ]
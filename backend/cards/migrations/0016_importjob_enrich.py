@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0015_ecdict_word_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='enrich',
+            field=models.BooleanField(default=False, verbose_name='用本地字典补全'),
+        ),
+    ]
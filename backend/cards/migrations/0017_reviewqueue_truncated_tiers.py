@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0016_importjob_enrich'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewqueue',
+            name='truncated_tiers',
+            field=models.JSONField(default=list, verbose_name='被截断的层级'),
+        ),
+    ]
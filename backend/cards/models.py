@@ -1,10 +1,17 @@
-from django.db import models
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import datetime
 from cryptography.fernet import Fernet
+import hashlib
 import os
 
+# 查询已占用语义指纹时每条 IN 查询包含的哈希数
+SEMANTIC_HASH_CHUNK_SIZE = 500
+
 
 def get_default_due_date():
     """
@@ -24,6 +31,15 @@ class Deck(models.Model):
     daily_new_limit = models.IntegerField(default=20, verbose_name='每日新卡上限')
     daily_review_limit = models.IntegerField(default=200, verbose_name='每日复习上限')
 
+    # 调度算法
+    SCHEDULER_CHOICES = [
+        ('sm2', 'SM-2'),
+        ('fsrs', 'FSRS'),
+    ]
+    scheduler = models.CharField(max_length=10, choices=SCHEDULER_CHOICES, default='sm2', verbose_name='调度算法')
+    # FSRS: {weights, desired_retention, optimized_at, ...}
+    scheduler_params = models.JSONField(default=dict, blank=True, verbose_name='调度参数')
+
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
 
@@ -39,6 +55,103 @@ class Deck(models.Model):
         return f"{self.user.username} - {self.name}"
 
 
+def generate_semantic_hash(word: str, meaning: str) -> str:
+    """
+    生成语义指纹哈希
+
+    基于核心字段生成 MD5 哈希，用于检测重复卡片。
+    忽略空格和大小写差异。
+
+    Args:
+        word: 单词/汉字
+        meaning: 释义
+
+    Returns:
+        32位 MD5 哈希字符串
+    """
+    # 规范化文本
+    normalized_word = word.strip().lower()
+    normalized_meaning = meaning.strip().lower()
+
+    # 生成哈希
+    content = f"{normalized_word}|{normalized_meaning}"
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def clear_taken_semantic_hashes(cards) -> None:
+    """
+    清空已被其他卡片占用的语义指纹
+
+    (user, semantic_hash) 唯一，同一用户下重复的卡片只有最早的一张保留指纹。
+    已存在于数据库中、或在 cards 中已出现过的指纹会被置空。
+
+    Args:
+        cards: Card 对象列表（semantic_hash 已计算）
+    """
+    by_user = {}
+    for card in cards:
+        if card.semantic_hash:
+            by_user.setdefault(card.user_id, []).append(card)
+
+    for user_id, user_cards in by_user.items():
+        hashes = list({card.semantic_hash for card in user_cards})
+        own_ids = [card.pk for card in user_cards if card.pk]
+        taken = set()
+        for start in range(0, len(hashes), SEMANTIC_HASH_CHUNK_SIZE):
+            taken.update(
+                Card.objects.filter(user_id=user_id, semantic_hash__in=hashes[start:start + SEMANTIC_HASH_CHUNK_SIZE])
+                .exclude(pk__in=own_ids)
+                .values_list('semantic_hash', flat=True)
+            )
+        for card in user_cards:
+            if card.semantic_hash in taken:
+                card.semantic_hash = ''
+            else:
+                taken.add(card.semantic_hash)
+
+
+def hand_over_semantic_hash(user_id: int, semantic_hash: str, word: str) -> None:
+    """
+    持有指纹的卡片删除后，把指纹交给最早创建的同义重复卡片
+
+    重复卡片的指纹为空，无法按指纹查找，先按单词缩小范围再逐张重新计算指纹比较。
+
+    Args:
+        user_id: 用户 ID
+        semantic_hash: 被删除卡片的指纹
+        word: 被删除卡片的单词
+    """
+    candidates = (
+        Card.objects.filter(user_id=user_id, semantic_hash='', word__icontains=word.strip())
+        .order_by('created_at', 'id')
+        .only('id', 'word', 'metadata')
+    )
+    for card in candidates.iterator():
+        if card.compute_semantic_hash() != semantic_hash:
+            continue
+        try:
+            with transaction.atomic():
+                Card.objects.filter(pk=card.pk, semantic_hash='').update(semantic_hash=semantic_hash)
+        except IntegrityError:
+            # 并发新建的卡片已经占用了该指纹
+            pass
+        return
+
+
+class CardQuerySet(models.QuerySet):
+    """卡片查询集"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """批量创建时为未设置语义指纹的卡片计算指纹"""
+        objs = list(objs)
+        missing = [card for card in objs if not card.semantic_hash]
+        if missing:
+            for card in missing:
+                card.semantic_hash = card.compute_semantic_hash()
+            clear_taken_semantic_hashes(missing)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Card(models.Model):
     """卡片模型"""
 
@@ -81,10 +194,9 @@ class Card(models.Model):
     tags = models.JSONField(default=list, verbose_name='标签')
     notes = models.TextField(blank=True, verbose_name='备注')
 
-    # 语义指纹（用于去重）
+    # 语义指纹（用于去重，由 (user, semantic_hash) 唯一约束索引）
     semantic_hash = models.CharField(
         max_length=32,
-        db_index=True,
         editable=False,
         blank=True,
         verbose_name='语义指纹'
@@ -104,10 +216,60 @@ class Card(models.Model):
             models.Index(fields=['user', 'state', 'due_at']),
             models.Index(fields=['-lapses']),  # 难项排序
         ]
+        constraints = [
+            # 同一用户下语义指纹唯一（未计算指纹的卡片除外），导入查重走该索引
+            models.UniqueConstraint(
+                fields=['user', 'semantic_hash'],
+                condition=~models.Q(semantic_hash=''),
+                name='unique_user_semantic_hash',
+            ),
+        ]
+
+    objects = CardQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.word} ({self.get_card_type_display()})"
 
+    @property
+    def meaning(self) -> str:
+        """卡片释义（metadata.meaning，缺省时为 metadata.meaning_zh）"""
+        metadata = self.metadata or {}
+        return str(metadata.get('meaning') or metadata.get('meaning_zh') or '')
+
+    def compute_semantic_hash(self) -> str:
+        """根据单词和释义计算语义指纹"""
+        return generate_semantic_hash(self.word, self.meaning)
+
+    def save(self, *args, **kwargs):
+        """
+        保存时重新计算语义指纹（只更新与指纹无关的字段时跳过）
+
+        查重和写入之间指纹被并发创建的重复卡片占用时，以空指纹重新保存。
+        """
+        update_fields = kwargs.get('update_fields')
+        claiming = False
+        if update_fields is None or not {'word', 'metadata'}.isdisjoint(update_fields):
+            semantic_hash = self.compute_semantic_hash()
+            if semantic_hash != self.semantic_hash or self.pk is None:
+                self.semantic_hash = semantic_hash
+                clear_taken_semantic_hashes([self])
+                claiming = bool(self.semantic_hash)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'semantic_hash'}
+
+        if not claiming:
+            super().save(*args, **kwargs)
+            return
+        try:
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            taken = Card.objects.filter(user_id=self.user_id, semantic_hash=self.semantic_hash).exclude(pk=self.pk)
+            if not taken.exists():
+                raise
+            self.semantic_hash = ''
+            super().save(*args, **kwargs)
+
 
 class ReviewLog(models.Model):
     """复习记录模型"""
@@ -131,6 +293,8 @@ class ReviewLog(models.Model):
     before_ef = models.FloatField(verbose_name='复习前EF')
     before_interval = models.IntegerField(verbose_name='复习前间隔')
     before_due_at = models.DateTimeField(verbose_name='复习前到期时间')
+    before_difficulty = models.FloatField(default=0, verbose_name='复习前难度')
+    before_stability = models.FloatField(default=0, verbose_name='复习前稳定度')
 
     # 复习后的卡片状态
     after_state = models.CharField(max_length=10, verbose_name='复习后状态')
@@ -138,7 +302,7 @@ class ReviewLog(models.Model):
     after_interval = models.IntegerField(verbose_name='复习后间隔')
     after_due_at = models.DateTimeField(verbose_name='复习后到期时间')
 
-    reviewed_at = models.DateTimeField(auto_now_add=True, verbose_name='复习时间')
+    reviewed_at = models.DateTimeField(default=timezone.now, verbose_name='复习时间')
 
     class Meta:
         verbose_name = '复习记录'
@@ -155,6 +319,123 @@ class ReviewLog(models.Model):
         return f"{self.card.word} - {self.get_quality_display()} - {self.reviewed_at.strftime('%Y-%m-%d %H:%M')}"
 
 
+class ReviewQueue(models.Model):
+    """物化的复习队列（每个用户一份，增量维护）"""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='review_queue')
+
+    # 按优先级排序的队列条目: [[card_id, tier], ...]，tier 见 sm2.QUEUE_TIER_*
+    entries = models.JSONField(default=list, verbose_name='队列条目')
+    total_new = models.IntegerField(default=0, verbose_name='总新卡数')
+    session_limit = models.IntegerField(default=50, verbose_name='构建时的队列上限')
+    new_quota = models.IntegerField(default=20, verbose_name='新卡配额')
+    # 构建时候选卡片数超过配额的层级: 这些层级的条目被移出后需要重建以补位
+    truncated_tiers = models.JSONField(default=list, verbose_name='被截断的层级')
+
+    # 下一张未到期卡片的到期时间，到达后队列需要重建
+    valid_until = models.DateTimeField(null=True, blank=True, verbose_name='有效期至')
+    is_stale = models.BooleanField(default=False, verbose_name='需要重建')
+
+    built_at = models.DateTimeField(default=timezone.now, verbose_name='构建时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        verbose_name = '复习队列'
+        verbose_name_plural = '复习队列'
+
+    def __str__(self):
+        return f"{self.user.username} - 复习队列 ({len(self.entries)})"
+
+
+class DailyReviewStats(models.Model):
+    """每个用户每天的复习汇总（复习和撤销时增量维护）"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField(verbose_name='日期')
+
+    reviews = models.IntegerField(default=0, verbose_name='复习次数')
+    again_count = models.IntegerField(default=0, verbose_name='Again 次数')
+    hard_count = models.IntegerField(default=0, verbose_name='Hard 次数')
+    good_count = models.IntegerField(default=0, verbose_name='Good 次数')
+    easy_count = models.IntegerField(default=0, verbose_name='Easy 次数')
+    time_spent = models.BigIntegerField(default=0, verbose_name='耗时(毫秒)')
+    new_cards = models.IntegerField(default=0, verbose_name='新学卡片数')
+
+    class Meta:
+        verbose_name = '每日复习统计'
+        verbose_name_plural = '每日复习统计'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_user_daily_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date} ({self.reviews})"
+
+
+class ImportUploadStorage(FileSystemStorage):
+    """导入任务上传文件的存储（目录取自 settings.IMPORT_UPLOAD_DIR，每次访问时读取）"""
+
+    @property
+    def base_location(self):
+        return settings.IMPORT_UPLOAD_DIR
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+class ImportJob(models.Model):
+    """后台导入任务"""
+
+    STATUS_CHOICES = [
+        ('pending', '等待中'),
+        ('running', '导入中'),
+        ('completed', '已完成'),
+        ('failed', '失败'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    deck = models.ForeignKey(Deck, on_delete=models.CASCADE, related_name='import_jobs')
+
+    # 导入参数
+    file = models.FileField(upload_to='%Y%m%d/', storage=ImportUploadStorage(), blank=True, verbose_name='上传文件')
+    file_name = models.CharField(max_length=255, blank=True, verbose_name='原始文件名')
+    file_size = models.BigIntegerField(default=0, verbose_name='文件大小')
+    file_format = models.CharField(max_length=10, verbose_name='文件格式')
+    card_type = models.CharField(max_length=2, default='en', verbose_name='卡片类型')
+    conflict_strategy = models.CharField(max_length=10, default='skip', verbose_name='冲突处理策略')
+    enrich = models.BooleanField(default=False, verbose_name='用本地字典补全')
+
+    # 进度（每批更新一次）
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='状态')
+    total = models.IntegerField(default=0, verbose_name='已处理数')
+    imported = models.IntegerField(default=0, verbose_name='导入成功数')
+    skipped = models.IntegerField(default=0, verbose_name='跳过数')
+    failed = models.IntegerField(default=0, verbose_name='失败数')
+    batches = models.IntegerField(default=0, verbose_name='已处理批次')
+    errors = models.JSONField(default=list, verbose_name='错误列表')
+    duplicates = models.JSONField(default=list, verbose_name='重复项详情')
+    error_message = models.TextField(blank=True, verbose_name='任务失败原因')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='结束时间')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        verbose_name = '导入任务'
+        verbose_name_plural = '导入任务'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.file_name} ({self.get_status_display()})"
+
+
 class ECDict(models.Model):
     """ECDICT 英语字典模型 (只读数据)"""
 
@@ -179,6 +460,8 @@ class ECDict(models.Model):
         ordering = ['word']
         indexes = [
             models.Index(fields=['word']),
+            # 不区分大小写查询使用 LOWER(word) = LOWER(?) 命中该索引（见 services.ecdict）
+            models.Index(Lower('word'), name='ecdict_word_lower_idx'),
             models.Index(fields=['collins']),
             models.Index(fields=['oxford']),
         ]
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Deck, Card, ReviewLog, AIConfig
+from .models import Deck, Card, ReviewLog, AIConfig, ImportJob
 from .services.svg_generator import generate_svg_card
 from datetime import datetime
 
@@ -41,12 +41,28 @@ class DeckSerializer(serializers.ModelSerializer):
     class Meta:
         model = Deck
         fields = ('id', 'user', 'name', 'description', 'daily_new_limit',
-                  'daily_review_limit', 'card_count', 'created_at', 'updated_at')
+                  'daily_review_limit', 'scheduler', 'scheduler_params',
+                  'card_count', 'created_at', 'updated_at')
         read_only_fields = ('id', 'user', 'created_at', 'updated_at')
 
     def get_card_count(self, obj):
         return obj.cards.count()
 
+    def validate_scheduler_params(self, value):
+        """验证调度参数"""
+        from .services.fsrs import DEFAULT_WEIGHTS
+
+        retention = value.get('desired_retention')
+        if retention is not None and not (isinstance(retention, (int, float)) and 0.7 <= retention <= 0.99):
+            raise serializers.ValidationError('desired_retention 必须在 0.7 到 0.99 之间')
+
+        weights = value.get('weights')
+        if weights is not None and (
+            not isinstance(weights, list) or len(weights) != len(DEFAULT_WEIGHTS)
+        ):
+            raise serializers.ValidationError(f'weights 必须是长度为 {len(DEFAULT_WEIGHTS)} 的数组')
+        return value
+
 
 class CardSerializer(serializers.ModelSerializer):
     """卡片序列化器"""
@@ -120,6 +136,29 @@ class ReviewLogSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'user', 'reviewed_at')
 
 
+class ReviewBatchItemSerializer(serializers.Serializer):
+    """批量复习条目序列化器"""
+    card_id = serializers.IntegerField(required=True)
+    quality = serializers.ChoiceField(
+        choices=[choice for choice, _ in ReviewLog.QUALITY_CHOICES],
+        required=True,
+        help_text='评分 (0=Again, 2=Hard, 4=Good, 5=Easy)'
+    )
+    time_taken = serializers.IntegerField(default=0, min_value=0, help_text='耗时(毫秒)')
+    reviewed_at = serializers.DateTimeField(
+        required=False,
+        allow_null=True,
+        help_text='离线复习时间（可选，默认服务器当前时间）'
+    )
+
+
+class ReviewBatchSerializer(serializers.Serializer):
+    """批量复习提交序列化器"""
+    MAX_ITEMS = 500
+
+    reviews = ReviewBatchItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+
 class CardImportSerializer(serializers.Serializer):
     """卡片导入序列化器"""
     file = serializers.FileField(required=True, help_text='CSV 或 JSON 文件')
@@ -139,6 +178,10 @@ class CardImportSerializer(serializers.Serializer):
         default='skip',
         help_text='冲突处理策略'
     )
+    enrich = serializers.BooleanField(
+        default=False,
+        help_text='用本地字典补全音标、词性、拼音等元数据'
+    )
 
     def validate_deck_id(self, value):
         """验证卡组是否存在且属于当前用户"""
@@ -151,12 +194,38 @@ class CardImportSerializer(serializers.Serializer):
 
     def validate_file(self, value):
         """验证文件大小和类型"""
-        # 限制文件大小为 10MB
-        if value.size > 10 * 1024 * 1024:
-            raise serializers.ValidationError('文件大小不能超过 10MB')
+        # 导入为流式处理，限制文件大小为 500MB
+        if value.size > 500 * 1024 * 1024:
+            raise serializers.ValidationError('文件大小不能超过 500MB')
         return value
 
 
+class ImportJobSerializer(serializers.ModelSerializer):
+    """导入任务序列化器"""
+    job_id = serializers.IntegerField(source='id', read_only=True)
+    throughput = serializers.SerializerMethodField(help_text='处理速度（条/秒）')
+
+    class Meta:
+        model = ImportJob
+        fields = (
+            'job_id', 'deck', 'file_name', 'file_size', 'file_format',
+            'card_type', 'conflict_strategy', 'enrich', 'status',
+            'total', 'imported', 'skipped', 'failed', 'batches',
+            'errors', 'duplicates', 'error_message', 'throughput',
+            'created_at', 'started_at', 'finished_at'
+        )
+        read_only_fields = fields
+
+    def get_throughput(self, obj):
+        """按已处理条数和耗时计算处理速度"""
+        from django.utils import timezone
+
+        if not obj.started_at:
+            return 0
+        elapsed = ((obj.finished_at or timezone.now()) - obj.started_at).total_seconds()
+        return round(obj.total / elapsed, 1) if elapsed > 0 else 0
+
+
 class CardExportSerializer(serializers.Serializer):
     """卡片导出序列化器"""
     format = serializers.ChoiceField(
@@ -169,6 +238,42 @@ class CardExportSerializer(serializers.Serializer):
         allow_null=True,
         help_text='卡组ID（可选，不指定则导出所有）'
     )
+    compact = serializers.BooleanField(
+        default=False,
+        help_text='精简导出（省略 SVG 等体积较大的元数据）'
+    )
+
+
+class DictBatchLookupSerializer(serializers.Serializer):
+    """批量字典查询序列化器（英语单词或汉字）"""
+    MAX_ITEMS = 500
+
+    items = serializers.ListField(
+        child=serializers.CharField(max_length=200, trim_whitespace=True),
+        allow_empty=False,
+        max_length=MAX_ITEMS,
+        help_text='单词或汉字列表'
+    )
+
+
+class PinyinBatchSerializer(serializers.Serializer):
+    """句子多音字读音推断序列化器"""
+    MAX_LENGTH = 2000
+
+    text = serializers.CharField(max_length=MAX_LENGTH, help_text='句子')
+
+
+class InferPinyinSerializer(serializers.Serializer):
+    """多音字读音推断序列化器"""
+
+    char = serializers.CharField(min_length=1, max_length=1, help_text='汉字')
+    context = serializers.CharField(
+        max_length=PinyinBatchSerializer.MAX_LENGTH,
+        required=False,
+        allow_blank=True,
+        default='',
+        help_text='语境（包含该字的句子）',
+    )
 
 
 class AIConfigSerializer(serializers.ModelSerializer):
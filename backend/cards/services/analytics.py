@@ -0,0 +1,249 @@
+"""
+复习分析服务
+
+提供活动热力图、按间隔分段的真实保持率、平均耗时和遗忘次数分布。
+每项分析只需一次分组聚合查询（热力图读取每日统计表），结果按用户分项缓存（键中带用户版本号），
+直到该用户下一次复习、撤销，或新建、删除、导入卡片时失效。
+"""
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from django.core.cache import cache
+from django.db.models import Avg, Case, Count, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from ..models import Card, DailyReviewStats, ReviewLog
+
+# 缓存有效期（秒）；复习时会主动失效，这里只是兜底
+ANALYTICS_CACHE_TIMEOUT = 86400
+
+# 保持率的间隔分段: (标签, 最小间隔, 最大间隔)，最大间隔为 None 表示不设上限
+RETENTION_BUCKETS = [
+    ('1d', 0, 1),
+    ('2-3d', 2, 3),
+    ('4-7d', 4, 7),
+    ('8-14d', 8, 14),
+    ('15-30d', 15, 30),
+    ('1-3m', 31, 90),
+    ('3-6m', 91, 180),
+    ('6m+', 181, None),
+]
+
+# 遗忘次数分布中合并为一组的最小次数
+LAPSE_HISTOGRAM_MAX = 10
+
+
+def _version_key(user_id: int) -> str:
+    return f'analytics:{user_id}:version'
+
+
+def _new_version() -> int:
+    # 版本键丢失（如被缓存淘汰）后重新初始化时不能与旧版本重复，用纳秒时间戳作为起点
+    # （每次失效只加 1，远赶不上时间戳的增长）
+    return time.time_ns()
+
+
+def _version(user_id: int) -> int:
+    """用户分析缓存的当前版本号（首次使用时初始化）"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        # 并发初始化时以先写入的为准
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def invalidate_analytics(user_id: int) -> None:
+    """
+    使用户的分析缓存失效
+
+    递增用户的版本号，旧版本下的缓存项不再被读取，由过期时间自然清理；
+    失效前已开始的计算写回的是旧版本的键，不会覆盖失效后的结果。
+
+    Args:
+        user_id: 用户 ID
+    """
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=None)
+
+
+def _cached(user_id: int, name: str, compute: Callable[[], Dict]) -> Dict:
+    """读取用户当前版本下的一项分析结果，不存在时计算并写回"""
+    key = f'analytics:{user_id}:{_version(user_id)}:{name}'
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, timeout=ANALYTICS_CACHE_TIMEOUT)
+    return result
+
+
+def get_heatmap(user, days: int = 365) -> Dict:
+    """
+    获取活动热力图（最近 days 天每天的复习次数）
+
+    Args:
+        user: User 对象
+        days: 天数
+
+    Returns:
+        {
+            'start_date': 起始日期,
+            'end_date': 结束日期,
+            'days': [{'date': 日期, 'reviews': 复习次数, 'time_spent': 耗时毫秒}, ...]（只含有复习的日期）,
+            'total_reviews': 总复习次数,
+            'active_days': 有复习的天数
+        }
+    """
+    def compute():
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        rows = list(
+            DailyReviewStats.objects.filter(user=user, date__range=(start, end), reviews__gt=0)
+            .order_by('date')
+            .values_list('date', 'reviews', 'time_spent')
+        )
+        return {
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'days': [
+                {'date': day.isoformat(), 'reviews': reviews, 'time_spent': time_spent}
+                for day, reviews, time_spent in rows
+            ],
+            'total_reviews': sum(row[1] for row in rows),
+            'active_days': len(rows),
+        }
+
+    # 窗口随日期滚动，缓存项按当天日期区分
+    return _cached(user.id, f'heatmap:{timezone.localdate().isoformat()}:{days}', compute)
+
+
+def get_retention(user) -> Dict:
+    """
+    按复习前间隔分段统计真实保持率（只统计复习阶段的卡片）
+
+    Args:
+        user: User 对象
+
+    Returns:
+        {
+            'buckets': [{'bucket': 标签, 'reviews': 复习次数, 'passed': 通过次数, 'retention': 保持率}, ...],
+            'overall': 总体保持率
+        }
+    """
+    def compute():
+        bucket = Case(
+            *[
+                When(
+                    Q(before_interval__gte=low) & (Q(before_interval__lte=high) if high is not None else Q()),
+                    then=Value(index),
+                )
+                for index, (_, low, high) in enumerate(RETENTION_BUCKETS)
+            ],
+            output_field=IntegerField(),
+        )
+        rows = {
+            row['bucket']: row
+            for row in ReviewLog.objects.filter(user=user, before_state='review')
+            .annotate(bucket=bucket)
+            .values('bucket')
+            .annotate(reviews=Count('id'), passed=Count('id', filter=Q(quality__gte=3)))
+            .order_by()
+        }
+
+        buckets: List[Dict] = []
+        for index, (label, _, _) in enumerate(RETENTION_BUCKETS):
+            row = rows.get(index, {'reviews': 0, 'passed': 0})
+            buckets.append({
+                'bucket': label,
+                'reviews': row['reviews'],
+                'passed': row['passed'],
+                'retention': round(row['passed'] / row['reviews'], 4) if row['reviews'] else None,
+            })
+
+        total = sum(b['reviews'] for b in buckets)
+        passed = sum(b['passed'] for b in buckets)
+        return {
+            'buckets': buckets,
+            'overall': round(passed / total, 4) if total else None,
+        }
+
+    return _cached(user.id, 'retention', compute)
+
+
+def get_time_stats(user) -> Dict:
+    """
+    统计平均每张卡片的复习耗时（总体及按评分）
+
+    Args:
+        user: User 对象
+
+    Returns:
+        {
+            'reviews': 复习次数,
+            'total_time': 总耗时毫秒,
+            'average_time': 平均耗时毫秒,
+            'by_quality': {'0': 平均耗时, '2': ..., '4': ..., '5': ...}
+        }
+    """
+    def compute():
+        qualities = [quality for quality, _ in ReviewLog.QUALITY_CHOICES]
+        aggregates = ReviewLog.objects.filter(user=user).aggregate(
+            reviews=Count('id'),
+            total_time=Sum('time_taken'),
+            average_time=Avg('time_taken'),
+            **{f'avg_{q}': Avg('time_taken', filter=Q(quality=q)) for q in qualities},
+        )
+        return {
+            'reviews': aggregates['reviews'],
+            'total_time': aggregates['total_time'] or 0,
+            'average_time': round(aggregates['average_time'] or 0),
+            'by_quality': {
+                str(q): round(aggregates[f'avg_{q}']) if aggregates[f'avg_{q}'] is not None else None
+                for q in qualities
+            },
+        }
+
+    return _cached(user.id, 'time', compute)
+
+
+def get_lapse_histogram(user) -> Dict:
+    """
+    统计卡片遗忘次数分布（LAPSE_HISTOGRAM_MAX 次及以上合并为一组）
+
+    Args:
+        user: User 对象
+
+    Returns:
+        {
+            'histogram': [{'lapses': 遗忘次数, 'cards': 卡片数}, ...],
+            'max_bucket': 合并组的最小次数
+        }
+    """
+    def compute():
+        lapses = Case(
+            When(lapses__gte=LAPSE_HISTOGRAM_MAX, then=Value(LAPSE_HISTOGRAM_MAX)),
+            default='lapses',
+            output_field=IntegerField(),
+        )
+        counts = dict(
+            Card.objects.filter(user=user)
+            .annotate(bucket=lapses)
+            .values_list('bucket')
+            .annotate(cards=Count('id'))
+            .order_by()
+        )
+        return {
+            'histogram': [
+                {'lapses': n, 'cards': counts.get(n, 0)}
+                for n in range(LAPSE_HISTOGRAM_MAX + 1)
+            ],
+            'max_bucket': LAPSE_HISTOGRAM_MAX,
+        }
+
+    return _cached(user.id, 'lapses', compute)
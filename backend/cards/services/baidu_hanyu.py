@@ -2,20 +2,110 @@
 百度汉语API查询服务
 
 实现从百度汉语网站抓取汉字信息
+
+连续失败（网络错误、非 200、返回内容无法解析）达到 BAIDU_HANYU_FAILURE_THRESHOLD 次后熔断，
+BAIDU_HANYU_COOLDOWN 秒内直接报不可用而不再发请求；冷却结束后放行一次试探请求，
+成功则恢复，失败则重新熔断。
 """
+import asyncio
 import requests
 import re
+import threading
+import time
+import weakref
+import httpx
 from bs4 import BeautifulSoup
+from django.conf import settings
 from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 事件循环 -> 异步 HTTP 客户端
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+# 负责在事件循环结束时关闭客户端的任务（事件循环只保留任务的弱引用）
+_closing_tasks = set()
+
+
+async def _close_when_loop_ends(client: httpx.AsyncClient) -> None:
+    """
+    一直等待到被取消后关闭客户端
+
+    asyncio.run（包括 async_to_sync 在 WSGI 下为每个请求创建的事件循环）和 ASGI 服务器退出时
+    都会先取消事件循环中剩余的任务，再关闭事件循环。
+    """
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await client.aclose()
+
+
+class BaiduHanyuUnavailable(Exception):
+    """百度汉语不可用（请求失败或熔断中）"""
+
+
+class CircuitBreaker:
+    """
+    熔断器（进程内）
+
+    Args:
+        failure_threshold: 连续失败多少次后熔断
+        cooldown: 熔断持续秒数
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """是否可以发请求（熔断中返回 False，冷却结束后只放行一个试探请求）"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """是否处于熔断状态"""
+        return self._opened_at is not None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"百度汉语连续失败 {self._failures} 次，{self.cooldown} 秒内不再请求")
+                self._opened_at = time.monotonic()
+
 
 class BaiduHanyuService:
     """百度汉语查询服务"""
 
     BASE_URL = "https://hanyu.baidu.com/hanyu/ajax/search_list"
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    TIMEOUT = 5
+
+    # 进程内共用的熔断器
+    breaker = CircuitBreaker(
+        failure_threshold=settings.BAIDU_HANYU_FAILURE_THRESHOLD,
+        cooldown=settings.BAIDU_HANYU_COOLDOWN,
+    )
 
     @classmethod
     def lookup(cls, char: str) -> Optional[Dict]:
@@ -29,48 +119,130 @@ class BaiduHanyuService:
             包含汉字信息的字典,如果查询失败返回None
         """
         try:
-            # 发送请求到百度汉语API
-            params = {
-                'wd': char,
-                'ptype': 'zici'  # 字词查询
-            }
+            return cls.fetch(char)
+        except BaiduHanyuUnavailable:
+            return None
+
+    @classmethod
+    def fetch(cls, char: str, base_url: Optional[str] = None) -> Optional[Dict]:
+        """
+        查询汉字信息，区分“未收录”和“不可用”
+
+        Args:
+            char: 要查询的汉字
+            base_url: 接口地址，默认 BASE_URL（测试时指向本地服务）
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+        Returns:
+            包含汉字信息的字典，百度汉语未收录该字时返回 None
+
+        Raises:
+            BaiduHanyuUnavailable: 请求失败或熔断中
+        """
+        if not cls.breaker.allow():
+            raise BaiduHanyuUnavailable('百度汉语熔断中')
 
+        try:
+            # 发送请求到百度汉语API
             response = requests.get(
-                cls.BASE_URL,
-                params=params,
-                headers=headers,
-                timeout=5
+                base_url or cls.BASE_URL,
+                params=cls._params(char),
+                headers=cls.HEADERS,
+                timeout=cls.TIMEOUT
+            )
+        except requests.RequestException as e:
+            logger.error(f"百度汉语查询网络错误: {e}")
+            cls.breaker.record_failure()
+            raise BaiduHanyuUnavailable(str(e)) from e
+
+        return cls._handle_response(response, char)
+
+    @classmethod
+    async def afetch(cls, char: str, base_url: Optional[str] = None) -> Optional[Dict]:
+        """
+        fetch 的异步版本（异步视图使用，不占用线程）
+
+        Args:
+            char: 要查询的汉字
+            base_url: 接口地址，默认 BASE_URL
+
+        Returns:
+            包含汉字信息的字典，百度汉语未收录该字时返回 None
+
+        Raises:
+            BaiduHanyuUnavailable: 请求失败或熔断中
+        """
+        if not cls.breaker.allow():
+            raise BaiduHanyuUnavailable('百度汉语熔断中')
+
+        try:
+            response = await cls._async_client().get(
+                base_url or cls.BASE_URL,
+                params=cls._params(char),
+                headers=cls.HEADERS,
+                timeout=cls.TIMEOUT
             )
+        except httpx.HTTPError as e:
+            logger.error(f"百度汉语查询网络错误: {e}")
+            cls.breaker.record_failure()
+            raise BaiduHanyuUnavailable(str(e)) from e
+
+        return cls._handle_response(response, char)
 
+    @classmethod
+    def _async_client(cls) -> httpx.AsyncClient:
+        """当前事件循环共用的异步 HTTP 客户端（复用连接，事件循环结束时关闭）"""
+        loop = asyncio.get_running_loop()
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = httpx.AsyncClient()
+            task = loop.create_task(_close_when_loop_ends(client))
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+        return client
+
+    @staticmethod
+    def _params(char: str) -> Dict:
+        return {
+            'wd': char,
+            'ptype': 'zici'  # 字词查询
+        }
+
+    @classmethod
+    def _handle_response(cls, response, char: str) -> Optional[Dict]:
+        """
+        处理百度汉语的响应（requests 和 httpx 的响应对象都可以）并记录熔断器状态
+
+        Returns:
+            标准化的汉字信息字典，未收录时返回 None
+
+        Raises:
+            BaiduHanyuUnavailable: 非 200 或返回内容无法解析
+        """
+        try:
             if response.status_code != 200:
-                logger.warning(f"百度汉语API返回状态码: {response.status_code}")
-                return None
+                raise BaiduHanyuUnavailable(f"百度汉语API返回状态码: {response.status_code}")
 
             data = response.json()
 
             # 检查返回数据
             if not data.get('ret_array') or len(data['ret_array']) == 0:
                 logger.info(f"百度汉语未找到字符: {char}")
-                return None
-
-            # 提取第一个结果
-            item = data['ret_array'][0]
-
-            # 解析返回数据
-            result = cls._parse_result(item, char)
-
-            return result
-
-        except requests.RequestException as e:
-            logger.error(f"百度汉语查询网络错误: {e}")
-            return None
+                result = None
+            else:
+                # 提取第一个结果并解析
+                result = cls._parse_result(data['ret_array'][0], char)
+
+        except BaiduHanyuUnavailable as e:
+            logger.warning(str(e))
+            cls.breaker.record_failure()
+            raise
         except Exception as e:
             logger.error(f"百度汉语查询解析错误: {e}")
-            return None
+            cls.breaker.record_failure()
+            raise BaiduHanyuUnavailable(str(e)) from e
+
+        cls.breaker.record_success()
+        return result
 
     @classmethod
     def _parse_result(cls, item: Dict, char: str) -> Dict:
@@ -0,0 +1,153 @@
+"""
+每日复习统计服务
+
+按 (用户, 日期) 维护复习汇总表 DailyReviewStats。复习时累加、撤销时扣减，
+统计接口（今日数据、连续打卡天数、热力图）只需读取按天汇总的少量行，
+不再扫描 ReviewLog。汇总变化时同时使分析缓存（analytics）失效。
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import DailyReviewStats, ReviewLog
+from .analytics import invalidate_analytics
+
+# 评分到计数字段的映射
+QUALITY_FIELDS = {
+    0: 'again_count',
+    2: 'hard_count',
+    4: 'good_count',
+    5: 'easy_count',
+}
+
+COUNTER_FIELDS = ['reviews', *QUALITY_FIELDS.values(), 'time_spent', 'new_cards']
+
+
+def _log_deltas(review_logs: Iterable, sign: int) -> Dict[date, Dict[str, int]]:
+    """按本地日期汇总复习记录对各计数字段的增量"""
+    deltas: Dict[date, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for log in review_logs:
+        delta = deltas[timezone.localdate(log.reviewed_at)]
+        delta['reviews'] += sign
+        delta['time_spent'] += sign * log.time_taken
+        if log.quality in QUALITY_FIELDS:
+            delta[QUALITY_FIELDS[log.quality]] += sign
+        if log.before_state == 'new':
+            delta['new_cards'] += sign
+    return deltas
+
+
+def _apply_deltas(user_id: int, deltas: Dict[date, Dict[str, int]]) -> None:
+    """把增量写入汇总表（每天一次 UPDATE，行不存在时再 INSERT）"""
+    for day, delta in deltas.items():
+        increments = {field: F(field) + value for field, value in delta.items() if value}
+        if not increments:
+            continue
+
+        rows = DailyReviewStats.objects.filter(user_id=user_id, date=day)
+        if rows.update(**increments) or delta['reviews'] < 0:
+            continue
+
+        try:
+            with transaction.atomic():
+                DailyReviewStats.objects.create(user_id=user_id, date=day, **delta)
+        except IntegrityError:
+            # 并发请求已创建该行
+            rows.update(**increments)
+
+
+def record_reviews(user_id: int, review_logs: Iterable) -> None:
+    """
+    将复习记录累加到每日统计
+
+    Args:
+        user_id: 用户 ID
+        review_logs: ReviewLog 对象列表（同一用户）
+    """
+    _apply_deltas(user_id, _log_deltas(review_logs, 1))
+    invalidate_analytics(user_id)
+
+
+def revert_review(review_log) -> None:
+    """
+    撤销复习时从每日统计中扣减该记录
+
+    Args:
+        review_log: ReviewLog 对象
+    """
+    _apply_deltas(review_log.user_id, _log_deltas([review_log], -1))
+    invalidate_analytics(review_log.user_id)
+
+
+def get_streak(user, today: Optional[date] = None) -> int:
+    """
+    计算连续打卡天数（截至今天，今天没有复习时为 0）
+
+    Args:
+        user: User 对象
+        today: 今天的日期，默认当前本地日期
+
+    Returns:
+        连续打卡天数
+    """
+    today = today or timezone.localdate()
+    dates = (
+        DailyReviewStats.objects.filter(user=user, date__lte=today, reviews__gt=0)
+        .order_by('-date')
+        .values_list('date', flat=True)
+    )
+
+    streak = 0
+    check_date = today
+    for day in dates.iterator():
+        if day != check_date:
+            break
+        streak += 1
+        check_date -= timedelta(days=1)
+    return streak
+
+
+def rebuild_daily_stats(user) -> int:
+    """
+    根据 ReviewLog 重建用户的每日统计（一次分组聚合查询）
+
+    Args:
+        user: User 对象
+
+    Returns:
+        重建的天数
+    """
+    aggregates = {
+        'reviews': Count('id'),
+        **{field: Count('id', filter=Q(quality=quality)) for quality, field in QUALITY_FIELDS.items()},
+        'time_spent': Sum('time_taken'),
+        'new_cards': Count('id', filter=Q(before_state='new')),
+    }
+    rows = (
+        ReviewLog.objects.filter(user=user)
+        .annotate(day=TruncDate('reviewed_at'))
+        .values('day')
+        .annotate(**aggregates)
+        .order_by()
+    )
+
+    stats = [
+        DailyReviewStats(
+            user=user,
+            date=row['day'],
+            **{field: row[field] or 0 for field in COUNTER_FIELDS},
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        DailyReviewStats.objects.filter(user=user).delete()
+        DailyReviewStats.objects.bulk_create(stats, batch_size=1000)
+    invalidate_analytics(user.id)
+
+    return len(stats)
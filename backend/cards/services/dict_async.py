@@ -0,0 +1,146 @@
+"""
+字典查询（异步版本，供 ASGI 部署下的异步视图使用）
+
+与同步视图的降级策略相同，区别在于:
+- 缓存读写使用 cache.aget / cache.aset；
+- 百度汉语请求使用 httpx 异步客户端，等待上游时不占用线程；
+- 本地字典查询（SQLite）放到线程池中执行；
+- 同一个词同时有多个请求未命中缓存时，只查询一次，其余请求等待同一个结果（single-flight）。
+"""
+import asyncio
+import logging
+import weakref
+from typing import Awaitable, Callable, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from . import hanzi_blob
+from .baidu_hanyu import BaiduHanyuService, BaiduHanyuUnavailable
+from .ecdict import entry_to_result, get_entry
+from .hanzi import hanzi_repository
+
+logger = logging.getLogger(__name__)
+
+# 正常结果的缓存时间（1天）
+CACHE_TIMEOUT = 86400
+
+
+class SingleFlight:
+    """同一事件循环内，同一个键同时只执行一次，其余调用等待同一个结果"""
+
+    def __init__(self):
+        self._calls: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]' = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: str, func: Callable[[], Awaitable]):
+        """
+        执行 func()，同一个 key 已有执行中的调用时等待它的结果
+
+        Args:
+            key: 合并请求的键
+            func: 返回协程的函数
+
+        Returns:
+            func() 的结果（多个调用方共享同一个对象）
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = calls[key] = loop.create_task(func())
+            task.add_done_callback(lambda done: calls.pop(key, None) if calls.get(key) is done else None)
+        # 某个请求被取消（如客户端断开）时不取消共享的查询
+        return await asyncio.shield(task)
+
+
+_flight = SingleFlight()
+
+
+async def _cached(cache_key: str) -> Optional[Dict]:
+    result = await cache.aget(cache_key)
+    if result:
+        result['source'] = 'cache'
+    return result
+
+
+async def lookup_english(word: str) -> Optional[Dict]:
+    """
+    查询英语单词: 缓存 -> 字典库
+
+    Returns:
+        查询结果字典，未找到时返回 None
+    """
+    cache_key = f'dict:en:{word.lower()}'
+    cached = await _cached(cache_key)
+    if cached:
+        return cached
+
+    async def load():
+        entry = await sync_to_async(get_entry)(word)
+        if entry is None:
+            return None
+        result = entry_to_result(entry)
+        await cache.aset(cache_key, result, timeout=CACHE_TIMEOUT)
+        return result
+
+    result = await _flight.do(cache_key, load)
+    return dict(result) if result else None
+
+
+async def lookup_hanzi(char: str) -> Optional[Dict]:
+    """
+    查询汉字: 缓存 -> 本地字典快照 -> 本地字典库 -> 百度汉语
+
+    百度汉语未收录的字缓存“未找到”（HANZI_NEGATIVE_CACHE_TIMEOUT 秒）；
+    百度汉语不可用（熔断中）时返回 None，不缓存。
+
+    Returns:
+        查询结果字典，未找到时返回 None
+    """
+    cache_key = f'dict:zh:{char}'
+    cached = await _cached(cache_key)
+    if cached:
+        return cached
+
+    # 本地字典快照（内存映射，不涉及 I/O，直接在事件循环中查询）
+    try:
+        entry = hanzi_blob.lookup(char)
+        if entry:
+            return entry.to_result()
+    except Exception as e:
+        logger.warning(f"本地汉字快照查询失败: {e}")
+
+    async def load():
+        try:
+            entry = await sync_to_async(hanzi_repository.get, thread_sensitive=False)(char)
+            if entry:
+                result = entry.to_result()
+                await cache.aset(cache_key, result, timeout=CACHE_TIMEOUT)
+                return result
+        except Exception as e:
+            logger.warning(f"本地汉字数据库查询失败: {e}")
+
+        missing_key = f'dict:zh:missing:{char}'
+        if await cache.aget(missing_key):
+            return None
+        try:
+            result = await BaiduHanyuService.afetch(char)
+        except BaiduHanyuUnavailable:
+            return None
+
+        if result is None:
+            await cache.aset(missing_key, True, timeout=settings.HANZI_NEGATIVE_CACHE_TIMEOUT)
+            return None
+
+        await cache.aset(cache_key, result, timeout=CACHE_TIMEOUT)
+        try:
+            await sync_to_async(hanzi_repository.save, thread_sensitive=False)(char, result)
+        except Exception as e:
+            logger.error(f"保存汉字到本地数据库失败: {e}")
+        return result
+
+    result = await _flight.do(cache_key, load)
+    return dict(result) if result else None
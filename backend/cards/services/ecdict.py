@@ -0,0 +1,157 @@
+"""
+ECDICT 英语字典查询服务
+
+默认从主数据库的 ecdict 表查询。配置 ECDICT_SIDECAR_PATH 后改为查询独立的
+只读 SQLite 文件（与 data/hanzi_local.db 类似），字典数据不再占用主库、备份和 WAL。
+
+独立文件以 immutable=1 只读方式打开并启用 mmap，多个工作进程共享操作系统页缓存。
+immutable 要求文件打开后不再被修改，因此更新字典时由 import_ecdict --sidecar
+生成新文件后整体替换（os.replace），查询时发现文件已被替换会重新打开连接。
+"""
+import os
+import sqlite3
+import string
+import threading
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models.functions import Lower
+
+from ..models import ECDict
+
+# 独立字典文件的 mmap 大小（字节）
+SIDECAR_MMAP_SIZE = 1 << 30
+
+_FIELD_OBJECTS = ECDict._meta.concrete_fields
+ENTRY_FIELDS = [field.attname for field in _FIELD_OBJECTS]
+
+# 与 SQLite LOWER() 一致，只转换 ASCII 字母
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+CEFR_LEVELS = ['a1', 'a2', 'b1', 'b2', 'c1', 'c2']
+
+_local = threading.local()
+
+
+def _sidecar_connection(path: str) -> sqlite3.Connection:
+    """获取当前线程的只读连接（文件被替换后重新打开）"""
+    stat = os.stat(path)
+    identity = (path, stat.st_ino, stat.st_mtime_ns)
+
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.identity == identity:
+        return conn
+    if conn is not None:
+        conn.close()
+
+    conn = sqlite3.connect(f'file:{quote(path)}?mode=ro&immutable=1', uri=True)
+    conn.execute(f'PRAGMA mmap_size = {SIDECAR_MMAP_SIZE}')
+    _local.conn, _local.identity = conn, identity
+    return conn
+
+
+def normalize_word(word: str) -> str:
+    """转换为查询键（与 LOWER(word) 索引一致）"""
+    return word.translate(_ASCII_LOWER)
+
+
+def _from_row(row) -> ECDict:
+    return ECDict(**{field.attname: field.to_python(value) for field, value in zip(_FIELD_OBJECTS, row)})
+
+
+def get_entry(word: str) -> Optional[ECDict]:
+    """
+    查询单词（不区分大小写）
+
+    按 LOWER(word) = normalize_word(word) 查询，命中 ecdict_word_lower_idx 表达式索引
+    （与原先 iexact 的 LIKE 一样只折叠 ASCII 字母的大小写）。
+
+    Args:
+        word: 单词
+
+    Returns:
+        ECDict 对象，未找到时返回 None（从独立文件读取时为未保存的实例）
+    """
+    path = settings.ECDICT_SIDECAR_PATH
+    if not path:
+        return (
+            ECDict.objects.annotate(word_lower=Lower('word'))
+            .filter(word_lower=normalize_word(word))
+            .first()
+        )
+
+    row = _sidecar_connection(path).execute(
+        f"SELECT {', '.join(ENTRY_FIELDS)} FROM ecdict WHERE LOWER(word) = ? ORDER BY word LIMIT 1",
+        (normalize_word(word),),
+    ).fetchone()
+    return _from_row(row) if row else None
+
+
+def get_entries(words: Iterable[str]) -> Dict[str, ECDict]:
+    """
+    批量查询单词（一次 IN 查询，不区分大小写）
+
+    Args:
+        words: 单词列表
+
+    Returns:
+        {normalize_word(单词): ECDict 对象}，只包含找到的单词；
+        多个大小写形式都存在时与 get_entry 一样取排序最前的一个
+    """
+    keys = sorted({normalize_word(word) for word in words})
+    if not keys:
+        return {}
+
+    path = settings.ECDICT_SIDECAR_PATH
+    if not path:
+        entries = (
+            ECDict.objects.annotate(word_lower=Lower('word'))
+            .filter(word_lower__in=keys)
+            .order_by('word')
+        )
+    else:
+        rows = _sidecar_connection(path).execute(
+            f"SELECT {', '.join(ENTRY_FIELDS)} FROM ecdict "
+            f"WHERE LOWER(word) IN ({', '.join('?' * len(keys))}) ORDER BY word",
+            keys,
+        )
+        entries = map(_from_row, rows)
+
+    result: Dict[str, ECDict] = {}
+    for entry in entries:
+        result.setdefault(normalize_word(entry.word), entry)
+    return result
+
+
+def entry_to_result(entry: ECDict) -> Dict:
+    """
+    转换为字典查询接口的返回格式
+
+    Args:
+        entry: ECDict 对象
+
+    Returns:
+        查询结果字典（source 为 local-dict）
+    """
+    # 提取 CEFR 等级 (从 tag 字段)
+    cefr = None
+    if entry.tag:
+        for tag in entry.tag.lower().split():
+            if tag in CEFR_LEVELS:
+                cefr = tag.upper()
+                break
+
+    return {
+        'word': entry.word,
+        'ipa': entry.phonetic,
+        'pos': entry.pos,
+        'meaning_en': entry.definition,
+        'meaning_zh': entry.translation,
+        'frequency': entry.frq,
+        'cefr': cefr,
+        'examples': [],  # ECDICT 无例句
+        'collins': entry.collins,
+        'oxford': entry.oxford,
+        'source': 'local-dict'
+    }
@@ -0,0 +1,260 @@
+"""
+ECDICT 快速导入服务
+
+直接使用 sqlite3 连接导入 stardict.csv，不经过 ORM:
+
+1. 按线上 ecdict 表的建表语句创建暂存表 ecdict_staging（不含二级索引），
+   用 executemany 分批写入，每批与导入进度（已读取的 CSV 行数）在同一事务中提交，
+   中断后重新运行会从上次提交的位置继续；
+2. 写完后在一个事务中删除线上表、把暂存表重命名为 ecdict，并按原定义重建二级索引
+   （写入时不维护二级索引，最后一次性建立）。
+
+导入期间线上 ecdict 表保持可用，只有最后替换的事务会短暂占用写锁。
+
+导入到独立字典文件（ECDICT_SIDECAR_PATH）时，在旁边的 .building 文件中完成上述步骤，
+再用 os.replace 整体替换，正在以 immutable 方式读取旧文件的进程不受影响。
+"""
+import csv
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+ECDICT_TABLE = 'ecdict'
+STAGING_TABLE = 'ecdict_staging'
+STATE_TABLE = 'ecdict_load_state'
+
+# 每批写入并提交的行数
+LOAD_BATCH_SIZE = 50000
+
+# 导入连接的页缓存大小（KB）
+LOAD_CACHE_SIZE_KB = 262144
+
+ECDICT_COLUMNS = [
+    'word', 'phonetic', 'definition', 'translation', 'pos', 'collins', 'oxford',
+    'tag', 'bnc', 'frq', 'exchange', 'detail', 'audio',
+]
+
+
+def parse_ecdict_row(row: Dict[str, str]) -> Optional[Tuple]:
+    """
+    把一行 ECDICT CSV 转换为按 ECDICT_COLUMNS 排列的值
+
+    Args:
+        row: csv.DictReader 读出的行
+
+    Returns:
+        值元组，word 为空时返回 None
+    """
+    word = (row.get('word') or '').strip()
+    if not word:
+        return None
+
+    def text(name):
+        return (row.get(name) or '').strip()
+
+    def optional_int(name):
+        value = text(name)
+        return int(value) if value else None
+
+    return (
+        word,
+        text('phonetic'),
+        text('definition'),
+        text('translation'),
+        text('pos'),
+        int(text('collins') or 0),
+        text('oxford').lower() in ('1', 'true', 'yes'),
+        text('tag'),
+        optional_int('bnc'),
+        optional_int('frq'),
+        text('exchange'),
+        text('detail'),
+        text('audio'),
+    )
+
+
+def _schema(conn: sqlite3.Connection, table: str) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+    """读取表的建表语句和二级索引 [(索引名, 建索引语句), ...]"""
+    rows = conn.execute(
+        'SELECT type, name, sql FROM sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL',
+        (table,),
+    ).fetchall()
+    table_sql = next((sql for kind, _, sql in rows if kind == 'table'), None)
+    indexes = [(name, sql) for kind, name, sql in rows if kind == 'index']
+    return table_sql, indexes
+
+
+def ecdict_schema() -> List[str]:
+    """从主数据库读取 ecdict 表及其索引的建表语句（表在前）"""
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = %s AND sql IS NOT NULL ORDER BY type DESC",
+            [ECDICT_TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _source_key(csv_path: str) -> str:
+    """源文件标识（路径、大小、修改时间），文件变化后不会沿用旧进度"""
+    stat = os.stat(csv_path)
+    return f'{os.path.abspath(csv_path)}:{stat.st_size}:{int(stat.st_mtime)}'
+
+
+def _prepare_staging(conn: sqlite3.Connection, source: str, restart: bool) -> int:
+    """
+    准备暂存表，返回需要跳过的 CSV 行数（续传时为上次提交的进度）
+    """
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {STATE_TABLE} (source TEXT NOT NULL, records INTEGER NOT NULL)')
+    state = conn.execute(f'SELECT source, records FROM {STATE_TABLE}').fetchone()
+    staging_sql, _ = _schema(conn, STAGING_TABLE)
+
+    if not restart and state and state[0] == source and staging_sql:
+        return state[1]
+
+    table_sql, _ = _schema(conn, ECDICT_TABLE)
+    if table_sql is None:
+        raise RuntimeError(f'{ECDICT_TABLE} 表不存在，请先执行 migrate')
+
+    conn.execute('BEGIN')
+    conn.execute(f'DROP TABLE IF EXISTS {STAGING_TABLE}')
+    conn.execute(table_sql.replace(f'"{ECDICT_TABLE}"', f'"{STAGING_TABLE}"', 1))
+    conn.execute(f'DELETE FROM {STATE_TABLE}')
+    conn.execute(f'INSERT INTO {STATE_TABLE} (source, records) VALUES (?, 0)', (source,))
+    conn.execute('COMMIT')
+    return 0
+
+
+def _iter_batches(reader: Iterator[Dict[str, str]], batch_size: int, limit: Optional[int]):
+    """按批产出 (该批读取的 CSV 行数, 有效行列表)"""
+    read = 0
+    batch = []
+    for row in reader:
+        if limit is not None and read >= limit:
+            break
+        read += 1
+        values = parse_ecdict_row(row)
+        if values is not None:
+            batch.append(values)
+        if read % batch_size == 0:
+            yield batch_size, batch
+            batch = []
+    if read % batch_size:
+        yield read % batch_size, batch
+
+
+def _swap_in(conn: sqlite3.Connection) -> None:
+    """替换线上表并重建二级索引（一个事务）"""
+    _, indexes = _schema(conn, ECDICT_TABLE)
+
+    conn.execute('BEGIN')
+    conn.execute(f'DROP TABLE "{ECDICT_TABLE}"')
+    conn.execute(f'ALTER TABLE "{STAGING_TABLE}" RENAME TO "{ECDICT_TABLE}"')
+    for _, sql in indexes:
+        conn.execute(sql)
+    conn.execute(f'DROP TABLE {STATE_TABLE}')
+    conn.execute('COMMIT')
+    conn.execute(f'ANALYZE "{ECDICT_TABLE}"')
+
+
+def load_ecdict(
+    csv_path: str,
+    db_path: str,
+    batch_size: int = LOAD_BATCH_SIZE,
+    limit: Optional[int] = None,
+    restart: bool = False,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict:
+    """
+    导入 ECDICT CSV 并原子替换 ecdict 表
+
+    Args:
+        csv_path: stardict.csv 路径
+        db_path: SQLite 数据库路径
+        batch_size: 每批提交的 CSV 行数
+        limit: 最多读取的 CSV 行数（用于测试）
+        restart: 忽略上次中断的进度，重新导入
+        progress_callback: 每批提交后调用 callback(已读取行数, 已写入行数)
+
+    Returns:
+        {
+            'records': 读取的 CSV 行数,
+            'rows': 替换后 ecdict 表的行数,
+            'resumed_from': 续传起点（0 表示从头开始）,
+            'elapsed': 耗时秒数,
+            'rows_per_sec': 本次运行的写入速度
+        }
+    """
+    start_time = time.time()
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute(f'PRAGMA cache_size = -{LOAD_CACHE_SIZE_KB}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA synchronous = NORMAL')
+
+        records = _prepare_staging(conn, _source_key(csv_path), restart)
+        resumed_from = records
+        before = loaded = conn.execute(f'SELECT COUNT(*) FROM {STAGING_TABLE}').fetchone()[0]
+        insert_sql = (
+            f'INSERT OR IGNORE INTO {STAGING_TABLE} ({", ".join(ECDICT_COLUMNS)}) '
+            f'VALUES ({", ".join("?" * len(ECDICT_COLUMNS))})'
+        )
+
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            # 续传: 跳过已提交的行
+            for _ in zip(range(records), reader):
+                pass
+
+            remaining = None if limit is None else max(limit - records, 0)
+            for read, batch in _iter_batches(reader, batch_size, remaining):
+                conn.execute('BEGIN')
+                loaded += conn.executemany(insert_sql, batch).rowcount
+                records += read
+                conn.execute(f'UPDATE {STATE_TABLE} SET records = ?', (records,))
+                conn.execute('COMMIT')
+                if progress_callback:
+                    progress_callback(records, loaded)
+
+        _swap_in(conn)
+    finally:
+        conn.close()
+
+    elapsed = time.time() - start_time
+    return {
+        'records': records,
+        'rows': loaded,
+        'resumed_from': resumed_from,
+        'elapsed': elapsed,
+        'rows_per_sec': (loaded - before) / elapsed if elapsed else 0,
+    }
+
+
+def build_sidecar(csv_path: str, sidecar_path: str, **kwargs) -> Dict:
+    """
+    导入 ECDICT 到独立字典文件
+
+    Args:
+        csv_path: stardict.csv 路径
+        sidecar_path: 独立字典文件路径
+        **kwargs: 传给 load_ecdict 的其他参数
+
+    Returns:
+        同 load_ecdict
+    """
+    building_path = f'{sidecar_path}.building'
+    os.makedirs(os.path.dirname(os.path.abspath(sidecar_path)), exist_ok=True)
+
+    conn = sqlite3.connect(building_path, isolation_level=None)
+    try:
+        if _schema(conn, ECDICT_TABLE)[0] is None:
+            for sql in ecdict_schema():
+                conn.execute(sql)
+    finally:
+        conn.close()
+
+    result = load_ecdict(csv_path, building_path, **kwargs)
+    os.replace(building_path, sidecar_path)
+    return result
@@ -0,0 +1,464 @@
+"""
+复习负荷预测服务
+
+提供 SM-2 计算函数的 NumPy 批量版本，并基于它们把用户的所有卡片向前模拟 N 天，
+得到 "未来每天需要复习多少次" 的负荷预测。批量函数与 sm2.py 中的单卡函数逐项等价。
+使用 FSRS 的卡组按卡组参数用 FSRS 公式模拟（与 schedulers.FSRSScheduler 一致）。
+"""
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.db.models import Count
+from django.utils import timezone
+
+from . import fsrs
+from .sm2 import LEARNING_STEPS
+
+# 状态编码
+STATE_NEW = 0
+STATE_LEARNING = 1
+STATE_REVIEW = 2
+
+STATE_CODES = {'new': STATE_NEW, 'learning': STATE_LEARNING, 'review': STATE_REVIEW}
+
+# 评分取值及无历史记录时的默认分布
+QUALITIES = np.array([0, 2, 4, 5])
+DEFAULT_RATING_DISTRIBUTION = {0: 0.1, 2: 0.15, 4: 0.6, 5: 0.15}
+# 与 QUALITIES 一一对应的 FSRS 评分
+FSRS_RATINGS = np.array([fsrs.QUALITY_TO_RATING[int(q)] for q in QUALITIES])
+
+# 学习小步（天）
+LEARNING_STEPS_DAYS = np.array(LEARNING_STEPS, dtype=float) / 1440
+
+# 单日内同一批卡片最多重复模拟的轮数（学习小步可能在当天再次到期）
+MAX_ROUNDS_PER_DAY = 8
+
+
+def calculate_ef_batch(ef: np.ndarray, quality: np.ndarray) -> np.ndarray:
+    """
+    批量计算新的易忘因子（calculate_ef 的向量化版本）
+
+    Args:
+        ef: 当前易忘因子数组
+        quality: 评分数组
+
+    Returns:
+        新的易忘因子数组 (最小值1.3)
+    """
+    q = 5 - quality
+    return np.maximum(1.3, ef + (0.1 - q * (0.08 + q * 0.02)))
+
+
+def calculate_interval_batch(interval: np.ndarray, ef: np.ndarray, quality: np.ndarray) -> np.ndarray:
+    """
+    批量计算新的复习间隔（calculate_interval 的向量化版本）
+
+    Args:
+        interval: 当前间隔天数数组
+        ef: 易忘因子数组
+        quality: 评分数组
+
+    Returns:
+        新的间隔天数数组
+    """
+    grown = np.where(
+        interval == 0, 1,
+        np.where(interval == 1, 6, (interval * ef).astype(np.int64))
+    )
+    return np.where(quality < 3, 0, grown)
+
+
+def get_next_learning_step_batch(
+    learning_step: np.ndarray,
+    ef: np.ndarray,
+    quality: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量获取学习阶段的下一个小步（get_next_learning_step 的向量化版本）
+
+    Args:
+        learning_step: 当前学习步骤数组
+        ef: 易忘因子数组
+        quality: 评分数组
+
+    Returns:
+        (时间增量天数数组, 新状态编码数组, 新学习步骤数组)
+    """
+    again = quality == 0
+    step = np.where(again, 0, learning_step + 1)
+    graduated = ~again & (step >= len(LEARNING_STEPS))
+
+    graduated_days = calculate_interval_batch(np.zeros_like(step), ef, quality)
+    step_days = LEARNING_STEPS_DAYS[np.minimum(step, len(LEARNING_STEPS) - 1)]
+
+    delta = np.where(graduated, graduated_days, step_days)
+    state = np.where(graduated, STATE_REVIEW, STATE_LEARNING)
+    return delta, state, step
+
+
+def apply_review_batch(
+    state: np.ndarray,
+    ef: np.ndarray,
+    interval: np.ndarray,
+    learning_step: np.ndarray,
+    quality: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量应用一次复习（与 sm2.apply_review 的状态转移一致）
+
+    Args:
+        state: 状态编码数组
+        ef: 易忘因子数组
+        interval: 间隔天数数组
+        learning_step: 学习步骤数组
+        quality: 评分数组
+
+    Returns:
+        (新状态, 新易忘因子, 新间隔, 新学习步骤, 到期时间增量天数)
+    """
+    in_review = state == STATE_REVIEW
+    lapse = in_review & (quality < 3)
+    passed = in_review & ~lapse
+
+    # 新卡先进入学习阶段的第 0 步
+    step_in = np.where(state == STATE_NEW, 0, learning_step)
+    step_delta, step_state, step_out = get_next_learning_step_batch(step_in, ef, quality)
+
+    new_ef = np.where(passed, calculate_ef_batch(ef, quality), ef)
+    review_interval = calculate_interval_batch(interval, new_ef, quality)
+
+    new_state = np.where(in_review, np.where(lapse, STATE_LEARNING, STATE_REVIEW), step_state)
+    new_step = np.where(in_review, np.where(lapse, 0, learning_step), step_out)
+    new_interval = np.where(
+        passed, review_interval,
+        np.where(~in_review & (step_state == STATE_REVIEW), step_delta, interval)
+    ).astype(np.int64)
+    delta = np.where(
+        in_review,
+        np.where(lapse, LEARNING_STEPS_DAYS[0], review_interval),
+        step_delta,
+    )
+    return new_state, new_ef, new_interval, new_step, delta
+
+
+def apply_fsrs_review_batch(
+    state: np.ndarray,
+    stability: np.ndarray,
+    difficulty: np.ndarray,
+    interval: np.ndarray,
+    elapsed: np.ndarray,
+    quality: np.ndarray,
+    weights,
+    desired_retention: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量应用一次 FSRS 复习（与 schedulers.FSRSScheduler.review 的状态转移一致）
+
+    Args:
+        state: 状态编码数组
+        stability: 稳定度数组（新卡为 0）
+        difficulty: 难度数组
+        interval: 间隔天数数组
+        elapsed: 距上次复习的天数数组（仅复习阶段的卡片使用）
+        quality: 评分数组
+        weights: FSRS 参数
+        desired_retention: 目标保持率
+
+    Returns:
+        (新状态, 新稳定度, 新难度, 新间隔, 到期时间增量天数)
+    """
+    w = np.asarray(weights, dtype=float)
+    rating = FSRS_RATINGS[np.searchsorted(QUALITIES, quality)]
+    again = rating == 1
+
+    first = (state == STATE_NEW) | (stability <= 0)
+    in_review = (state == STATE_REVIEW) & ~first
+    current = np.maximum(stability, 0.1)
+
+    r = np.clip(fsrs.retrievability(elapsed, current), 1e-6, 1 - 1e-6)
+    reviewed_stability = np.where(
+        again,
+        fsrs.forget_stability(w, difficulty, current, r),
+        fsrs.recall_stability(w, difficulty, current, r, rating),
+    )
+    new_stability = np.where(
+        first, fsrs.init_stability(w, rating),
+        np.where(in_review, reviewed_stability, stability),
+    )
+    new_difficulty = np.where(
+        first, fsrs.init_difficulty(w, rating),
+        np.where(in_review, fsrs.next_difficulty(w, difficulty, rating), difficulty),
+    )
+
+    graduated_interval = fsrs.next_interval(np.maximum(new_stability, 0.1), desired_retention)
+    new_state = np.where(again, STATE_LEARNING, STATE_REVIEW)
+    new_interval = np.where(again, np.where(first, 0, interval), graduated_interval).astype(np.int64)
+    delta = np.where(again, LEARNING_STEPS_DAYS[0], graduated_interval)
+    return new_state, new_stability, new_difficulty, new_interval, delta
+
+
+def estimate_rating_distribution(user) -> Dict[int, float]:
+    """
+    根据用户的复习记录估计评分分布（一次分组查询，加一平滑）
+
+    Args:
+        user: User 对象
+
+    Returns:
+        {评分: 概率}，无复习记录时返回默认分布
+    """
+    from ..models import ReviewLog
+
+    counts = dict(
+        ReviewLog.objects.filter(user=user)
+        .values_list('quality')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    if not counts:
+        return dict(DEFAULT_RATING_DISTRIBUTION)
+
+    smoothed = {int(q): counts.get(int(q), 0) + 1 for q in QUALITIES}
+    total = sum(smoothed.values())
+    return {q: n / total for q, n in smoothed.items()}
+
+
+def simulate_workload(
+    state: np.ndarray,
+    ef: np.ndarray,
+    interval: np.ndarray,
+    learning_step: np.ndarray,
+    due_days: np.ndarray,
+    days: int = 90,
+    rating_distribution: Optional[Dict[int, float]] = None,
+    new_per_day: int = 0,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    向前模拟所有卡片，统计每天的复习次数
+
+    Args:
+        state: 状态编码数组
+        ef: 易忘因子数组
+        interval: 间隔天数数组
+        learning_step: 学习步骤数组
+        due_days: 距模拟起点的到期时间（天，可为负数表示已过期）
+        days: 模拟天数
+        rating_distribution: {评分: 概率}，默认使用 DEFAULT_RATING_DISTRIBUTION
+        new_per_day: 每天引入的新卡数（按数组顺序）；为 None 时新卡的引入日已写在 due_days 中
+        seed: 随机种子
+
+    Returns:
+        长度为 days 的数组，第 i 项为第 i 天的复习次数
+    """
+    distribution = rating_distribution or DEFAULT_RATING_DISTRIBUTION
+    probs = np.array([distribution.get(int(q), 0.0) for q in QUALITIES], dtype=float)
+    probs = probs / probs.sum()
+    rng = np.random.default_rng(seed)
+
+    state = state.astype(np.int64).copy()
+    ef = ef.astype(float).copy()
+    interval = interval.astype(np.int64).copy()
+    learning_step = learning_step.astype(np.int64).copy()
+    due_days = due_days.astype(float).copy()
+
+    # 新卡不会自动到期，按每日配额逐天引入
+    is_new = state == STATE_NEW
+    if new_per_day is not None:
+        due_days[is_new] = np.inf
+    new_order = np.flatnonzero(is_new)
+
+    workload = np.zeros(days, dtype=np.int64)
+    for day in range(days):
+        if new_per_day:
+            introduced = new_order[day * new_per_day:(day + 1) * new_per_day]
+            due_days[introduced] = day
+
+        day_end = day + 1
+        for _ in range(MAX_ROUNDS_PER_DAY):
+            idx = np.flatnonzero(due_days < day_end)
+            if idx.size == 0:
+                break
+
+            quality = rng.choice(QUALITIES, size=idx.size, p=probs)
+            start = np.maximum(due_days[idx], day)
+            new_state, new_ef, new_interval, new_step, delta = apply_review_batch(
+                state[idx], ef[idx], interval[idx], learning_step[idx], quality
+            )
+            state[idx] = new_state
+            ef[idx] = new_ef
+            interval[idx] = new_interval
+            learning_step[idx] = new_step
+            # 间隔为 0 的卡片顺延到下一轮，避免在同一时刻无限重复
+            due_days[idx] = start + np.maximum(delta, LEARNING_STEPS_DAYS[0])
+            workload[day] += idx.size
+
+    return workload
+
+
+def simulate_fsrs_workload(
+    state: np.ndarray,
+    stability: np.ndarray,
+    difficulty: np.ndarray,
+    interval: np.ndarray,
+    due_days: np.ndarray,
+    weights=None,
+    desired_retention: float = fsrs.DEFAULT_DESIRED_RETENTION,
+    days: int = 90,
+    rating_distribution: Optional[Dict[int, float]] = None,
+    seed=None,
+) -> np.ndarray:
+    """
+    用 FSRS 向前模拟卡片，统计每天的复习次数（新卡的引入日由调用方写在 due_days 中）
+
+    Args:
+        state: 状态编码数组
+        stability: 稳定度数组
+        difficulty: 难度数组
+        interval: 间隔天数数组
+        due_days: 距模拟起点的到期时间（天），新卡为引入日，不引入时为 inf
+        weights: FSRS 参数，默认 fsrs.DEFAULT_WEIGHTS
+        desired_retention: 目标保持率
+        days: 模拟天数
+        rating_distribution: {评分: 概率}，默认使用 DEFAULT_RATING_DISTRIBUTION
+        seed: 随机种子
+
+    Returns:
+        长度为 days 的数组，第 i 项为第 i 天的复习次数
+    """
+    distribution = rating_distribution or DEFAULT_RATING_DISTRIBUTION
+    probs = np.array([distribution.get(int(q), 0.0) for q in QUALITIES], dtype=float)
+    probs = probs / probs.sum()
+    rng = np.random.default_rng(seed)
+    weights = weights or fsrs.DEFAULT_WEIGHTS
+
+    state = state.astype(np.int64).copy()
+    stability = stability.astype(float).copy()
+    difficulty = difficulty.astype(float).copy()
+    interval = interval.astype(np.int64).copy()
+    due_days = due_days.astype(float).copy()
+
+    workload = np.zeros(days, dtype=np.int64)
+    for day in range(days):
+        day_end = day + 1
+        for _ in range(MAX_ROUNDS_PER_DAY):
+            idx = np.flatnonzero(due_days < day_end)
+            if idx.size == 0:
+                break
+
+            quality = rng.choice(QUALITIES, size=idx.size, p=probs)
+            start = np.maximum(due_days[idx], day)
+            # 上次复习时间 = 到期时间 - 间隔
+            elapsed = np.maximum(start - (due_days[idx] - interval[idx]), 0)
+            new_state, new_stability, new_difficulty, new_interval, delta = apply_fsrs_review_batch(
+                state[idx], stability[idx], difficulty[idx], interval[idx], elapsed, quality,
+                weights, desired_retention,
+            )
+            state[idx] = new_state
+            stability[idx] = new_stability
+            difficulty[idx] = new_difficulty
+            interval[idx] = new_interval
+            due_days[idx] = start + np.maximum(delta, LEARNING_STEPS_DAYS[0])
+            workload[day] += idx.size
+
+    return workload
+
+
+def forecast_workload(user, days: int = 90, rating_distribution: Optional[Dict[int, float]] = None) -> Dict:
+    """
+    预测用户未来每天的复习负荷
+
+    Args:
+        user: User 对象
+        days: 预测天数
+        rating_distribution: {评分: 概率}，默认根据复习记录估计
+
+    Returns:
+        {
+            'days': 预测天数,
+            'start_date': 起始日期,
+            'forecast': [{'date': 日期, 'reviews': 复习次数}, ...],
+            'total_reviews': 总复习次数,
+            'rating_distribution': 使用的评分分布,
+            'new_per_day': 每天引入的新卡数
+        }
+    """
+    from ..models import Card, Deck
+    from .schedulers import FSRSScheduler, get_scheduler
+
+    distribution = rating_distribution or estimate_rating_distribution(user)
+
+    rows = list(
+        Card.objects.filter(user=user)
+        .order_by('created_at')
+        .values_list('state', 'ef', 'interval', 'learning_step', 'due_at', 'stability', 'difficulty', 'deck_id')
+    )
+
+    decks = list(Deck.objects.filter(user=user).only('daily_new_limit', 'scheduler', 'scheduler_params'))
+    new_per_day = decks[0].daily_new_limit if decks else 20
+
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today, time.min))
+
+    workload = np.zeros(days, dtype=np.int64)
+    if rows:
+        states, efs, intervals, steps, due_ats, stabilities, difficulties, deck_ids = zip(*rows)
+        state = np.array([STATE_CODES.get(s, STATE_NEW) for s in states])
+        interval = np.array(intervals, dtype=np.int64)
+        due_days = np.array([(due_at - start).total_seconds() / 86400 for due_at in due_ats])
+
+        # 新卡跨卡组按创建顺序共用每日配额，先统一算出引入日
+        new_order = np.flatnonzero(state == STATE_NEW)
+        due_days[new_order] = np.arange(new_order.size) // new_per_day if new_per_day else np.inf
+
+        # 按卡组的调度器分组模拟: SM-2 卡片一起模拟，FSRS 卡片按卡组参数分别模拟
+        schedulers = {deck.id: get_scheduler(deck) for deck in decks}
+        deck_ids = np.array([deck_id or 0 for deck_id in deck_ids])
+        is_fsrs = np.array([isinstance(schedulers.get(deck_id), FSRSScheduler) for deck_id in deck_ids], dtype=bool)
+
+        sm2_idx = np.flatnonzero(~is_fsrs)
+        if sm2_idx.size:
+            workload += simulate_workload(
+                state[sm2_idx],
+                np.array(efs, dtype=float)[sm2_idx],
+                interval[sm2_idx],
+                np.array(steps, dtype=np.int64)[sm2_idx],
+                due_days[sm2_idx],
+                days=days,
+                rating_distribution=distribution,
+                new_per_day=None,
+                seed=user.pk,
+            )
+
+        stability = np.array(stabilities, dtype=float)
+        difficulty = np.array(difficulties, dtype=float)
+        for deck_id in np.unique(deck_ids[is_fsrs]):
+            idx = np.flatnonzero(deck_ids == deck_id)
+            scheduler = schedulers[int(deck_id)]
+            workload += simulate_fsrs_workload(
+                state[idx],
+                stability[idx],
+                difficulty[idx],
+                interval[idx],
+                due_days[idx],
+                weights=scheduler.weights,
+                desired_retention=scheduler.desired_retention,
+                days=days,
+                rating_distribution=distribution,
+                seed=[user.pk, int(deck_id)],
+            )
+
+    forecast: List[Dict] = [
+        {'date': (today + timedelta(days=i)).isoformat(), 'reviews': int(n)}
+        for i, n in enumerate(workload)
+    ]
+
+    return {
+        'days': days,
+        'start_date': today.isoformat(),
+        'forecast': forecast,
+        'total_reviews': int(workload.sum()),
+        'rating_distribution': {str(q): round(p, 4) for q, p in distribution.items()},
+        'new_per_day': new_per_day,
+    }
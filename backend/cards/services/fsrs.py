@@ -0,0 +1,277 @@
+"""
+FSRS (Free Spaced Repetition Scheduler) 算法实现
+
+基于 FSRS-4.5 的记忆模型: 用稳定度 S（天）和难度 D（1-10）描述每张卡片，
+可提取性 R(t, S) = (1 + FACTOR * t / S) ^ DECAY。
+
+所有公式都基于 NumPy 实现，既可用于单张卡片（标量），也可对整批卡片向量化计算；
+参数优化器利用这一点，把一个用户的全部复习历史按 "第 k 次复习" 对齐后整体计算损失。
+"""
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+# FSRS-4.5 默认参数
+DEFAULT_WEIGHTS = [
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031,
+    1.6474, 0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+]
+
+# 参数取值范围（优化时裁剪）
+WEIGHT_BOUNDS = [
+    (0.1, 100), (0.1, 100), (0.1, 100), (0.1, 100), (1, 10), (0.1, 5), (0.1, 5), (0, 0.75),
+    (0, 4), (0, 0.8), (0.01, 3), (0.5, 5), (0.01, 0.2), (0.01, 0.9), (0.01, 2), (0, 1), (1, 6),
+]
+
+DECAY = -0.5
+FACTOR = 0.9 ** (1 / DECAY) - 1
+
+DEFAULT_DESIRED_RETENTION = 0.9
+MAX_INTERVAL = 36500
+
+# 本项目评分 (0/2/4/5) 到 FSRS 评分 (1=Again, 2=Hard, 3=Good, 4=Easy) 的映射
+QUALITY_TO_RATING = {0: 1, 2: 2, 4: 3, 5: 4}
+
+# 优化器所需的最少复习次数（不含每张卡片的首次复习）
+MIN_REVIEWS_FOR_OPTIMIZATION = 50
+
+
+def retrievability(elapsed_days, stability):
+    """可提取性: 间隔 elapsed_days 天后仍能回忆的概率"""
+    return (1 + FACTOR * np.asarray(elapsed_days) / stability) ** DECAY
+
+
+def init_stability(w, rating):
+    """首次复习后的稳定度"""
+    return np.maximum(np.asarray(w)[np.asarray(rating) - 1], 0.1)
+
+
+def init_difficulty(w, rating):
+    """首次复习后的难度"""
+    return np.clip(w[4] - (np.asarray(rating) - 3) * w[5], 1, 10)
+
+
+def next_difficulty(w, difficulty, rating):
+    """复习后的难度（含向初始难度的均值回归）"""
+    updated = difficulty - w[6] * (np.asarray(rating) - 3)
+    reverted = w[7] * init_difficulty(w, 4) + (1 - w[7]) * updated
+    return np.clip(reverted, 1, 10)
+
+
+def recall_stability(w, difficulty, stability, r, rating):
+    """回忆成功后的稳定度"""
+    rating = np.asarray(rating)
+    hard_penalty = np.where(rating == 2, w[15], 1)
+    easy_bonus = np.where(rating == 4, w[16], 1)
+    return stability * (
+        1
+        + np.exp(w[8])
+        * (11 - difficulty)
+        * np.power(stability, -w[9])
+        * (np.exp((1 - r) * w[10]) - 1)
+        * hard_penalty
+        * easy_bonus
+    )
+
+
+def forget_stability(w, difficulty, stability, r):
+    """遗忘后的稳定度"""
+    return (
+        w[11]
+        * np.power(difficulty, -w[12])
+        * (np.power(stability + 1, w[13]) - 1)
+        * np.exp((1 - r) * w[14])
+    )
+
+
+def next_interval(stability, desired_retention: float = DEFAULT_DESIRED_RETENTION):
+    """在目标保持率下的下一次复习间隔（天，至少 1 天）"""
+    interval = stability / FACTOR * (desired_retention ** (1 / DECAY) - 1)
+    return np.clip(np.round(interval), 1, MAX_INTERVAL).astype(np.int64)
+
+
+def _replay(w, elapsed, ratings, mask):
+    """
+    按复习序号对齐后整批回放复习序列
+
+    Args:
+        w: 参数数组
+        elapsed: (卡片数, 最大复习次数) 距上次复习的天数
+        ratings: (卡片数, 最大复习次数) FSRS 评分
+        mask: (卡片数, 最大复习次数) 有效位置
+
+    Yields:
+        每个复习序号 k >= 1 上的 (有效位置, 复习前的可提取性, 是否回忆成功)
+    """
+    stability = init_stability(w, ratings[:, 0])
+    difficulty = init_difficulty(w, ratings[:, 0])
+
+    for k in range(1, ratings.shape[1]):
+        valid = mask[:, k]
+        if not valid.any():
+            break
+        rating = ratings[:, k]
+        r = np.clip(retrievability(elapsed[:, k], stability), 1e-6, 1 - 1e-6)
+        recalled = rating > 1
+        yield valid, r, recalled
+
+        new_stability = np.where(
+            recalled,
+            recall_stability(w, difficulty, stability, r, rating),
+            forget_stability(w, difficulty, stability, r),
+        )
+        stability = np.where(valid, np.maximum(new_stability, 0.1), stability)
+        difficulty = np.where(valid, next_difficulty(w, difficulty, rating), difficulty)
+
+
+def _log_loss(w, elapsed, ratings, mask) -> float:
+    """整批复习序列上的平均对数损失"""
+    total = 0.0
+    count = 0
+    for valid, r, recalled in _replay(w, elapsed, ratings, mask):
+        total -= np.sum(np.where(valid, np.where(recalled, np.log(r), np.log(1 - r)), 0))
+        count += int(valid.sum())
+    return total / max(count, 1)
+
+
+def _mean_predicted_retention(w, elapsed, ratings, mask) -> float:
+    """整批复习序列上的平均预测回忆率"""
+    total = 0.0
+    count = 0
+    for valid, r, _ in _replay(w, elapsed, ratings, mask):
+        total += float(np.sum(np.where(valid, r, 0)))
+        count += int(valid.sum())
+    return total / max(count, 1)
+
+
+def build_review_sequences(rows):
+    """
+    将复习记录整理为按复习序号对齐的矩阵
+
+    同一张卡片同一天内的多次复习只保留第一次（FSRS 不建模当天内的短期记忆）。
+
+    Args:
+        rows: [(card_id, reviewed_at, quality), ...]，按 (card_id, reviewed_at) 排序
+
+    Returns:
+        (elapsed, ratings, mask) 三个 (卡片数, 最大复习次数) 数组
+    """
+    sequences = []
+    current_card = None
+    for card_id, reviewed_at, quality in rows:
+        if card_id != current_card:
+            sequences.append([])
+            current_card = card_id
+        sequence = sequences[-1]
+        if sequence and reviewed_at.date() == sequence[-1][0].date():
+            continue
+        sequence.append((reviewed_at, QUALITY_TO_RATING.get(quality, 3)))
+
+    length = max((len(seq) for seq in sequences), default=0)
+    elapsed = np.zeros((len(sequences), length))
+    ratings = np.ones((len(sequences), length), dtype=np.int64)
+    mask = np.zeros((len(sequences), length), dtype=bool)
+
+    for i, seq in enumerate(sequences):
+        for k, (reviewed_at, rating) in enumerate(seq):
+            ratings[i, k] = rating
+            mask[i, k] = True
+            if k:
+                elapsed[i, k] = (reviewed_at - seq[k - 1][0]).total_seconds() / 86400
+
+    return elapsed, ratings, mask
+
+
+def optimize_weights(
+    rows,
+    initial_weights: Optional[list] = None,
+    iterations: int = 200,
+    learning_rate: float = 0.005,
+    time_limit: Optional[float] = None,
+) -> Dict:
+    """
+    根据复习历史拟合 FSRS 参数
+
+    使用 Adam 优化对数损失，梯度通过中心差分获得；每次损失计算都对全部卡片向量化进行。
+    复习记录很多时单次迭代也较慢，可以用 time_limit 限制总耗时，超时后保留当前最优参数。
+
+    Args:
+        rows: [(card_id, reviewed_at, quality), ...]，按 (card_id, reviewed_at) 排序
+        initial_weights: 初始参数，默认 DEFAULT_WEIGHTS
+        iterations: 最大迭代次数
+        learning_rate: 学习率（每步移动量占参数取值范围的比例）
+        time_limit: 迭代的最长耗时（秒），为 None 时不限制
+
+    Returns:
+        {
+            'weights': 拟合后的参数,
+            'optimized': 是否进行了优化（复习记录不足时为 False）,
+            'reviews': 参与拟合的复习次数,
+            'iterations': 实际执行的迭代次数,
+            'log_loss_before': 优化前损失,
+            'log_loss_after': 优化后损失,
+            'actual_retention': 实际回忆率,
+            'predicted_retention': 拟合参数下的平均预测回忆率
+        }
+    """
+    elapsed, ratings, mask = build_review_sequences(rows)
+    w = np.array(initial_weights or DEFAULT_WEIGHTS, dtype=float)
+    lower, upper = (np.array(bound, dtype=float) for bound in zip(*WEIGHT_BOUNDS))
+
+    reviews = int(mask[:, 1:].sum()) if mask.size else 0
+    loss_before = _log_loss(w, elapsed, ratings, mask) if reviews else 0.0
+
+    result = {
+        'weights': [round(float(x), 4) for x in w],
+        'optimized': False,
+        'reviews': reviews,
+        'iterations': 0,
+        'log_loss_before': round(loss_before, 4),
+        'log_loss_after': round(loss_before, 4),
+    }
+
+    if reviews >= MIN_REVIEWS_FOR_OPTIMIZATION:
+        scale = upper - lower
+        m = np.zeros_like(w)
+        v = np.zeros_like(w)
+        best_w, best_loss = w.copy(), loss_before
+        eps = 1e-4 * scale
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+
+        for t in range(1, iterations + 1):
+            if deadline is not None and t > 1 and time.monotonic() >= deadline:
+                break
+            result['iterations'] = t
+            grad = np.empty_like(w)
+            for i in range(len(w)):
+                step = np.zeros_like(w)
+                step[i] = eps[i]
+                grad[i] = (
+                    _log_loss(np.clip(w + step, lower, upper), elapsed, ratings, mask)
+                    - _log_loss(np.clip(w - step, lower, upper), elapsed, ratings, mask)
+                ) / (2 * eps[i])
+
+            m = 0.9 * m + 0.1 * grad
+            v = 0.999 * v + 0.001 * grad ** 2
+            m_hat = m / (1 - 0.9 ** t)
+            v_hat = v / (1 - 0.999 ** t)
+            w = np.clip(w - learning_rate * scale * m_hat / (np.sqrt(v_hat) + 1e-8), lower, upper)
+
+            loss = _log_loss(w, elapsed, ratings, mask)
+            if loss < best_loss:
+                best_w, best_loss = w.copy(), loss
+
+        w = best_w
+        result.update({
+            'weights': [round(float(x), 4) for x in w],
+            'optimized': True,
+            'log_loss_after': round(best_loss, 4),
+        })
+
+    if reviews:
+        result['actual_retention'] = round(float((ratings[:, 1:][mask[:, 1:]] > 1).mean()), 4)
+        result['predicted_retention'] = round(_mean_predicted_retention(w, elapsed, ratings, mask), 4)
+
+    return result
+
@@ -0,0 +1,210 @@
+"""
+本地汉字字典服务
+
+HanziRepository 查询 data/hanzi_local.db，一次查询同时关联 hanzi_baidu 表（百度汉语查询结果的
+本地缓存）和原有的 hanzi 表，合并为一个 HanziEntry: 两表都有的字段以 hanzi_baidu 为准，
+构件、字频、学习顺序等只有 hanzi 表才有的字段一并返回。连接由 hanzi_db 管理。
+
+视图、导入补全和 SVG 生成共用模块级实例 hanzi_repository。
+"""
+import re
+import sqlite3
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Optional, Tuple
+
+from . import hanzi_db
+from .hanzi_db import read_connection, write_connection
+
+# 每张表参与合并的列: (HanziEntry 字段, 列名)
+BAIDU_COLUMNS = [
+    ('pinyin', 'pinyin'),
+    ('radical', 'radical'),
+    ('strokes', 'strokes'),
+    ('frequency', 'frequency'),
+    ('meaning_zh', 'meaning'),
+    ('examples', 'examples'),
+    ('traditional', 'traditional'),
+]
+LEGACY_COLUMNS = [
+    ('pinyin', 'pinyin'),
+    ('traditional', 'traditional'),
+    ('decomposition', 'decomposition'),
+    ('rationality_score', 'rationality_score'),
+    ('network_level', 'network_level'),
+    ('corpus_frequency', 'frequency_1'),
+    ('frequency_order', 'frequency_order_1'),
+    ('learning_order', 'learning_order_1'),
+]
+
+
+def _split(value: Optional[str], pattern: str) -> Tuple[str, ...]:
+    return tuple(part for part in re.split(pattern, value.strip()) if part) if value else ()
+
+
+@dataclass(frozen=True, slots=True)
+class HanziEntry:
+    """一个汉字在本地字典中的全部信息"""
+    char: str
+    pinyin: Tuple[str, ...] = ()
+    traditional: str = ''
+    radical: str = ''
+    strokes: int = 0
+    frequency: int = 0
+    meaning_zh: str = ''
+    examples: Tuple[str, ...] = ()
+    decomposition: str = ''
+    rationality_score: Optional[float] = None
+    network_level: Optional[int] = None
+    corpus_frequency: Optional[float] = None
+    frequency_order: Optional[int] = None
+    learning_order: Optional[int] = None
+
+    @classmethod
+    def from_rows(cls, char: str, baidu: Optional[Dict], legacy: Optional[Dict]) -> 'HanziEntry':
+        """
+        合并两张表的行
+
+        Args:
+            char: 汉字
+            baidu: hanzi_baidu 表的行（按 BAIDU_COLUMNS 的字段名），不存在时为 None
+            legacy: hanzi 表的行（按 LEGACY_COLUMNS 的字段名），不存在时为 None
+        """
+        baidu = baidu or {}
+        legacy = legacy or {}
+        # hanzi_baidu 的拼音以逗号分隔，hanzi 表以空格分隔
+        pinyin = _split(baidu.get('pinyin'), r',') or _split(legacy.get('pinyin'), r'[,\s]+')
+        return cls(
+            char=char,
+            pinyin=pinyin,
+            traditional=baidu.get('traditional') or legacy.get('traditional') or '',
+            radical=baidu.get('radical') or '',
+            strokes=baidu.get('strokes') or 0,
+            frequency=baidu.get('frequency') or 0,
+            meaning_zh=baidu.get('meaning_zh') or '',
+            examples=_split(baidu.get('examples'), r'\|'),
+            decomposition=legacy.get('decomposition') or '',
+            rationality_score=legacy.get('rationality_score'),
+            network_level=legacy.get('network_level'),
+            corpus_frequency=legacy.get('corpus_frequency'),
+            frequency_order=legacy.get('frequency_order'),
+            learning_order=legacy.get('learning_order'),
+        )
+
+    def to_result(self) -> Dict:
+        """转换为字典查询接口的返回格式（source 为 local-dict）"""
+        # 字段都是不可变的简单值，不需要 asdict 的深拷贝
+        result = {name: getattr(self, name) for name in ENTRY_FIELDS}
+        result['pinyin'] = list(self.pinyin)
+        result['examples'] = list(self.examples)
+        result['source'] = 'local-dict'
+        return result
+
+
+ENTRY_FIELDS = tuple(field.name for field in fields(HanziEntry))
+
+
+class HanziRepository:
+    """本地汉字字典的读写"""
+
+    def __init__(self):
+        # 数据库路径 -> 已存在的表（hanzi_baidu 在第一次写入时才创建）
+        self._tables: Dict[str, frozenset] = {}
+
+    def _existing_tables(self, conn: sqlite3.Connection) -> frozenset:
+        path = hanzi_db.get_hanzi_db_path()
+        if path not in self._tables:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('hanzi', 'hanzi_baidu')"
+            ).fetchall()
+            self._tables[path] = frozenset(name for name, in rows)
+        return self._tables[path]
+
+    @staticmethod
+    def _build_query(tables: frozenset, count: int) -> str:
+        """按输入汉字左连接两张表（一次查询），缺少的表以 NULL 代替"""
+        columns = ['q.char']
+        joins = []
+        for table, alias, key, mapping in [
+            ('hanzi_baidu', 'b', 'char', BAIDU_COLUMNS),
+            ('hanzi', 'h', 'character', LEGACY_COLUMNS),
+        ]:
+            if table in tables:
+                columns += [f'{alias}.{key}'] + [f'{alias}.{column}' for _, column in mapping]
+                joins.append(f'LEFT JOIN {table} {alias} ON {alias}.{key} = q.char')
+            else:
+                columns += ['NULL'] * (len(mapping) + 1)
+        values = ', '.join(['(?)'] * count)
+        return f"WITH q(char) AS (VALUES {values}) SELECT {', '.join(columns)} FROM q {' '.join(joins)}"
+
+    def get_many(self, chars: Iterable[str]) -> Dict[str, HanziEntry]:
+        """
+        批量查询（一次查询）
+
+        Args:
+            chars: 汉字列表
+
+        Returns:
+            {汉字: HanziEntry}，只包含找到的汉字；数据库文件不存在时返回空字典
+        """
+        chars = sorted(set(chars))
+        conn = read_connection() if chars else None
+        if conn is None:
+            return {}
+
+        tables = self._existing_tables(conn)
+        if not tables:
+            return {}
+        rows = conn.execute(self._build_query(tables, len(chars)), chars).fetchall()
+
+        entries: Dict[str, HanziEntry] = {}
+        width = len(BAIDU_COLUMNS) + 1
+        for char, *values in rows:
+            baidu_values, legacy_values = values[:width], values[width:]
+            baidu = dict(zip([field for field, _ in BAIDU_COLUMNS], baidu_values[1:])) if baidu_values[0] else None
+            legacy = dict(zip([field for field, _ in LEGACY_COLUMNS], legacy_values[1:])) if legacy_values[0] else None
+            if baidu or legacy:
+                entries[char] = HanziEntry.from_rows(char, baidu, legacy)
+        return entries
+
+    def get(self, char: str) -> Optional[HanziEntry]:
+        """
+        查询单个汉字
+
+        Args:
+            char: 汉字
+
+        Returns:
+            HanziEntry，未找到时返回 None
+        """
+        return self.get_many([char]).get(char)
+
+    def save(self, char: str, result: Dict) -> None:
+        """
+        将百度汉语查询结果保存到 hanzi_baidu 表（已存在时覆盖）
+
+        Args:
+            char: 汉字
+            result: 百度汉语返回的结果字典
+        """
+        pinyin = result.get('pinyin', [])
+        examples = result.get('examples', [])
+        with write_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO hanzi_baidu
+                (char, pinyin, radical, strokes, frequency, meaning, examples, traditional, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (
+                char,
+                ','.join(pinyin) if isinstance(pinyin, list) else str(pinyin or ''),
+                result.get('radical', ''),
+                result.get('strokes', 0),
+                result.get('frequency', 0),
+                result.get('meaning_zh', ''),
+                '|'.join(examples) if isinstance(examples, list) else '',
+                result.get('traditional', ''),
+            ))
+        # 写连接会在需要时创建 hanzi_baidu 表
+        self._tables.pop(hanzi_db.get_hanzi_db_path(), None)
+
+
+hanzi_repository = HanziRepository()
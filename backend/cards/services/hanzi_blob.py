@@ -0,0 +1,203 @@
+"""
+本地汉字字典的紧凑二进制快照
+
+把 hanzi_local.db 中合并后的汉字数据（HanziEntry）序列化为一个只读文件，
+各工作进程以 mmap 方式打开，查询时只在内存中二分查找，不访问 SQLite。
+文件由 build_hanzi_blob 命令生成，更新时生成新文件后整体替换（os.replace），
+查询时发现文件已被替换会重新映射。
+
+文件格式（整数均为小端 uint32）:
+    头部:   MAGIC(4 字节) | 条目数 n
+    键:     n 个汉字码位，升序
+    偏移:   n + 1 个偏移，第 i 条数据为 payload[offsets[i]:offsets[i + 1]]
+    数据:   每条为 HanziEntry 除 char 以外各字段值（按字段顺序）组成的紧凑 JSON 数组（UTF-8）
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from django.conf import settings
+
+from .hanzi import ENTRY_FIELDS, HanziEntry, hanzi_repository
+from .hanzi_db import read_connection
+
+MAGIC = b'HZB1'
+_HEADER = struct.Struct('<4sI')
+_UINT = struct.Struct('<I')
+
+# 构建时每次查询的汉字数
+BUILD_BATCH_SIZE = 500
+
+# 检查快照文件是否被替换的最短间隔（秒），避免每次查询都 stat
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+class _UIntArray(Sequence):
+    """mmap 中的小端 uint32 数组（按需解码，不复制；仅用于大端平台）"""
+
+    def __init__(self, buffer, offset: int, length: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> int:
+        return _UINT.unpack_from(self._buffer, self._offset + index * _UINT.size)[0]
+
+
+class HanziBlob:
+    """
+    已映射到内存的汉字快照
+
+    Args:
+        path: 快照文件路径
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f'不是汉字快照文件: {path}')
+
+        keys_offset = _HEADER.size
+        offsets_offset = keys_offset + count * _UINT.size
+        self._payload_offset = offsets_offset + (count + 1) * _UINT.size
+        if sys.byteorder == 'little':
+            # 直接把映射区域视为 uint32 数组，二分查找在 C 层完成
+            view = memoryview(self._mmap)
+            self._keys = view[keys_offset:offsets_offset].cast('I')
+            self._offsets = view[offsets_offset:self._payload_offset].cast('I')
+        else:
+            self._keys = _UIntArray(self._mmap, keys_offset, count)
+            self._offsets = _UIntArray(self._mmap, offsets_offset, count + 1)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, char: str) -> Optional[HanziEntry]:
+        """
+        查询单个汉字
+
+        Returns:
+            HanziEntry，快照中没有时返回 None
+        """
+        if len(char) != 1:
+            return None
+        code = ord(char)
+        index = bisect.bisect_left(self._keys, code)
+        if index == len(self._keys) or self._keys[index] != code:
+            return None
+
+        start = self._payload_offset + self._offsets[index]
+        end = self._payload_offset + self._offsets[index + 1]
+        values = json.loads(self._mmap[start:end])
+        return HanziEntry(char, *(tuple(value) if isinstance(value, list) else value for value in values))
+
+
+def _encode(entry: HanziEntry) -> bytes:
+    values = [getattr(entry, name) for name in ENTRY_FIELDS[1:]]
+    return json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_blob(path: str) -> Dict:
+    """
+    从本地汉字数据库生成快照文件
+
+    Args:
+        path: 快照文件路径
+
+    Returns:
+        {'entries': 条目数, 'size': 文件字节数}
+    """
+    conn = read_connection()
+    if conn is None:
+        raise FileNotFoundError('本地汉字数据库不存在')
+
+    tables = {name for name, in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('hanzi', 'hanzi_baidu')"
+    )}
+    chars = set()
+    if 'hanzi' in tables:
+        chars.update(char for char, in conn.execute('SELECT character FROM hanzi'))
+    if 'hanzi_baidu' in tables:
+        chars.update(char for char, in conn.execute('SELECT char FROM hanzi_baidu'))
+    chars = sorted((char for char in chars if char and len(char) == 1), key=ord)
+
+    entries: Dict[str, HanziEntry] = {}
+    for i in range(0, len(chars), BUILD_BATCH_SIZE):
+        entries.update(hanzi_repository.get_many(chars[i:i + BUILD_BATCH_SIZE]))
+    chars = [char for char in chars if char in entries]
+
+    payloads = [_encode(entries[char]) for char in chars]
+    offsets = [0]
+    for payload in payloads:
+        offsets.append(offsets[-1] + len(payload))
+
+    building_path = f'{path}.building'
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(building_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(chars)))
+        f.write(struct.pack(f'<{len(chars)}I', *map(ord, chars)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for payload in payloads:
+            f.write(payload)
+    os.replace(building_path, path)
+    return {'entries': len(chars), 'size': os.path.getsize(path)}
+
+
+_lock = threading.Lock()
+_blob: Optional[HanziBlob] = None
+_identity = None
+_checked_at = 0.0
+
+
+def get_blob() -> Optional[HanziBlob]:
+    """
+    当前进程共用的快照（文件被替换后重新映射）
+
+    Returns:
+        HanziBlob，未配置 HANZI_BLOB_PATH 或文件不存在时返回 None
+    """
+    global _blob, _identity, _checked_at
+
+    path = settings.HANZI_BLOB_PATH
+    if not path:
+        return None
+    blob, identity = _blob, _identity
+    if blob is not None and identity[0] == path and time.monotonic() - _checked_at < RELOAD_CHECK_INTERVAL:
+        return blob
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    identity = (path, stat.st_ino, stat.st_mtime_ns)
+
+    with _lock:
+        if _blob is None or _identity != identity:
+            # 旧映射不主动关闭，其他线程可能仍在读取，由垃圾回收释放
+            _blob, _identity = HanziBlob(path), identity
+        _checked_at = time.monotonic()
+        return _blob
+
+
+def lookup(char: str) -> Optional[HanziEntry]:
+    """
+    从快照查询汉字
+
+    Returns:
+        HanziEntry，未启用快照或快照中没有时返回 None
+    """
+    blob = get_blob()
+    return blob.get(char) if blob is not None else None
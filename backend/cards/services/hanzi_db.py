@@ -0,0 +1,132 @@
+"""
+本地汉字数据库（data/hanzi_local.db）连接管理
+
+- 读: 每个线程一个长期连接（只读，query_only），不再每次查询都重新打开文件；
+- 写: 整个进程共用一个写连接，用锁串行化，写完立即提交；
+- hanzi_baidu 表结构在进程启动时（CardsConfig.ready）或第一次写入时初始化一次。
+
+测试中修改数据库路径后，下一次获取连接时会自动按新路径重新打开。
+"""
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 百度汉语查询结果的本地缓存表
+HANZI_BAIDU_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS hanzi_baidu (
+        char TEXT PRIMARY KEY,
+        pinyin TEXT,
+        radical TEXT,
+        strokes INTEGER,
+        frequency INTEGER DEFAULT 0,
+        meaning TEXT,
+        examples TEXT,
+        traditional TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# 写入时等待锁的秒数
+BUSY_TIMEOUT = 5
+
+_local = threading.local()
+_writer: Optional[sqlite3.Connection] = None
+_writer_path: Optional[str] = None
+_writer_lock = threading.Lock()
+
+
+def get_hanzi_db_path() -> str:
+    """本地汉字数据库路径"""
+    return os.path.join(settings.BASE_DIR.parent, 'data', 'hanzi_local.db')
+
+
+def read_connection() -> Optional[sqlite3.Connection]:
+    """
+    获取当前线程的只读连接
+
+    Returns:
+        sqlite3 连接，数据库文件不存在时返回 None
+    """
+    path = get_hanzi_db_path()
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.path == path:
+        return conn
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+    if not os.path.exists(path):
+        return None
+
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+    conn.execute('PRAGMA query_only = 1')
+    _local.conn, _local.path = conn, path
+    return conn
+
+
+def _open_writer(path: str) -> sqlite3.Connection:
+    """打开写连接并初始化表结构（调用方持有 _writer_lock）"""
+    global _writer, _writer_path
+
+    if _writer is not None:
+        _writer.close()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _writer = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    _writer.execute(HANZI_BAIDU_SCHEMA)
+    _writer.commit()
+    _writer_path = path
+    return _writer
+
+
+@contextmanager
+def write_connection() -> Iterator[sqlite3.Connection]:
+    """
+    获取进程共用的写连接（同一时间只有一个线程写入），退出时提交，出错时回滚
+
+    用法:
+        with write_connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO hanzi_baidu ...', params)
+    """
+    with _writer_lock:
+        path = get_hanzi_db_path()
+        conn = _writer if _writer is not None and _writer_path == path else _open_writer(path)
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def init_schema() -> None:
+    """进程启动时初始化表结构（数据库文件不存在时等到第一次写入再创建）"""
+    path = get_hanzi_db_path()
+    if not os.path.exists(path):
+        return
+    try:
+        with _writer_lock:
+            _open_writer(path)
+    except sqlite3.Error as e:
+        logger.warning(f"初始化本地汉字数据库失败: {e}")
+
+
+def close_connections() -> None:
+    """关闭当前线程的读连接和进程共用的写连接"""
+    global _writer, _writer_path
+
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+        _writer, _writer_path = None, None
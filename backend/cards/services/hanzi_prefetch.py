@@ -0,0 +1,146 @@
+"""
+预取百度汉语数据到本地 hanzi_baidu 表
+
+按字频顺序遍历原有 hanzi 表，对 hanzi_baidu 中还没有的字并发请求百度汉语并逐条保存，
+这样线上查询几乎不会走到 L3 网络请求。
+
+- 并发数固定（线程池），同时在途的请求数不超过 workers 的两倍；
+- 所有线程共用一个限速器，整体请求速率不超过 rate 次/秒；
+- 每个字查到后立即写入，中断后重新运行会跳过已有的字，从而接着上次的进度；
+- 与线上查询共用 BaiduHanyuService 的熔断器，熔断时停止本次预取。
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from .baidu_hanyu import BaiduHanyuService, BaiduHanyuUnavailable
+from .hanzi import hanzi_repository
+from .hanzi_db import init_schema, read_connection
+
+PREFETCH_WORKERS = 4
+PREFETCH_RATE = 5.0
+
+
+class RateLimiter:
+    """
+    限速器: 多个线程共用，相邻两次放行至少间隔 1/rate 秒
+
+    Args:
+        rate: 每秒放行次数
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def pending_chars(limit: Optional[int] = None) -> List[str]:
+    """
+    待预取的字: 按字频（frequency_order_1）取前 limit 个，去掉 hanzi_baidu 中已有的
+
+    Args:
+        limit: 只考虑字频最高的前 limit 个字，None 表示全部
+
+    Returns:
+        按字频排序的汉字列表
+    """
+    init_schema()
+    conn = read_connection()
+    if conn is None:
+        raise FileNotFoundError('本地汉字数据库不存在')
+
+    rows = conn.execute("""
+        SELECT character FROM (
+            SELECT character, frequency_order_1, id FROM hanzi
+            ORDER BY frequency_order_1 IS NULL, frequency_order_1, id
+            LIMIT ?
+        )
+        WHERE character NOT IN (SELECT char FROM hanzi_baidu)
+        ORDER BY frequency_order_1 IS NULL, frequency_order_1, id
+    """, (-1 if limit is None else limit,)).fetchall()
+    return [char for char, in rows]
+
+
+def prefetch_hanzi(
+    chars: List[str],
+    workers: int = PREFETCH_WORKERS,
+    rate: float = PREFETCH_RATE,
+    base_url: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict:
+    """
+    并发请求百度汉语并保存到 hanzi_baidu
+
+    Args:
+        chars: 待预取的字（通常来自 pending_chars）
+        workers: 并发线程数
+        rate: 每秒最多请求次数
+        base_url: 百度汉语接口地址（测试时指向本地服务）
+        progress_callback: 进度回调 (已完成数, 总数)
+
+    Returns:
+        {'saved': 保存数, 'not_found': [百度汉语未收录的字], 'failed': 失败数,
+         'remaining': 因熔断未处理的数量, 'elapsed': 耗时秒数}
+    """
+    limiter = RateLimiter(rate)
+    stop = threading.Event()
+    stats = {'saved': 0, 'not_found': [], 'failed': 0}
+    stats_lock = threading.Lock()
+
+    def fetch(char):
+        if stop.is_set():
+            return
+        limiter.wait()
+        try:
+            result = BaiduHanyuService.fetch(char, base_url=base_url)
+        except BaiduHanyuUnavailable:
+            with stats_lock:
+                stats['failed'] += 1
+            if BaiduHanyuService.breaker.is_open:
+                stop.set()
+            return
+        if result:
+            hanzi_repository.save(char, result)
+        with stats_lock:
+            if result:
+                stats['saved'] += 1
+            else:
+                stats['not_found'].append(char)
+
+    start = time.time()
+    done = 0
+    queue = iter(chars)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        while not stop.is_set():
+            for char in queue:
+                in_flight.add(executor.submit(fetch, char))
+                if len(in_flight) >= workers * 2:
+                    break
+            if not in_flight:
+                break
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                future.result()
+            done += len(finished)
+            if progress_callback:
+                progress_callback(done, len(chars))
+        for future in wait(in_flight).done:
+            future.result()
+
+    processed = stats['saved'] + len(stats['not_found']) + stats['failed']
+    return {
+        **stats,
+        'remaining': len(chars) - processed,
+        'elapsed': time.time() - start,
+    }
@@ -2,19 +2,182 @@
 卡片导入导出服务
 
 提供 CSV/JSON 格式的卡片导入导出功能，支持 Anki 格式兼容。
+导出以生成器形式逐块读取数据库、逐行输出，内存占用与卡片数量无关。
 """
 import csv
 import json
-import hashlib
 from io import StringIO
-from typing import List, Dict, Tuple, Optional
+import logging
+from typing import Callable, List, Dict, TextIO, Tuple, Optional, Iterator
 from django.contrib.auth.models import User
-from ..models import Card, Deck
+from django.db import connection, transaction
+from django.utils import timezone
+from ..models import Card, Deck, generate_semantic_hash
+
+logger = logging.getLogger(__name__)
+
+# 导出时每次从数据库读取的行数
+EXPORT_CHUNK_SIZE = 2000
+
+# 流式导入时每批写入的记录数、每次从文件读取的字符数
+IMPORT_BATCH_SIZE = 1000
+IMPORT_READ_SIZE = 64 * 1024
+
+# 导入结果中最多保留的错误/重复项详情条数
+MAX_REPORTED_ITEMS = 1000
+
+# 查重时每条 IN 查询包含的哈希数（SQLite 旧版本限制 999 个参数）
+HASH_LOOKUP_CHUNK_SIZE = 500
+
+# 冲突处理时写回的字段，及每次 executemany 包含的卡片数
+OVERWRITE_FIELDS = ['deck', 'word', 'card_type', 'metadata', 'tags']
+MERGE_FIELDS = ['metadata', 'tags']
+UPDATE_BATCH_SIZE = 1000
+
+# 导入时可从本地字典补全的元数据字段（enrich=True）
+ENRICH_FIELDS = {
+    'en': ['ipa', 'pos', 'frequency', 'cefr'],
+    'zh': ['pinyin', 'radical', 'strokes'],
+}
+
+
+def bulk_update_cards(cards: List[Card], fields: List[str]) -> None:
+    """
+    批量写回卡片的指定字段
+
+    每张卡片的值都不同时，QuerySet.bulk_update 需要为每行每个字段构造 CASE WHEN 表达式，
+    Python 端开销随行数线性增长，上万行时比逐条 save() 还慢。这里改为同一条参数化
+    UPDATE 语句配合 executemany，值的转换仍使用字段自身的 get_db_prep_save。
+
+    Args:
+        cards: Card 对象列表
+        fields: 字段名列表
+    """
+    qn = connection.ops.quote_name
+    model_fields = [Card._meta.get_field(name) for name in fields]
+    sql = 'UPDATE {table} SET {assignments} WHERE {pk} = %s'.format(
+        table=qn(Card._meta.db_table),
+        assignments=', '.join(f'{qn(field.column)} = %s' for field in model_fields),
+        pk=qn(Card._meta.pk.column),
+    )
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(cards), UPDATE_BATCH_SIZE):
+            cursor.executemany(sql, [
+                [field.get_db_prep_save(getattr(card, field.attname), connection) for field in model_fields] + [card.pk]
+                for card in cards[start:start + UPDATE_BATCH_SIZE]
+            ])
+
+
+def iter_json_array(stream: TextIO, read_size: int = IMPORT_READ_SIZE) -> Iterator:
+    """
+    增量解析 JSON 数组，逐个产出元素
+
+    支持顶层数组 [...] 和 {"cards": [...]}（cards 之前的其他键会被跳过）。
+    每次只从流中读取 read_size 个字符，已解析的部分随即丢弃。
+
+    Args:
+        stream: 文本流
+        read_size: 每次读取的字符数
+
+    Yields:
+        数组中的每个元素
+
+    Raises:
+        ValueError: JSON 格式错误
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(read_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def peek() -> str:
+        """跳过空白，返回下一个字符（文件结束时返回空串）"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return buffer[pos:pos + 1]
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"JSON 格式错误: 应为 '{char}'")
+        pos += 1
+
+    def decode():
+        """解析下一个完整的值（数据不够时继续读取）"""
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # 数字可能被缓冲区截断（如 "2." 被解析为 2），值之后必须是分隔符
+                if eof or (end < len(buffer) and buffer[end] in ' \t\r\n,:]}'):
+                    pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(str(e))
+            fill()
+
+    first = peek()
+    if first == '{':
+        pos += 1
+        while True:
+            if peek() == '}':
+                raise ValueError("JSON 格式错误: 需要数组或包含 'cards' 键的对象")
+            key = decode()
+            expect(':')
+            if key == 'cards':
+                break
+            decode()
+            if peek() == ',':
+                pos += 1
+    elif first != '[':
+        raise ValueError("JSON 格式错误: 需要数组或包含 'cards' 键的对象")
+
+    expect('[')
+    if peek() == ']':
+        return
+    while True:
+        yield decode()
+        char = peek()
+        pos += 1
+        if char == ']':
+            return
+        if char != ',':
+            raise ValueError("JSON 格式错误: 应为 ',' 或 ']'")
+
+
+class _EchoBuffer:
+    """csv.writer 的伪文件对象: write 直接返回写入的内容，便于逐行流式输出"""
+
+    def write(self, value):
+        return value
 
 
 class ImportExportService:
     """导入导出服务类"""
 
+    CSV_EXPORT_FIELDS = ['Front', 'Back', 'Tags', 'State', 'Interval', 'EF', 'Created']
+
+    # 精简导出时省略的元数据键（卡片 SVG 每张约数 KB）
+    BULKY_METADATA_KEYS = ('svg_front', 'svg_back')
+
     # Anki 字段映射（固定映射策略）
     ANKI_FIELD_MAPPING = {
         'Front': 'word',
@@ -24,26 +187,8 @@ class ImportExportService:
 
     @staticmethod
     def generate_semantic_hash(word: str, meaning: str) -> str:
-        """
-        生成语义指纹哈希
-
-        基于核心字段生成 MD5 哈希，用于检测重复卡片。
-        忽略空格和大小写差异。
-
-        Args:
-            word: 单词/汉字
-            meaning: 释义
-
-        Returns:
-            32位 MD5 哈希字符串
-        """
-        # 规范化文本
-        normalized_word = word.strip().lower()
-        normalized_meaning = meaning.strip().lower()
-
-        # 生成哈希
-        content = f"{normalized_word}|{normalized_meaning}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        """生成语义指纹哈希（见 models.generate_semantic_hash）"""
+        return generate_semantic_hash(word, meaning)
 
     @staticmethod
     def parse_csv(file_content: str) -> Tuple[List[Dict], List[str]]:
@@ -175,10 +320,64 @@ class ImportExportService:
             'semantic_hash': semantic_hash,
         }
 
+    @staticmethod
+    def enrich_card_data(card_data_list: List[Dict], card_type: str = 'en') -> int:
+        """
+        用本地字典补全卡片元数据（整批一次查询，已有的字段不覆盖）
+
+        英语卡片从 ECDICT 补全 ENRICH_FIELDS['en']，中文卡片从 hanzi_local.db 补全
+        ENRICH_FIELDS['zh']。字典查询失败时不补全，不影响导入。
+
+        Args:
+            card_data_list: convert_anki_to_card_data 生成的卡片数据列表（原地修改）
+            card_type: 卡片类型 ('en' 或 'zh')
+
+        Returns:
+            补全了至少一个字段的卡片数
+        """
+        fields = ENRICH_FIELDS.get(card_type)
+        words = [data['word'] for data in card_data_list]
+        if not fields or not words:
+            return 0
+
+        try:
+            if card_type == 'en':
+                from .ecdict import entry_to_result, get_entries, normalize_word
+
+                entries = get_entries(words)
+                found = {
+                    word: entry_to_result(entries[normalize_word(word)])
+                    for word in words
+                    if normalize_word(word) in entries
+                }
+            else:
+                from .hanzi import hanzi_repository
+
+                found = {char: entry.to_result() for char, entry in hanzi_repository.get_many(words).items()}
+        except Exception:
+            logger.warning('导入时补全字典信息失败', exc_info=True)
+            return 0
+
+        enriched = 0
+        for data in card_data_list:
+            entry = found.get(data['word'])
+            if not entry:
+                continue
+            metadata = data['metadata']
+            updates = {
+                field: entry[field]
+                for field in fields
+                if entry.get(field) not in (None, '', []) and metadata.get(field) in (None, '', [])
+            }
+            if updates:
+                metadata.update(updates)
+                enriched += 1
+        return enriched
+
     @staticmethod
     def check_duplicates(card_data_list: List[Dict], user: User) -> Dict[str, List]:
         """
-        检查重复卡片
+        检查重复卡片（与数据库中已有卡片重复，以及文件内部重复）
 
         Args:
             card_data_list: 待导入的卡片数据列表
@@ -186,35 +385,42 @@ class ImportExportService:
 
         Returns:
             {
-                'duplicates': [(index, existing_card), ...],
+                'duplicates': [(index, existing_card), ...],  # 与已有卡片重复
+                'in_file': [(index, unique_position), ...],   # 与本批前面某条重复，unique_position 为其在 unique 中的位置
                 'unique': [card_data, ...]
             }
         """
         duplicates = []
+        in_file = []
         unique = []
 
-        # 提取所有哈希值
-        hashes = [data['semantic_hash'] for data in card_data_list]
-
-        # 批量查询数据库中已存在的卡片
-        existing_cards = Card.objects.filter(
-            user=user,
-            semantic_hash__in=hashes
-        ).only('id', 'word', 'semantic_hash', 'metadata', 'created_at')
+        # 提取所有哈希值（去重后分块查询，避免超出 SQLite 的参数个数限制）
+        hashes = list(dict.fromkeys(data['semantic_hash'] for data in card_data_list))
 
         # 创建哈希 -> 卡片的映射
-        hash_to_card = {card.semantic_hash: card for card in existing_cards}
+        hash_to_card = {}
+        for start in range(0, len(hashes), HASH_LOOKUP_CHUNK_SIZE):
+            existing_cards = Card.objects.filter(
+                user=user,
+                semantic_hash__in=hashes[start:start + HASH_LOOKUP_CHUNK_SIZE]
+            ).only('id', 'word', 'semantic_hash', 'metadata', 'tags', 'created_at')
+            hash_to_card.update((card.semantic_hash, card) for card in existing_cards)
 
         # 检查每条数据
+        seen = {}
         for idx, card_data in enumerate(card_data_list):
             semantic_hash = card_data['semantic_hash']
             if semantic_hash in hash_to_card:
                 duplicates.append((idx, hash_to_card[semantic_hash]))
+            elif semantic_hash in seen:
+                in_file.append((idx, seen[semantic_hash]))
             else:
+                seen[semantic_hash] = len(unique)
                 unique.append(card_data)
 
         return {
             'duplicates': duplicates,
+            'in_file': in_file,
             'unique': unique,
         }
 
@@ -225,7 +431,8 @@ class ImportExportService:
         user: User,
         deck: Deck,
         card_type: str = 'en',
-        conflict_strategy: str = 'skip'
+        conflict_strategy: str = 'skip',
+        enrich: bool = False,
     ) -> Dict:
         """
         导入卡片
@@ -237,6 +444,7 @@ class ImportExportService:
             deck: 卡组对象
             card_type: 卡片类型 ('en' 或 'zh')
             conflict_strategy: 冲突处理策略 ('skip', 'overwrite', 'merge')
+            enrich: 是否用本地字典补全元数据（见 enrich_card_data）
 
         Returns:
             {
@@ -278,104 +486,295 @@ class ImportExportService:
             ImportExportService.convert_anki_to_card_data(row, user, deck, card_type)
             for row in rows
         ]
+        if enrich:
+            ImportExportService.enrich_card_data(card_data_list, card_type)
+
+        result = ImportExportService._empty_result()
+        result['total'] = len(rows)
+        ImportExportService._import_batch(card_data_list, 0, user, conflict_strategy, result)
+
+        # bulk_create 不触发信号，导入后使物化复习队列和分析缓存过期
+        if result['imported']:
+            from .analytics import invalidate_analytics
+            from .review_queue import invalidate_review_queue
+            invalidate_review_queue(user.id)
+            invalidate_analytics(user.id)
+
+        return result
+
+    @staticmethod
+    def _empty_result() -> Dict:
+        return {
+            'total': 0,
+            'imported': 0,
+            'skipped': 0,
+            'failed': 0,
+            'errors': [],
+            'duplicates': [],
+        }
+
+    @staticmethod
+    def _report(items: List, item) -> None:
+        """记录错误或重复项详情（超过 MAX_REPORTED_ITEMS 条后不再记录）"""
+        if len(items) < MAX_REPORTED_ITEMS:
+            items.append(item)
+
+    @staticmethod
+    def _import_batch(
+        card_data_list: List[Dict],
+        offset: int,
+        user: User,
+        conflict_strategy: str,
+        result: Dict,
+        positions: Optional[List[int]] = None,
+    ) -> None:
+        """
+        导入一批卡片数据（查重、处理冲突、批量创建），计数累加到 result
+
+        Args:
+            card_data_list: 待导入的卡片数据列表
+            offset: 本批第一条在整个文件中的序号（从 0 开始）
+            user: 用户对象
+            conflict_strategy: 冲突处理策略 ('skip', 'overwrite', 'merge')
+            result: 导入结果字典（见 import_cards 的返回值）
+            positions: 每条在整个文件中的序号（批内夹有格式错误的记录时不连续），默认从 offset 起连续编号
+        """
+        report = ImportExportService._report
+        if positions is None:
+            positions = range(offset, offset + len(card_data_list))
 
         # 检查重复
         duplicate_check = ImportExportService.check_duplicates(card_data_list, user)
         duplicates = duplicate_check['duplicates']
         unique_cards = duplicate_check['unique']
 
-        imported_count = 0
-        skipped_count = 0
-        failed_count = 0
-        errors = []
-        duplicate_details = []
-
         # 处理重复卡片
         if conflict_strategy == 'skip':
             # 跳过所有重复
-            skipped_count = len(duplicates)
-            duplicate_details = [
-                {
-                    'index': idx,
+            result['skipped'] += len(duplicates)
+            for idx, existing_card in duplicates:
+                report(result['duplicates'], {
+                    'index': positions[idx],
                     'word': card_data_list[idx]['word'],
                     'existing_id': existing_card.id,
                     'reason': '重复卡片'
-                }
-                for idx, existing_card in duplicates
-            ]
+                })
 
-        elif conflict_strategy == 'overwrite':
-            # 覆盖重复卡片
+        elif conflict_strategy in ('overwrite', 'merge'):
+            # 在内存中修改重复卡片，再统一 bulk_update（同一张卡片多次出现时按顺序累积）
+            updated = {}
             for idx, existing_card in duplicates:
                 card_data = card_data_list[idx]
-                try:
-                    # 更新现有卡片
-                    for key, value in card_data.items():
-                        if key not in ['user', 'semantic_hash']:
-                            setattr(existing_card, key, value)
-                    existing_card.save()
-                    imported_count += 1
-                except Exception as e:
-                    failed_count += 1
-                    errors.append(f"第 {idx + 1} 条覆盖失败: {str(e)}")
-
-        elif conflict_strategy == 'merge':
-            # 合并元数据（保留两者）
-            for idx, existing_card in duplicates:
-                card_data = card_data_list[idx]
-                try:
-                    # 合并标签
-                    existing_tags = set(existing_card.tags)
-                    new_tags = set(card_data['tags'])
-                    existing_card.tags = list(existing_tags | new_tags)
-
-                    # 合并元数据
+                if conflict_strategy == 'overwrite':
+                    # 覆盖现有卡片
+                    for key in OVERWRITE_FIELDS:
+                        setattr(existing_card, key, card_data[key])
+                else:
+                    # 合并标签和元数据（保留两者）
+                    existing_card.tags = list(set(existing_card.tags) | set(card_data['tags']))
                     existing_card.metadata.update(card_data['metadata'])
-                    existing_card.save()
-                    imported_count += 1
-                except Exception as e:
-                    failed_count += 1
-                    errors.append(f"第 {idx + 1} 条合并失败: {str(e)}")
+                updated[existing_card.id] = existing_card
+
+            fields = OVERWRITE_FIELDS if conflict_strategy == 'overwrite' else MERGE_FIELDS
+            action = '覆盖' if conflict_strategy == 'overwrite' else '合并'
+            now = timezone.now()
+            for card in updated.values():
+                card.updated_at = now
+            try:
+                with transaction.atomic():
+                    bulk_update_cards(list(updated.values()), [*fields, 'updated_at'])
+                result['imported'] += len(duplicates)
+            except Exception as e:
+                result['failed'] += len(duplicates)
+                report(result['errors'], f"第 {positions[0] + 1}-{positions[-1] + 1} 条中的重复卡片{action}失败: {str(e)}")
+
+        # 处理文件内重复: 按相同策略作用到同一批中先出现的那条记录上
+        in_file = duplicate_check['in_file']
+        for idx, position in in_file:
+            card_data = card_data_list[idx]
+            if conflict_strategy == 'overwrite':
+                unique_cards[position] = card_data
+            elif conflict_strategy == 'merge':
+                first = unique_cards[position]
+                first['tags'] = list(dict.fromkeys(first['tags'] + card_data['tags']))
+                first['metadata'] = {**first['metadata'], **card_data['metadata']}
+            else:
+                result['skipped'] += 1
+                report(result['duplicates'], {
+                    'index': positions[idx],
+                    'word': card_data['word'],
+                    'existing_id': None,
+                    'reason': '文件内重复'
+                })
+        if conflict_strategy in ('overwrite', 'merge'):
+            result['imported'] += len(in_file)
 
         # 批量创建新卡片
         try:
             new_cards = [Card(**data) for data in unique_cards]
             Card.objects.bulk_create(new_cards)
-            imported_count += len(new_cards)
+            result['imported'] += len(new_cards)
         except Exception as e:
-            failed_count += len(unique_cards)
-            errors.append(f"批量创建失败: {str(e)}")
+            result['failed'] += len(unique_cards)
+            report(result['errors'], f"批量创建失败: {str(e)}")
 
-        return {
-            'total': len(rows),
-            'imported': imported_count,
-            'skipped': skipped_count,
-            'failed': failed_count,
-            'errors': errors,
-            'duplicates': duplicate_details,
-        }
+    @staticmethod
+    def iter_csv_rows(stream: TextIO) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+        """
+        逐行解析 CSV 文本流
+
+        Args:
+            stream: 文本流（按需读取，不会整体载入内存）
+
+        Yields:
+            (行数据, None) 或 (None, 错误信息)
+        """
+        reader = csv.DictReader(stream)
+        for line_num, row in enumerate(reader, start=2):  # 从第2行开始（第1行是header）
+            # 验证必需字段
+            if not row.get('Front') or not row.get('Back'):
+                yield None, f"第 {line_num} 行: 缺少 Front 或 Back 字段"
+                continue
+            yield row, None
 
     @staticmethod
-    def export_cards_to_csv(cards) -> str:
+    def iter_json_rows(stream: TextIO) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
         """
-        导出卡片到 CSV 格式
+        逐条解析 JSON 文本流（数组格式或 {"cards": [...]} 格式）
 
         Args:
-            cards: Card QuerySet
+            stream: 文本流（按需读取，不会整体载入内存）
+
+        Yields:
+            (行数据, None) 或 (None, 错误信息)
+        """
+        for idx, row in enumerate(iter_json_array(stream), start=1):
+            if not isinstance(row, dict):
+                yield None, f"第 {idx} 条: 不是有效的对象"
+                continue
+
+            if not row.get('Front') or not row.get('Back'):
+                yield None, f"第 {idx} 条: 缺少 Front 或 Back 字段"
+                continue
+
+            yield row, None
+
+    @staticmethod
+    def import_cards_stream(
+        stream: TextIO,
+        file_format: str,
+        user: User,
+        deck: Deck,
+        card_type: str = 'en',
+        conflict_strategy: str = 'skip',
+        batch_size: int = IMPORT_BATCH_SIZE,
+        progress_callback: Optional[Callable[[Dict], None]] = None,
+        enrich: bool = False,
+    ) -> Dict:
+        """
+        流式导入卡片
+
+        边读边解析，每凑满 batch_size 条有效记录就查重并批量写入一次，内存占用与文件大小无关。
+        与 import_cards 不同，格式错误的记录会被跳过并计入 failed，不会中止整个导入；
+        已写入的批次不会因为后续错误回滚。
+
+        Args:
+            stream: 文件文本流
+            file_format: 文件格式 ('csv' 或 'json')
+            user: 用户对象
+            deck: 卡组对象
+            card_type: 卡片类型 ('en' 或 'zh')
+            conflict_strategy: 冲突处理策略 ('skip', 'overwrite', 'merge')
+            batch_size: 每批写入的记录数
+            progress_callback: 每批处理完成后以当前结果调用
+            enrich: 是否用本地字典补全元数据（每批一次字典查询）
 
         Returns:
-            CSV 内容字符串
+            与 import_cards 相同，另含 'batches': 已处理的批次数
         """
-        output = StringIO()
-        fieldnames = ['Front', 'Back', 'Tags', 'State', 'Interval', 'EF', 'Created']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        result = ImportExportService._empty_result()
+        result['batches'] = 0
 
-        writer.writeheader()
-        for card in cards:
+        if file_format == 'csv':
+            rows = ImportExportService.iter_csv_rows(stream)
+        elif file_format == 'json':
+            rows = ImportExportService.iter_json_rows(stream)
+        else:
+            result['errors'].append(f"不支持的格式: {file_format}")
+            return result
+
+        def flush(batch, positions):
+            if enrich:
+                ImportExportService.enrich_card_data(batch, card_type)
+            ImportExportService._import_batch(batch, positions[0], user, conflict_strategy, result, positions=positions)
+            result['batches'] += 1
+            logger.info('导入进度: 用户 %s, 第 %d 批, 已处理 %d 条', user.id, result['batches'], result['total'])
+            if progress_callback:
+                progress_callback(result)
+
+        # 格式错误的记录只计数，不打断当前批次；batch_positions 记录每条在文件中的序号
+        batch = []
+        batch_positions = []
+        try:
+            for row, error in rows:
+                if error:
+                    result['total'] += 1
+                    result['failed'] += 1
+                    ImportExportService._report(result['errors'], error)
+                    continue
+
+                batch.append(ImportExportService.convert_anki_to_card_data(row, user, deck, card_type))
+                batch_positions.append(result['total'])
+                result['total'] += 1
+                if len(batch) >= batch_size:
+                    flush(batch, batch_positions)
+                    batch = []
+                    batch_positions = []
+        except UnicodeDecodeError:
+            result['errors'].append(f"文件编码错误（第 {result['total'] + 1} 条附近），请使用 UTF-8 编码")
+        except (csv.Error, ValueError) as e:
+            result['errors'].append(f"{file_format.upper()} 解析失败: {str(e)}")
+
+        # 出错前已解析的记录照常写入
+        if batch:
+            flush(batch, batch_positions)
+
+        # bulk_create 不触发信号，导入后使物化复习队列和分析缓存过期
+        if result['imported']:
+            from .analytics import invalidate_analytics
+            from .review_queue import invalidate_review_queue
+            invalidate_review_queue(user.id)
+            invalidate_analytics(user.id)
+
+        return result
+
+    @staticmethod
+    def _export_metadata(metadata: Dict, compact: bool) -> Dict:
+        """导出用的元数据（精简模式下省略体积较大的键）"""
+        if not compact:
+            return metadata
+        return {key: value for key, value in metadata.items() if key not in ImportExportService.BULKY_METADATA_KEYS}
+
+    @staticmethod
+    def iter_cards_csv(cards, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        逐行生成 CSV 导出内容
+
+        Args:
+            cards: Card QuerySet
+            chunk_size: 每次从数据库读取的行数
+
+        Yields:
+            CSV 文本片段（表头或一行数据）
+        """
+        writer = csv.DictWriter(_EchoBuffer(), fieldnames=ImportExportService.CSV_EXPORT_FIELDS)
+
+        yield writer.writeheader()
+        for card in cards.iterator(chunk_size=chunk_size):
             # 提取释义
             meaning = card.metadata.get('meaning', '') or card.metadata.get('meaning_zh', '')
 
-            writer.writerow({
+            yield writer.writerow({
                 'Front': card.word,
                 'Back': meaning,
                 'Tags': ','.join(card.tags),
@@ -385,33 +784,62 @@ class ImportExportService:
                 'Created': card.created_at.strftime('%Y-%m-%d'),
             })
 
-        return output.getvalue()
-
     @staticmethod
-    def export_cards_to_json(cards) -> str:
+    def iter_cards_json(cards, compact: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
         """
-        导出卡片到 JSON 格式
+        逐张卡片生成 JSON 导出内容（{"cards": [...]}，每张卡片一行）
 
         Args:
             cards: Card QuerySet
+            compact: 是否省略体积较大的元数据（如 SVG）
+            chunk_size: 每次从数据库读取的行数
 
-        Returns:
-            JSON 内容字符串
+        Yields:
+            JSON 文本片段
         """
-        cards_data = []
-        for card in cards:
+        yield '{"cards": [\n'
+        separator = ''
+        for card in cards.iterator(chunk_size=chunk_size):
             # 提取释义
             meaning = card.metadata.get('meaning', '') or card.metadata.get('meaning_zh', '')
 
-            cards_data.append({
+            item = json.dumps({
                 'Front': card.word,
                 'Back': meaning,
                 'Tags': card.tags,
                 'State': card.state,
                 'Interval': card.interval,
                 'EF': card.ef,
-                'Metadata': card.metadata,
+                'Metadata': ImportExportService._export_metadata(card.metadata, compact),
                 'Created': card.created_at.isoformat(),
-            })
+            }, ensure_ascii=False)
+            yield f'{separator}  {item}'
+            separator = ',\n'
+        yield '\n]}\n'
+
+    @staticmethod
+    def export_cards_to_csv(cards) -> str:
+        """
+        导出卡片到 CSV 格式
 
-        return json.dumps({'cards': cards_data}, ensure_ascii=False, indent=2)
+        Args:
+            cards: Card QuerySet
+
+        Returns:
+            CSV 内容字符串
+        """
+        return ''.join(ImportExportService.iter_cards_csv(cards))
+
+    @staticmethod
+    def export_cards_to_json(cards, compact: bool = False) -> str:
+        """
+        导出卡片到 JSON 格式
+
+        Args:
+            cards: Card QuerySet
+            compact: 是否省略体积较大的元数据（如 SVG）
+
+        Returns:
+            JSON 内容字符串
+        """
+        return ''.join(ImportExportService.iter_cards_json(cards, compact))
@@ -0,0 +1,169 @@
+"""
+后台导入任务服务
+
+上传接口只负责保存文件并创建 ImportJob，实际导入在进程内的线程池中执行
+（不依赖外部消息队列）。导入过程中每处理完一批就把进度写回任务记录，
+客户端轮询 /api/cards/import/<job_id>/ 获取进度。
+
+进程重启时（runserver 自动重载、gunicorn 回收 worker）线程池中未完成的任务随之丢失，
+不会自动恢复: 查询进度时发现任务超过 IMPORT_JOB_STALE_TIMEOUT 秒没有写回进度，
+就把它标记为失败，客户端据此提示用户重新上传。
+"""
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from ..models import ImportJob
+from .import_export import ImportExportService
+
+logger = logging.getLogger(__name__)
+
+# 每批写回任务记录的进度字段
+PROGRESS_FIELDS = ['total', 'imported', 'skipped', 'failed', 'batches', 'errors', 'duplicates']
+
+STALE_JOB_MESSAGE = '导入任务长时间没有进展（服务可能已重启），请重新上传文件'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """获取导入线程池（首次使用时创建）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMPORT_JOB_WORKERS,
+                thread_name_prefix='import-job',
+            )
+        return _executor
+
+
+def create_import_job(
+    user, deck, uploaded_file, file_format: str, card_type: str, conflict_strategy: str, enrich: bool = False
+) -> ImportJob:
+    """
+    保存上传文件并创建导入任务，事务提交后放入线程池执行
+
+    Args:
+        user: 用户对象
+        deck: 卡组对象
+        uploaded_file: 上传的文件
+        file_format: 文件格式 ('csv' 或 'json')
+        card_type: 卡片类型 ('en' 或 'zh')
+        conflict_strategy: 冲突处理策略 ('skip', 'overwrite', 'merge')
+        enrich: 是否用本地字典补全元数据
+
+    Returns:
+        ImportJob 对象
+    """
+    job = ImportJob.objects.create(
+        user=user,
+        deck=deck,
+        file=uploaded_file,
+        file_name=uploaded_file.name,
+        file_size=uploaded_file.size,
+        file_format=file_format,
+        card_type=card_type,
+        conflict_strategy=conflict_strategy,
+        enrich=enrich,
+    )
+
+    if settings.IMPORT_JOBS_EAGER:
+        run_import_job(job.id)
+        job.refresh_from_db()
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run_in_worker, job.id))
+
+    return job
+
+
+def _run_in_worker(job_id: int) -> None:
+    """线程池入口: 执行任务并释放本线程的数据库连接"""
+    close_old_connections()
+    try:
+        run_import_job(job_id)
+    finally:
+        connection.close()
+
+
+def _save_progress(job_id: int, result: Dict) -> None:
+    ImportJob.objects.filter(pk=job_id).update(
+        updated_at=timezone.now(),
+        **{field: result[field] for field in PROGRESS_FIELDS},
+    )
+
+
+def run_import_job(job_id: int) -> None:
+    """
+    执行导入任务（只会执行处于 pending 状态的任务）
+
+    Args:
+        job_id: 任务 ID
+    """
+    now = timezone.now()
+    claimed = ImportJob.objects.filter(pk=job_id, status='pending').update(
+        status='running', started_at=now, updated_at=now
+    )
+    if not claimed:
+        return
+
+    job = ImportJob.objects.select_related('user', 'deck').get(pk=job_id)
+    try:
+        with job.file.open('rb') as f:
+            stream = io.TextIOWrapper(f, encoding='utf-8-sig', newline='')
+            result = ImportExportService.import_cards_stream(
+                stream=stream,
+                file_format=job.file_format,
+                user=job.user,
+                deck=job.deck,
+                card_type=job.card_type,
+                conflict_strategy=job.conflict_strategy,
+                enrich=job.enrich,
+                progress_callback=lambda progress: _save_progress(job_id, progress),
+            )
+        _save_progress(job_id, result)
+        ImportJob.objects.filter(pk=job_id).update(status='completed', finished_at=timezone.now())
+    except Exception as e:
+        logger.exception('导入任务 %s 失败', job_id)
+        ImportJob.objects.filter(pk=job_id).update(
+            status='failed', error_message=str(e), finished_at=timezone.now()
+        )
+    finally:
+        # 导入结束后不再需要上传文件
+        job.file.delete(save=False)
+        ImportJob.objects.filter(pk=job_id).update(file='')
+
+
+def fail_stale_job(job: ImportJob) -> bool:
+    """
+    把超过 IMPORT_JOB_STALE_TIMEOUT 秒没有写回进度的未完成任务标记为失败
+
+    执行任务的进程重启后任务状态不会再更新；排队过久的 pending 任务同样视为已丢失。
+
+    Args:
+        job: ImportJob 对象（标记为失败时会重新读取）
+
+    Returns:
+        是否标记为失败
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.IMPORT_JOB_STALE_TIMEOUT)
+    marked = ImportJob.objects.filter(
+        pk=job.pk, status__in=['pending', 'running'], updated_at__lt=cutoff
+    ).update(status='failed', error_message=STALE_JOB_MESSAGE, finished_at=now, updated_at=now)
+    if not marked:
+        return False
+
+    logger.warning('导入任务 %s 超时未更新，标记为失败', job.pk)
+    job.file.delete(save=False)
+    ImportJob.objects.filter(pk=job.pk).update(file='')
+    job.refresh_from_db()
+    return True
@@ -0,0 +1,173 @@
+"""
+多音字读音推断服务
+
+jieba 第一次分词时才加载词典（秒级），pypinyin 第一次调用时加载拼音数据。
+服务进程启动时（config.wsgi / config.asgi）在后台线程中预热，请求线程不再承担加载开销；
+预热完成前到达的请求会等待 jieba 自身的初始化锁，不会重复加载。
+
+同一 (汉字, 语境) 的推断结果用 LRU 缓存（PINYIN_CACHE_SIZE 条）；
+语境超过 MEMO_CONTEXT_LENGTH 字时不缓存，避免长文本占满缓存内存。
+"""
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_HAN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+# 推断结果参与缓存的最长语境（字）
+MEMO_CONTEXT_LENGTH = 200
+
+_warm_up_started = False
+_warm_up_lock = threading.Lock()
+
+
+def _warm_up() -> None:
+    try:
+        import jieba
+        from pypinyin import lazy_pinyin, pinyin
+
+        jieba.initialize()
+        lazy_pinyin('预热')
+        pinyin('行', heteronym=True)
+    except Exception as e:
+        logger.warning(f"拼音服务预热失败: {e}")
+
+
+def warm_up(background: bool = True) -> None:
+    """
+    预加载 jieba 词典和 pypinyin 数据（每个进程只执行一次）
+
+    Args:
+        background: 是否在后台线程中执行
+    """
+    global _warm_up_started
+
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+
+    if background:
+        threading.Thread(target=_warm_up, name='pinyin-warm-up', daemon=True).start()
+    else:
+        _warm_up()
+
+
+@lru_cache(maxsize=8192)
+def readings(char: str) -> Tuple[str, ...]:
+    """
+    汉字的所有读音（带声调）
+
+    Returns:
+        读音元组，第一个为默认读音；不是汉字时返回空元组
+    """
+    from pypinyin import Style, pinyin
+
+    if not _HAN.fullmatch(char):
+        return ()
+    return tuple(pinyin(char, style=Style.TONE, heteronym=True)[0])
+
+
+def _word_pinyin(word: str) -> List[str]:
+    """词组中每个字的读音（非汉字位置为 None）"""
+    from pypinyin import Style, lazy_pinyin
+
+    pinyins = lazy_pinyin(word, style=Style.TONE)
+    if len(pinyins) == len(word):
+        return pinyins
+    # 含非汉字时 lazy_pinyin 会合并连续的非汉字，无法按位置对应，改为逐字
+    return [lazy_pinyin(char, style=Style.TONE)[0] if _HAN.fullmatch(char) else None for char in word]
+
+
+@lru_cache(maxsize=settings.PINYIN_CACHE_SIZE)
+def _infer(char: str, context: str) -> Dict:
+    import jieba
+    from pypinyin import Style, lazy_pinyin
+
+    alternatives = lazy_pinyin(char, style=Style.TONE)
+
+    if not context:
+        # 无语境，返回所有候选
+        return {
+            'char': char,
+            'pinyin': None,
+            'confidence': 0,
+            'alternatives': alternatives
+        }
+
+    # 查找包含该字的词，使用词组读音
+    for word in jieba.lcut(context):
+        if char in word:
+            return {
+                'char': char,
+                'pinyin': _word_pinyin(word)[word.index(char)],
+                'confidence': 0.9,  # 高置信度
+                'word': word,
+                'alternatives': alternatives
+            }
+
+    # 降级：使用字符级推断
+    return {
+        'char': char,
+        'pinyin': alternatives[0],
+        'confidence': 0.6,  # 中等置信度
+        'alternatives': alternatives
+    }
+
+
+def infer(char: str, context: str = '') -> Dict:
+    """
+    基于语境推断汉字读音
+
+    Args:
+        char: 汉字
+        context: 语境（包含该字的句子），可为空
+
+    Returns:
+        {'char', 'pinyin', 'confidence', 'alternatives'}，在语境中找到时还有 'word'
+    """
+    if len(context) > MEMO_CONTEXT_LENGTH:
+        return _infer.__wrapped__(char, context)
+    result = _infer(char, context)
+    # 缓存中的结果是共享的，返回副本
+    return {**result, 'alternatives': list(result['alternatives'])}
+
+
+def infer_text(text: str) -> List[Dict]:
+    """
+    推断句子中每个多音字的读音（整句只分词一次）
+
+    Args:
+        text: 句子
+
+    Returns:
+        [{'index': 在句中的位置, 'char', 'pinyin', 'confidence', 'word', 'alternatives': 全部读音}]
+    """
+    import jieba
+
+    results = []
+    index = 0
+    for word in jieba.lcut(text):
+        word_pinyin = None
+        for offset, char in enumerate(word):
+            alternatives = readings(char)
+            if len(alternatives) > 1:
+                if word_pinyin is None:
+                    word_pinyin = _word_pinyin(word)
+                results.append({
+                    'index': index + offset,
+                    'char': char,
+                    'pinyin': word_pinyin[offset],
+                    # 单字成词时语境无法区分读音
+                    'confidence': 0.9 if len(word) > 1 else 0.6,
+                    'word': word,
+                    'alternatives': list(alternatives)
+                })
+        index += len(word)
+    return results
@@ -0,0 +1,266 @@
+"""
+物化复习队列服务
+
+为每个用户持久化一份 "接下来要复习的卡片" 列表，复习、撤销、卡片增删和导入时
+增量维护，读取时直接返回现成的列表，不再每次对 Card 表重新排序。
+
+队列在以下情况下会在读取时惰性重建（自愈）:
+- 队列被标记为过期（is_stale）
+- 有卡片到期（到达 valid_until）
+- 请求的队列上限与构建时不同
+- 读取时发现条目与卡片实际状态不一致（漂移）
+- 被截断的层级（候选卡片多于配额）有条目移出，需要用后面的候选补位
+"""
+import logging
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from ..models import Card, Deck, ReviewQueue
+from .sm2 import (
+    DEFAULT_DAILY_NEW_LIMIT,
+    QUEUE_TIER_DUE,
+    QUEUE_TIER_LEECH,
+    QUEUE_TIER_NEW,
+    build_queue_result,
+    select_queue_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_queue_tier(card, now=None) -> Optional[int]:
+    """
+    计算卡片当前所属的队列层级（与 select_queue_rows 的 CASE 表达式一致）
+
+    Args:
+        card: Card 对象
+        now: 当前时间
+
+    Returns:
+        QUEUE_TIER_* 之一，不在队列中时返回 None
+    """
+    now = now or timezone.now()
+    if card.state in ('learning', 'review') and card.due_at <= now:
+        return QUEUE_TIER_DUE
+    if card.lapses >= 3:
+        return QUEUE_TIER_LEECH
+    if card.state == 'new':
+        return QUEUE_TIER_NEW
+    return None
+
+
+def rebuild_review_queue(user, limit: int = 50) -> ReviewQueue:
+    """
+    重新构建用户的物化复习队列
+
+    Args:
+        user: User 对象
+        limit: 队列大小限制
+
+    Returns:
+        ReviewQueue 对象（cards 属性中带有已加载的卡片列表）
+    """
+    now = timezone.now()
+    rows, total_new = select_queue_rows(user, limit)
+
+    # 下一张尚未到期的学习/复习卡片的到期时间
+    valid_until = Card.objects.filter(
+        user=user,
+        state__in=['learning', 'review'],
+        due_at__gt=now,
+    ).aggregate(next_due=Min('due_at'))['next_due']
+
+    new_quota = next(
+        (card.tier_quota for card in rows if card.queue_tier == QUEUE_TIER_NEW),
+        None,
+    )
+    if new_quota is None:
+        deck = Deck.objects.filter(user=user).only('daily_new_limit').first()
+        new_quota = deck.daily_new_limit if deck else DEFAULT_DAILY_NEW_LIMIT
+
+    queue, _ = ReviewQueue.objects.update_or_create(
+        user=user,
+        defaults={
+            'entries': [[card.id, card.queue_tier] for card in rows],
+            'total_new': total_new,
+            'session_limit': limit,
+            'new_quota': new_quota,
+            'truncated_tiers': sorted({card.queue_tier for card in rows if card.tier_total > card.tier_quota}),
+            'valid_until': valid_until,
+            'is_stale': False,
+            'built_at': now,
+        },
+    )
+    queue.cards = rows
+    return queue
+
+
+def _load_queue_cards(queue: ReviewQueue, now) -> Optional[list]:
+    """
+    按条目顺序加载卡片，发现漂移时返回 None
+
+    Args:
+        queue: ReviewQueue 对象
+        now: 当前时间
+
+    Returns:
+        Card 列表（带 queue_tier 属性），或 None 表示需要重建
+    """
+    card_ids = [card_id for card_id, _ in queue.entries]
+    cards = Card.objects.filter(id__in=card_ids, user_id=queue.user_id).select_related('deck', 'user')
+    card_dict = {card.id: card for card in cards}
+
+    if len(card_dict) != len(card_ids):
+        return None
+
+    ordered = []
+    for card_id, tier in queue.entries:
+        card = card_dict[card_id]
+        if get_queue_tier(card, now) != tier:
+            return None
+        card.queue_tier = tier
+        ordered.append(card)
+    return ordered
+
+
+def load_review_queue(user, limit: int = 50) -> Dict:
+    """
+    读取物化复习队列，必要时惰性重建
+
+    Args:
+        user: User 对象
+        limit: 队列大小限制
+
+    Returns:
+        与 generate_review_queue 相同结构的字典
+    """
+    now = timezone.now()
+    queue = ReviewQueue.objects.filter(user=user).first()
+
+    cards = None
+    if (
+        queue is not None
+        and not queue.is_stale
+        and queue.session_limit == limit
+        and (queue.valid_until is None or queue.valid_until > now)
+    ):
+        cards = _load_queue_cards(queue, now)
+        if cards is None:
+            logger.info(f"用户 {user.pk} 的复习队列与卡片状态不一致，重建队列")
+
+    if cards is None:
+        queue = rebuild_review_queue(user, limit)
+        cards = queue.cards
+
+    return build_queue_result(cards, queue.total_new, limit)
+
+
+def _locked_queue(user_id) -> Optional[ReviewQueue]:
+    """获取加锁的队列行（需在事务中调用）"""
+    return ReviewQueue.objects.select_for_update().filter(user_id=user_id).first()
+
+
+def _push_valid_until(queue: ReviewQueue, card, now) -> None:
+    """卡片将在未来到期时，把队列有效期收紧到该时间"""
+    if card.state in ('learning', 'review') and card.due_at > now:
+        if queue.valid_until is None or card.due_at < queue.valid_until:
+            queue.valid_until = card.due_at
+
+
+def on_card_reviewed(card, before_state: str) -> None:
+    """
+    复习后增量更新队列
+
+    Args:
+        card: 已保存的 Card 对象
+        before_state: 复习前的卡片状态
+    """
+    on_cards_reviewed(card.user_id, [(card, before_state)])
+
+
+def on_cards_reviewed(user_id, reviewed) -> None:
+    """
+    一批复习后增量更新队列（只加锁、写回一次）
+
+    已复习的卡片若不再属于队列则移出；仍属于原层级则保持原位；
+    层级发生变化，或从被截断的层级移出（后面还有候选卡片需要补位）时
+    标记队列过期，由下一次读取重建。
+
+    Args:
+        user_id: 用户ID
+        reviewed: [(已保存的 Card 对象, 复习前的卡片状态), ...]，按复习顺序排列
+    """
+    if not reviewed:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        queue = _locked_queue(user_id)
+        if queue is None or queue.is_stale:
+            return
+
+        for card, before_state in reviewed:
+            tier = get_queue_tier(card, now)
+            current = next((t for card_id, t in queue.entries if card_id == card.id), None)
+
+            if tier is None:
+                queue.entries = [entry for entry in queue.entries if entry[0] != card.id]
+                if current in queue.truncated_tiers:
+                    queue.is_stale = True
+            elif tier != current:
+                queue.is_stale = True
+
+            if before_state == 'new' and card.state != 'new':
+                queue.total_new = max(0, queue.total_new - 1)
+
+            _push_valid_until(queue, card, now)
+
+        queue.save(update_fields=['entries', 'total_new', 'valid_until', 'is_stale', 'updated_at'])
+
+
+def on_card_created(card) -> None:
+    """
+    新建卡片后增量更新队列
+
+    新卡在新卡层级未满时追加到队尾（新卡按创建时间排序，新建的总是最后一张）。
+
+    Args:
+        card: 新建的 Card 对象
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queue = _locked_queue(card.user_id)
+        if queue is None or queue.is_stale:
+            return
+
+        tier = get_queue_tier(card, now)
+        if tier == QUEUE_TIER_NEW:
+            queue.total_new += 1
+            new_count = sum(1 for _, t in queue.entries if t == QUEUE_TIER_NEW)
+            if new_count < queue.new_quota:
+                queue.entries.append([card.id, QUEUE_TIER_NEW])
+            elif QUEUE_TIER_NEW not in queue.truncated_tiers:
+                queue.truncated_tiers.append(QUEUE_TIER_NEW)
+        elif tier is not None:
+            # 直接以到期/难项状态创建的卡片需要插入到中间位置
+            queue.is_stale = True
+
+        _push_valid_until(queue, card, now)
+        queue.save(update_fields=[
+            'entries', 'total_new', 'truncated_tiers', 'valid_until', 'is_stale', 'updated_at',
+        ])
+
+
+def invalidate_review_queue(user_id) -> None:
+    """
+    标记用户的复习队列过期，下一次读取时重建
+
+    用于撤销复习、编辑或删除卡片、修改卡组新卡上限和批量导入等不便逐条维护的场景。
+
+    Args:
+        user_id: 用户ID
+    """
+    ReviewQueue.objects.filter(user_id=user_id, is_stale=False).update(is_stale=True)
@@ -0,0 +1,168 @@
+"""
+复习调度器
+
+每个卡组可以选择自己的调度算法（Deck.scheduler），复习时由 get_scheduler
+根据卡组配置返回对应的调度器。调度器只负责更新卡片的调度字段
+（state、due_at、interval、ef、difficulty、stability、lapses、learning_step），
+复习记录和持久化由 sm2.apply_review / process_review 统一处理。
+"""
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import fsrs
+from .sm2 import LEARNING_STEPS, schedule_review
+
+
+class Scheduler:
+    """调度器基类"""
+
+    name = ''
+
+    def __init__(self, params: Optional[Dict] = None):
+        self.params = params or {}
+
+    def review(self, card, quality: int, now) -> None:
+        """
+        根据评分更新卡片的调度字段（不写数据库）
+
+        Args:
+            card: Card 对象
+            quality: 评分 (0=Again, 2=Hard, 4=Good, 5=Easy)
+            now: 复习时间
+        """
+        raise NotImplementedError
+
+
+class SM2Scheduler(Scheduler):
+    """SM-2 调度器"""
+
+    name = 'sm2'
+
+    def review(self, card, quality: int, now) -> None:
+        schedule_review(card, quality, now)
+
+
+class FSRSScheduler(Scheduler):
+    """
+    FSRS 调度器
+
+    使用卡片的 difficulty / stability 字段保存记忆状态。Again 会让卡片进入
+    学习阶段（10 分钟后重学），学习阶段内的短期复习不改变记忆状态。
+    """
+
+    name = 'fsrs'
+
+    @property
+    def weights(self):
+        return self.params.get('weights') or fsrs.DEFAULT_WEIGHTS
+
+    @property
+    def desired_retention(self) -> float:
+        return self.params.get('desired_retention') or fsrs.DEFAULT_DESIRED_RETENTION
+
+    def _relearn(self, card, now) -> None:
+        card.state = 'learning'
+        card.learning_step = 0
+        card.due_at = now + timedelta(minutes=LEARNING_STEPS[0])
+
+    def _graduate(self, card, now) -> None:
+        card.state = 'review'
+        card.interval = int(fsrs.next_interval(card.stability, self.desired_retention))
+        card.due_at = now + timedelta(days=card.interval)
+
+    def review(self, card, quality: int, now) -> None:
+        w = self.weights
+        rating = fsrs.QUALITY_TO_RATING.get(quality, 3)
+
+        if card.state == 'new' or card.stability <= 0:
+            card.stability = float(fsrs.init_stability(w, rating))
+            card.difficulty = float(fsrs.init_difficulty(w, rating))
+            card.interval = 0
+            if rating == 1:
+                self._relearn(card, now)
+            else:
+                self._graduate(card, now)
+
+        elif card.state == 'learning':
+            if rating == 1:
+                self._relearn(card, now)
+            else:
+                self._graduate(card, now)
+
+        else:
+            # 上次复习时间 = 到期时间 - 间隔
+            last_review = card.due_at - timedelta(days=card.interval)
+            elapsed = max(0.0, (now - last_review).total_seconds() / 86400)
+            r = float(fsrs.retrievability(elapsed, card.stability))
+
+            if rating == 1:
+                card.stability = float(fsrs.forget_stability(w, card.difficulty, card.stability, r))
+                card.lapses += 1
+                self._relearn(card, now)
+            else:
+                card.stability = float(fsrs.recall_stability(w, card.difficulty, card.stability, r, rating))
+                self._graduate(card, now)
+            card.difficulty = float(fsrs.next_difficulty(w, card.difficulty, rating))
+
+
+SCHEDULERS = {
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler,
+}
+
+
+def get_scheduler(deck) -> Scheduler:
+    """
+    获取卡组配置的调度器
+
+    Args:
+        deck: Deck 对象（为 None 时使用 SM-2）
+
+    Returns:
+        Scheduler 实例
+    """
+    if deck is None:
+        return SM2Scheduler()
+    scheduler_class = SCHEDULERS.get(deck.scheduler, SM2Scheduler)
+    return scheduler_class(deck.scheduler_params)
+
+
+def optimize_deck_scheduler(deck) -> Dict:
+    """
+    根据卡组的复习记录拟合 FSRS 参数并保存到卡组
+
+    拟合耗时不超过 FSRS_OPTIMIZE_TIME_LIMIT 秒（在请求线程内执行）。
+
+    Args:
+        deck: Deck 对象
+
+    Returns:
+        fsrs.optimize_weights 的结果
+    """
+    from ..models import ReviewLog
+
+    rows = (
+        ReviewLog.objects.filter(card__deck=deck)
+        .order_by('card_id', 'reviewed_at')
+        .values_list('card_id', 'reviewed_at', 'quality')
+        .iterator(chunk_size=5000)
+    )
+    result = fsrs.optimize_weights(
+        rows,
+        initial_weights=deck.scheduler_params.get('weights'),
+        time_limit=settings.FSRS_OPTIMIZE_TIME_LIMIT,
+    )
+
+    if result['optimized']:
+        deck.scheduler_params = {
+            **deck.scheduler_params,
+            'weights': result['weights'],
+            'optimized_at': timezone.now().isoformat(),
+            'log_loss': result['log_loss_after'],
+        }
+        deck.save(update_fields=['scheduler_params', 'updated_at'])
+
+    return result
@@ -82,6 +82,18 @@ def get_next_learning_step(card, quality: int) -> Tuple[timedelta, str]:
     return timedelta(minutes=LEARNING_STEPS[card.learning_step]), 'learning'
 
 
+# 复习队列各层级: 0=到期, 1=难项, 2=新卡
+QUEUE_TIER_DUE = 0
+QUEUE_TIER_LEECH = 1
+QUEUE_TIER_NEW = 2
+
+# 难项层级的最大卡片数
+LEECH_QUEUE_LIMIT = 10
+
+# 未配置卡组时的默认每日新卡上限
+DEFAULT_DAILY_NEW_LIMIT = 20
+
+
 def generate_review_queue(user, limit: int = 50):
     """生成复习队列
 
@@ -105,63 +117,114 @@ def generate_review_queue(user, limit: int = 50):
             }
         }
     """
+    rows, total_new_cards = select_queue_rows(user, limit)
+    return build_queue_result(rows, total_new_cards, limit)
+
+
+def select_queue_rows(user, limit: int = 50):
+    """
+    选取复习队列的候选卡片（未截断）
+
+    三个层级在一次查询中完成选取: 先用 CASE 给每张候选卡片标注层级,
+    再用 ROW_NUMBER() 窗口函数按层级分区排序, 最后只保留各层级配额内的行。
+    新卡总数同样通过窗口函数随结果一并返回, 仅当队列为空时才额外统计一次。
+    每行的 tier_total 为该层级的候选总数（大于 tier_quota 表示该层级被截断）。
+
+    Args:
+        user: User 对象
+        limit: 到期层级的配额
+
+    Returns:
+        (按优先级排序的 Card 列表（带 queue_tier 属性）, 总新卡数)
+    """
+    from django.db.models import Case, Count, F, IntegerField, Q, Subquery, Sum, Value, When, Window
+    from django.db.models.functions import Coalesce, RowNumber
     from cards.models import Card, Deck
 
     now = timezone.now()
 
-    # 1. 到期的复习卡片（按到期时间和错误次数排序）
-    due_cards = Card.objects.filter(
-        user=user,
-        state__in=['learning', 'review'],
-        due_at__lte=now,
-    ).order_by('due_at', '-lapses')[:limit]
-
-    due_card_ids = list(due_cards.values_list('id', flat=True))
-    due_count = len(due_card_ids)
+    due_q = Q(state__in=['learning', 'review'], due_at__lte=now)
+    leech_q = Q(lapses__gte=3)
+    new_q = Q(state='new')
 
-    # 2. 难项优先（lapses >= 3）
-    leech_cards = Card.objects.filter(
-        user=user,
-        lapses__gte=3,
-    ).exclude(id__in=due_card_ids).order_by('-lapses')[:10]
-
-    leech_card_ids = list(leech_cards.values_list('id', flat=True))
-    leech_count = len(leech_card_ids)
-
-    # 3. 新卡（根据配置的每日新卡限制）
-    try:
-        default_deck = Deck.objects.filter(user=user).first()
-        daily_new_limit = default_deck.daily_new_limit if default_deck else 20
-    except Exception:
-        daily_new_limit = 20
-
-    # 统计总新卡数
-    total_new_cards = Card.objects.filter(user=user, state='new').count()
-
-    new_cards = (
-        Card.objects.filter(user=user, state='new')
-        .exclude(id__in=due_card_ids + leech_card_ids)
-        .order_by('created_at')[:daily_new_limit]
+    tier = Case(
+        When(due_q, then=Value(QUEUE_TIER_DUE)),
+        When(leech_q, then=Value(QUEUE_TIER_LEECH)),
+        default=Value(QUEUE_TIER_NEW),
+        output_field=IntegerField(),
     )
 
-    new_count = new_cards.count()
+    # 新卡配额取用户最新卡组的每日新卡上限（与 Deck 默认排序一致）
+    daily_new_limit = Coalesce(
+        Subquery(
+            Deck.objects.filter(user=user)
+            .order_by('-created_at')
+            .values('daily_new_limit')[:1]
+        ),
+        Value(DEFAULT_DAILY_NEW_LIMIT),
+    )
 
-    # 合并所有卡片（保持优先级顺序）
-    all_card_ids = (
-        list(due_cards.values_list('id', flat=True))
-        + list(leech_cards.values_list('id', flat=True))
-        + list(new_cards.values_list('id', flat=True))
+    rows = list(
+        Card.objects.filter(due_q | leech_q | new_q, user=user)
+        .annotate(queue_tier=tier)
+        .annotate(
+            # 各层级内部排序: 到期按 (due_at, -lapses), 难项按 -lapses, 新卡按 created_at
+            tier_rank=Window(
+                expression=RowNumber(),
+                partition_by=[F('queue_tier')],
+                order_by=[
+                    Case(When(queue_tier=QUEUE_TIER_DUE, then=F('due_at'))).asc(),
+                    Case(When(queue_tier__lte=QUEUE_TIER_LEECH, then=F('lapses'))).desc(),
+                    F('created_at').asc(),
+                    F('id').asc(),
+                ],
+            ),
+            tier_quota=Case(
+                When(queue_tier=QUEUE_TIER_DUE, then=Value(limit)),
+                When(queue_tier=QUEUE_TIER_LEECH, then=Value(LEECH_QUEUE_LIMIT)),
+                default=daily_new_limit,
+                output_field=IntegerField(),
+            ),
+            tier_total=Window(
+                expression=Count('id'),
+                partition_by=[F('queue_tier')],
+            ),
+            total_new=Window(
+                expression=Sum(Case(When(new_q, then=Value(1)), default=Value(0))),
+            ),
+        )
+        .filter(tier_rank__lte=F('tier_quota'))
+        .select_related('deck', 'user')
+        .order_by('queue_tier', 'tier_rank')
     )
 
-    # 使用 in_bulk 保持顺序
-    cards = Card.objects.filter(id__in=all_card_ids).select_related('deck', 'user')
+    if rows:
+        total_new_cards = rows[0].total_new or 0
+    else:
+        # 队列为空时窗口统计没有载体, 单独统计新卡总数
+        total_new_cards = Card.objects.filter(user=user, state='new').count()
+
+    return rows, total_new_cards
+
+
+def build_queue_result(rows, total_new_cards: int, limit: int):
+    """
+    根据已排序的候选卡片组装复习队列结果
+
+    Args:
+        rows: 按优先级排序的 Card 列表（带 queue_tier 属性）
+        total_new_cards: 总新卡数
+        limit: 队列大小限制
 
-    # 按原始顺序排序
-    card_dict = {card.id: card for card in cards}
-    ordered_cards = [card_dict[card_id] for card_id in all_card_ids if card_id in card_dict]
+    Returns:
+        与 generate_review_queue 相同结构的字典
+    """
+    due_count = sum(1 for card in rows if card.queue_tier == QUEUE_TIER_DUE)
+    leech_count = sum(1 for card in rows if card.queue_tier == QUEUE_TIER_LEECH)
+    new_count = len(rows) - due_count - leech_count
 
     # 最终返回的卡片列表（再次受 limit 约束）
-    final_cards = ordered_cards[:limit]
+    final_cards = rows[:limit]
 
     # 生成提示信息
     message = ''
@@ -226,12 +289,13 @@ def get_lowest_mastery_cards(user, limit: int = 10):
     return list(cards)
 
 
-def mark_leech(card) -> bool:
+def mark_leech(card, save: bool = True) -> bool:
     """
     标记难项卡片
 
     Args:
         card: Card 对象
+        save: 是否立即保存标签（批量处理时由调用方统一保存）
 
     Returns:
         是否为难项
@@ -239,38 +303,35 @@ def mark_leech(card) -> bool:
     if card.lapses >= 3:
         if 'leech' not in card.tags:
             card.tags.append('leech')
-            card.save(update_fields=['tags'])
+            if save:
+                card.save(update_fields=['tags'])
         return True
     return False
 
 
-def process_review(card, quality: int, time_taken: int):
+# 复习后需要写回数据库的卡片字段
+REVIEW_UPDATE_FIELDS = [
+    'state', 'ef', 'interval', 'difficulty', 'stability', 'lapses',
+    'due_at', 'learning_step', 'tags', 'updated_at',
+]
+
+
+def schedule_review(card, quality: int, now) -> None:
     """
-    处理复习评分，更新卡片状态
+    按 SM-2 规则更新卡片的调度字段（不写数据库）
 
     Args:
         card: Card 对象
         quality: 评分 (0=Again, 2=Hard, 4=Good, 5=Easy)
-        time_taken: 耗时（毫秒）
-
-    Returns:
-        ReviewLog 对象
+        now: 复习时间
     """
-    from cards.models import ReviewLog
-
-    # 保存复习前的状态（用于撤销）
-    before_state = card.state
-    before_ef = card.ef
-    before_interval = card.interval
-    before_due_at = card.due_at
-
     # 根据当前状态处理
     if card.state == 'new':
         # 新卡进入学习阶段
         card.state = 'learning'
         card.learning_step = 0
         delta, new_state = get_next_learning_step(card, quality)
-        card.due_at = timezone.now() + delta
+        card.due_at = now + delta
         card.state = new_state
 
         if new_state == 'review':
@@ -279,7 +340,7 @@ def process_review(card, quality: int, time_taken: int):
     elif card.state == 'learning':
         # 学习阶段
         delta, new_state = get_next_learning_step(card, quality)
-        card.due_at = timezone.now() + delta
+        card.due_at = now + delta
         card.state = new_state
 
         if new_state == 'review':
@@ -294,38 +355,150 @@ def process_review(card, quality: int, time_taken: int):
             card.learning_step = 0
             card.lapses += 1
             delta = timedelta(minutes=LEARNING_STEPS[0])
-            card.due_at = timezone.now() + delta
+            card.due_at = now + delta
         else:
             # Good/Easy: 继续复习
             card.ef = calculate_ef(card.ef, quality)
             card.interval = calculate_interval(card.interval, card.ef, quality)
-            card.due_at = timezone.now() + timedelta(days=card.interval)
+            card.due_at = now + timedelta(days=card.interval)
 
-    # 标记难项
-    mark_leech(card)
 
-    # 保存卡片
-    card.save()
+def apply_review(card, quality: int, time_taken: int, reviewed_at=None):
+    """
+    计算复习结果并更新卡片字段（不写数据库）
+
+    调度规则由卡片所属卡组配置的调度器决定（见 services.schedulers）。
 
-    # 创建复习记录
-    review_log = ReviewLog.objects.create(
+    Args:
+        card: Card 对象
+        quality: 评分 (0=Again, 2=Hard, 4=Good, 5=Easy)
+        time_taken: 耗时（毫秒）
+        reviewed_at: 复习时间（离线复习时由客户端提供），默认为当前时间
+
+    Returns:
+        未保存的 ReviewLog 对象
+    """
+    from cards.models import ReviewLog
+    from cards.services.schedulers import get_scheduler
+
+    now = reviewed_at or timezone.now()
+
+    # 保存复习前的状态（用于撤销）
+    before_state = card.state
+    before_ef = card.ef
+    before_interval = card.interval
+    before_due_at = card.due_at
+    before_difficulty = card.difficulty
+    before_stability = card.stability
+
+    get_scheduler(card.deck).review(card, quality, now)
+
+    # 标记难项
+    mark_leech(card, save=False)
+
+    return ReviewLog(
         card=card,
-        user=card.user,
+        user_id=card.user_id,
         quality=quality,
         time_taken=time_taken,
         before_state=before_state,
         before_ef=before_ef,
         before_interval=before_interval,
         before_due_at=before_due_at,
+        before_difficulty=before_difficulty,
+        before_stability=before_stability,
         after_state=card.state,
         after_ef=card.ef,
         after_interval=card.interval,
-        after_due_at=card.due_at
+        after_due_at=card.due_at,
+        reviewed_at=now,
     )
 
+
+def process_review(card, quality: int, time_taken: int):
+    """
+    处理复习评分，更新卡片状态
+
+    Args:
+        card: Card 对象
+        quality: 评分 (0=Again, 2=Hard, 4=Good, 5=Easy)
+        time_taken: 耗时（毫秒）
+
+    Returns:
+        ReviewLog 对象
+    """
+    review_log = apply_review(card, quality, time_taken)
+
+    # 保存卡片和复习记录
+    card.save(update_fields=REVIEW_UPDATE_FIELDS)
+    review_log.save()
+
+    # 累加每日统计
+    from cards.services.daily_stats import record_reviews
+    record_reviews(card.user_id, [review_log])
+
+    # 增量更新物化复习队列
+    from cards.services.review_queue import on_card_reviewed
+    on_card_reviewed(card, review_log.before_state)
+
     return review_log
 
 
+def process_review_batch(user, items):
+    """
+    批量处理复习评分（离线客户端重连后一次性提交）
+
+    按给定顺序依次应用评分，同一张卡片可以出现多次。所有卡片在一次查询中加载，
+    结果通过 bulk_update / bulk_create 在同一个事务中写回。
+
+    Args:
+        user: User 对象
+        items: [{'card_id', 'quality', 'time_taken', 'reviewed_at'}, ...]
+
+    Returns:
+        与 items 一一对应的结果列表: 成功时为 (Card, ReviewLog)，卡片不存在时为 None
+    """
+    from django.db import transaction
+    from cards.models import Card, ReviewLog
+    from cards.services.daily_stats import record_reviews
+    from cards.services.review_queue import on_cards_reviewed
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        cards = Card.objects.select_for_update().select_related('deck').in_bulk(
+            {item['card_id'] for item in items}
+        )
+        cards = {pk: card for pk, card in cards.items() if card.user_id == user.id}
+
+        results = []
+        review_logs = []
+        reviewed = []
+        for item in items:
+            card = cards.get(item['card_id'])
+            if card is None:
+                results.append(None)
+                continue
+
+            # 客户端时间不可晚于服务器时间
+            reviewed_at = min(item.get('reviewed_at') or now, now)
+            review_log = apply_review(card, item['quality'], item.get('time_taken', 0), reviewed_at)
+            review_logs.append(review_log)
+            reviewed.append((card, review_log.before_state))
+            results.append((card, review_log))
+
+        touched = {card.id: card for card, _ in reviewed}.values()
+        for card in touched:
+            card.updated_at = now
+        Card.objects.bulk_update(touched, REVIEW_UPDATE_FIELDS)
+        ReviewLog.objects.bulk_create(review_logs)
+        record_reviews(user.id, review_logs)
+
+        on_cards_reviewed(user.id, reviewed)
+
+    return results
+
+
 def undo_review(review_log):
     """
     撤销上一次复习
@@ -340,13 +513,21 @@ def undo_review(review_log):
     card.ef = review_log.before_ef
     card.interval = review_log.before_interval
     card.due_at = review_log.before_due_at
+    card.difficulty = review_log.before_difficulty
+    card.stability = review_log.before_stability
 
-    # 如果是从复习阶段失败(quality < 3)撤销，需要减少 lapses
-    # 因为在 process_review 中,复习阶段 quality < 3 会增加 lapses
-    if review_log.before_state == 'review' and review_log.quality < 3 and card.lapses > 0:
+    # 如果是从复习阶段失败(回到学习阶段)撤销，需要减少 lapses
+    # 因为在 process_review 中,复习阶段失败会增加 lapses（SM-2 为 quality < 3，FSRS 仅 Again）
+    if review_log.before_state == 'review' and review_log.after_state == 'learning' and card.lapses > 0:
         card.lapses -= 1
 
     card.save()
 
-    # 删除复习记录
+    # 从每日统计中扣减，并删除复习记录
+    from cards.services.daily_stats import revert_review
+    revert_review(review_log)
     review_log.delete()
+
+    # 撤销后卡片可能重新到期，队列交由下一次读取时重建
+    from cards.services.review_queue import invalidate_review_queue
+    invalidate_review_queue(card.user_id)
@@ -44,7 +44,11 @@ def generate_chinese_svg(word: str, metadata: Dict) -> Tuple[str, str]:
     - metadata.examples: 高频词组/例句(数组)
     - metadata.memory_tips: 联想记忆法
     - metadata.confusion: 近形字辨析
+
+    拼音缺失时从本地汉字字典补全。
     """
+    metadata = _fill_from_local_dict(word, metadata)
+
     # 提取和格式化数据
     pinyin = format_pinyin(metadata.get('pinyin', []))
     tone = extract_tone(pinyin)
@@ -249,6 +253,22 @@ def generate_english_svg(word: str, metadata: Dict) -> Tuple[str, str]:
 
 # ==================== 辅助函数 ====================
 
+def _fill_from_local_dict(word: str, metadata: Dict) -> Dict:
+    """拼音缺失时用本地汉字字典补全（不覆盖已有的值）"""
+    if metadata.get('pinyin') or len(word) != 1:
+        return metadata
+
+    from .hanzi import hanzi_repository
+
+    try:
+        entry = hanzi_repository.get(word)
+    except Exception:
+        return metadata
+    if entry is None or not entry.pinyin:
+        return metadata
+    return {**metadata, 'pinyin': list(entry.pinyin)}
+
+
 def format_pinyin(pinyin) -> str:
     """格式化拼音显示"""
     if isinstance(pinyin, list):
@@ -1,11 +1,12 @@
 """
 Django信号处理器
-用于在用户注册时自动创建默认卡组
+用于在用户注册时自动创建默认卡组，在新建卡片时维护物化复习队列，
+在删除卡片时移交语义指纹，以及在新建、删除卡片时使分析缓存失效
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Deck
+from .models import Deck, Card, hand_over_semantic_hash
 
 
 @receiver(post_save, sender=User)
@@ -28,3 +29,39 @@ def create_default_deck(sender, instance, created, **kwargs):
             daily_new_limit=20,
             daily_review_limit=200
         )
+
+
+@receiver(post_save, sender=Card)
+def update_review_queue_on_create(sender, instance, created, **kwargs):
+    """
+    新建卡片时增量更新用户的物化复习队列
+
+    注意: bulk_create 不会触发该信号，批量导入需自行使队列过期
+    """
+    if created:
+        from .services.review_queue import on_card_created
+        on_card_created(instance)
+
+
+@receiver(post_delete, sender=Card)
+def hand_over_semantic_hash_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    删除持有语义指纹的卡片后，把指纹交给最早的重复卡片，使导入查重仍能找到它
+
+    删除整个用户时其卡片全部删除，无需移交
+    """
+    if instance.semantic_hash and not isinstance(origin, User):
+        hand_over_semantic_hash(instance.user_id, instance.semantic_hash, instance.word)
+
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+def invalidate_analytics_on_card_change(sender, instance, created=True, **kwargs):
+    """
+    新建或删除卡片后使用户的分析缓存失效（遗忘次数分布按卡片统计）
+
+    复习引起的变化由 daily_stats 负责失效；post_delete 没有 created 参数
+    """
+    if created:
+        from .services.analytics import invalidate_analytics
+        invalidate_analytics(instance.user_id)
@@ -0,0 +1,155 @@
+"""
+复习分析测试
+"""
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from cards.models import Deck, Card, ReviewLog
+from cards.services.sm2 import process_review
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def deck(user):
+    """创建测试卡组"""
+    return Deck.objects.create(user=user, name='Test Deck')
+
+
+def make_log(card, quality, before_interval, time_taken=1000):
+    now = timezone.now()
+    return ReviewLog(
+        card=card, user=card.user, quality=quality, time_taken=time_taken,
+        before_state='review', before_ef=2.5, before_interval=before_interval, before_due_at=now,
+        after_state='review', after_ef=2.5, after_interval=before_interval, after_due_at=now,
+    )
+
+
+def test_heatmap_cached_until_next_review(user, deck, client, django_assert_num_queries):
+    card = Card.objects.create(user=user, deck=deck, word='w', card_type='en')
+    process_review(card, quality=4, time_taken=2000)
+
+    response = client.get('/api/analytics/heatmap/')
+    assert response.status_code == 200
+    assert response.data['days'] == [{'date': timezone.localdate().isoformat(), 'reviews': 1, 'time_spent': 2000}]
+
+    # 第二次读取命中缓存，不再查询数据库
+    with django_assert_num_queries(0):
+        client.get('/api/analytics/heatmap/')
+
+    card.refresh_from_db()
+    process_review(card, quality=5, time_taken=1000)
+    assert client.get('/api/analytics/heatmap/').data['total_reviews'] == 2
+
+    assert client.get('/api/analytics/heatmap/', {'days': 0}).status_code == 400
+
+
+def test_retention_by_interval_bucket(user, deck, client):
+    card = Card.objects.create(user=user, deck=deck, word='w', card_type='en')
+    ReviewLog.objects.bulk_create([
+        make_log(card, 4, 1),
+        make_log(card, 0, 1),
+        make_log(card, 5, 10),
+        make_log(card, 4, 400),
+    ])
+
+    buckets = {b['bucket']: b for b in client.get('/api/analytics/retention/').data['buckets']}
+    assert (buckets['1d']['reviews'], buckets['1d']['retention']) == (2, 0.5)
+    assert buckets['8-14d']['retention'] == 1.0
+    assert buckets['6m+']['reviews'] == 1
+    assert buckets['2-3d']['retention'] is None
+
+
+def test_time_and_lapses(user, deck, client):
+    cards = [
+        Card.objects.create(user=user, deck=deck, word=f'w{i}', card_type='en', lapses=lapses)
+        for i, lapses in enumerate([0, 0, 2, 15])
+    ]
+    ReviewLog.objects.bulk_create([
+        make_log(cards[0], 4, 1, time_taken=1000),
+        make_log(cards[0], 0, 1, time_taken=3000),
+    ])
+
+    data = client.get('/api/analytics/time/').data
+    assert data['average_time'] == 2000
+    assert data['by_quality'] == {'0': 3000, '2': None, '4': 1000, '5': None}
+
+    histogram = {row['lapses']: row['cards'] for row in client.get('/api/analytics/lapses/').data['histogram']}
+    assert histogram[0] == 2
+    assert histogram[2] == 1
+    assert histogram[10] == 1
+
+
+def test_heatmap_window_follows_date(user, deck, client, monkeypatch):
+    today = timezone.localdate()
+    assert client.get('/api/analytics/heatmap/').data['end_date'] == today.isoformat()
+
+    tomorrow = today + timedelta(days=1)
+    monkeypatch.setattr('cards.services.analytics.timezone.localdate', lambda: tomorrow)
+    assert client.get('/api/analytics/heatmap/').data['end_date'] == tomorrow.isoformat()
+
+
+def test_lapses_follow_card_changes(user, deck, client):
+    from io import StringIO
+    from cards.services.import_export import ImportExportService
+
+    def total_cards():
+        return sum(row['cards'] for row in client.get('/api/analytics/lapses/').data['histogram'])
+
+    card = Card.objects.create(user=user, deck=deck, word='w', card_type='en', lapses=3)
+    assert total_cards() == 1
+
+    Card.objects.create(user=user, deck=deck, word='x', card_type='en')
+    assert total_cards() == 2
+
+    ImportExportService.import_cards_stream(StringIO('Front,Back\ny,m\nz,m\n'), 'csv', user, deck)
+    assert total_cards() == 4
+
+    client.delete(f'/api/cards/{card.id}/')
+    assert total_cards() == 3
+
+
+def test_invalidation_during_compute_is_not_overwritten(user):
+    from cards.services import analytics
+
+    def compute_racing_review():
+        # 计算过程中有一次复习使缓存失效，本次结果已过时
+        analytics.invalidate_analytics(user.id)
+        return {'value': 'old'}
+
+    assert analytics._cached(user.id, 'entry', compute_racing_review) == {'value': 'old'}
+    assert analytics._cached(user.id, 'entry', lambda: {'value': 'new'}) == {'value': 'new'}
+    # 各项分别缓存，互不覆盖
+    assert analytics._cached(user.id, 'other', lambda: {'value': 'other'}) == {'value': 'other'}
+    assert analytics._cached(user.id, 'entry', lambda: {'value': 'recomputed'}) == {'value': 'new'}
+
+
+def test_invalidation_without_version(user):
+    from cards.services import analytics
+
+    analytics._cached(user.id, 'entry', lambda: {'value': 'old'})
+    cache.delete(analytics._version_key(user.id))
+    analytics.invalidate_analytics(user.id)
+
+    assert analytics._cached(user.id, 'entry', lambda: {'value': 'new'}) == {'value': 'new'}
@@ -0,0 +1,80 @@
+"""
+百度汉语回退测试: “未找到”缓存和熔断
+"""
+from unittest import mock
+import pytest
+import requests
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from cards.services import baidu_hanyu
+from cards.services.baidu_hanyu import BaiduHanyuService, BaiduHanyuUnavailable, CircuitBreaker
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """本地汉字数据库为空，每个测试使用新的熔断器和空缓存"""
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: str(tmp_path / 'missing.db'))
+    monkeypatch.setattr(BaiduHanyuService, 'breaker', CircuitBreaker(failure_threshold=3, cooldown=60))
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _response(status_code=200, data=None):
+    return mock.Mock(status_code=status_code, json=mock.Mock(return_value=data or {}))
+
+
+def test_breaker_opens_after_consecutive_failures(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(baidu_hanyu.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    # 冷却结束后只放行一个试探请求
+    now[0] += 31
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_fetch_stops_calling_when_open():
+    with mock.patch('cards.services.baidu_hanyu.requests.get', side_effect=requests.Timeout) as get:
+        for _ in range(5):
+            with pytest.raises(BaiduHanyuUnavailable):
+                BaiduHanyuService.fetch('龘')
+        assert BaiduHanyuService.lookup('龘') is None
+
+    assert get.call_count == 3
+
+
+def test_not_found_is_cached(db):
+    client = APIClient()
+    with mock.patch('cards.services.baidu_hanyu.requests.get', return_value=_response(data={'ret_array': []})) as get:
+        for _ in range(3):
+            response = client.get('/api/dict/zh/龘/')
+            assert (response.status_code, response.data['source']) == (404, 'manual')
+
+    assert get.call_count == 1
+    # 未收录不算失败
+    assert BaiduHanyuService.breaker.allow()
+
+
+def test_failures_are_not_cached(db):
+    client = APIClient()
+    with mock.patch('cards.services.baidu_hanyu.requests.get', return_value=_response(status_code=503)) as get:
+        for _ in range(5):
+            assert client.get('/api/dict/zh/龘/').status_code == 404
+
+    # 熔断前每次都会重试，熔断后不再请求
+    assert get.call_count == 3
+    assert cache.get('dict:zh:missing:龘') is None
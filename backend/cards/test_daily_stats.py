@@ -0,0 +1,91 @@
+"""
+每日复习统计测试
+"""
+import pytest
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from cards.models import Deck, Card, DailyReviewStats
+from cards.services.sm2 import process_review, process_review_batch, undo_review
+from cards.services.daily_stats import get_streak, rebuild_daily_stats
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def cards(user):
+    """创建测试卡片"""
+    deck = Deck.objects.create(user=user, name='Test Deck')
+    return [
+        Card.objects.create(user=user, deck=deck, word=f'w{i}', card_type='en')
+        for i in range(3)
+    ]
+
+
+def stats_row(user):
+    return DailyReviewStats.objects.get(user=user, date=timezone.localdate())
+
+
+class TestRecordReviews:
+    """测试复习和撤销时的增量维护"""
+
+    def test_process_review_and_undo(self, user, cards):
+        process_review(cards[0], quality=4, time_taken=1000)
+        log = process_review(cards[1], quality=0, time_taken=500)
+
+        row = stats_row(user)
+        assert (row.reviews, row.good_count, row.again_count) == (2, 1, 1)
+        assert row.time_spent == 1500
+        assert row.new_cards == 2
+
+        undo_review(log)
+        row = stats_row(user)
+        assert (row.reviews, row.again_count, row.time_spent, row.new_cards) == (1, 0, 1000, 1)
+
+    def test_batch_matches_rebuild(self, user, cards):
+        yesterday = timezone.now() - timedelta(days=1)
+        process_review_batch(user, [
+            {'card_id': cards[0].id, 'quality': 4, 'time_taken': 100, 'reviewed_at': yesterday},
+            {'card_id': cards[1].id, 'quality': 5, 'time_taken': 200},
+            {'card_id': cards[0].id, 'quality': 2, 'time_taken': 300},
+        ])
+
+        fields = ['date', 'reviews', 'again_count', 'hard_count', 'good_count', 'easy_count', 'time_spent', 'new_cards']
+        incremental = list(DailyReviewStats.objects.filter(user=user).order_by('date').values(*fields))
+
+        assert rebuild_daily_stats(user) == 2
+        assert list(DailyReviewStats.objects.filter(user=user).order_by('date').values(*fields)) == incremental
+        assert incremental[1]['reviews'] == 2
+
+        out = StringIO()
+        call_command('rebuild_daily_stats', stdout=out)
+        assert 'testuser: 2 天' in out.getvalue()
+
+
+def test_streak(user):
+    today = timezone.localdate()
+    for offset in [0, 1, 2, 4]:
+        DailyReviewStats.objects.create(user=user, date=today - timedelta(days=offset), reviews=1)
+
+    assert get_streak(user, today) == 3
+    assert get_streak(user, today + timedelta(days=1)) == 0
+
+
+def test_stats_endpoint(user, cards, django_assert_max_num_queries):
+    process_review(cards[0], quality=4, time_taken=1000)
+    Card.objects.filter(pk=cards[1].pk).update(state='review', due_at=timezone.now())
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    with django_assert_max_num_queries(3):
+        response = client.get('/api/cards/stats/')
+
+    assert response.status_code == 200
+    assert response.data == {'due_today': 1, 'new_cards': 1, 'total_cards': 3, 'streak': 1}
@@ -0,0 +1,117 @@
+"""
+异步字典查询测试
+"""
+import asyncio
+import json
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncRequestFactory
+from cards import views
+from cards.models import ECDict
+from cards.services import dict_async, hanzi_db
+from cards.services.baidu_hanyu import BaiduHanyuService, CircuitBreaker
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """本地汉字数据库为空，每个测试使用新的熔断器和空缓存"""
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: str(tmp_path / 'hanzi_local.db'))
+    monkeypatch.setattr(BaiduHanyuService, 'breaker', CircuitBreaker(failure_threshold=3, cooldown=60))
+    cache.clear()
+    yield
+    cache.clear()
+    hanzi_db.close_connections()
+
+
+@pytest.fixture
+def baidu(monkeypatch):
+    """用 httpx.MockTransport 模拟百度汉语，记录每次请求的字"""
+    requested = []
+
+    async def handler(request):
+        char = request.url.params['wd']
+        requested.append(char)
+        await asyncio.sleep(0.05)
+        items = [] if char == '龘' else [{'pinyin': ['xué'], 'radicals': ['子'], 'stroke_count': [8]}]
+        return httpx.Response(200, json={'ret_array': items})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(BaiduHanyuService, '_async_client', classmethod(lambda cls: client))
+    return requested
+
+
+def test_concurrent_misses_fetch_once(baidu):
+    async def run():
+        return await asyncio.gather(*[dict_async.lookup_hanzi('学') for _ in range(10)])
+
+    results = async_to_sync(run)()
+
+    assert baidu == ['学']
+    assert all(result['radical'] == '子' and result['source'] == 'baidu-hanyu' for result in results)
+    # 查到的结果已缓存并保存到本地
+    assert async_to_sync(dict_async.lookup_hanzi)('学')['source'] == 'cache'
+    cache.clear()
+    assert async_to_sync(dict_async.lookup_hanzi)('学')['source'] == 'local-dict'
+    assert baidu == ['学']
+
+
+def test_hanzi_view_not_found_is_cached(baidu):
+    request = AsyncRequestFactory().get('/api/dict/zh/龘/')
+    for _ in range(2):
+        response = async_to_sync(views.lookup_hanzi_async)(request, '龘')
+        assert response.status_code == 404
+        assert json.loads(response.content)['source'] == 'manual'
+    assert baidu == ['龘']
+
+
+def test_english_view(db):
+    ECDict.objects.create(word='Apple', translation='苹果', tag='b1')
+    factory = AsyncRequestFactory()
+
+    response = async_to_sync(views.lookup_english_async)(factory.get('/api/dict/en/APPLE/'), 'APPLE')
+    data = json.loads(response.content)
+    assert (response.status_code, data['meaning_zh'], data['cefr']) == (200, '苹果', 'B1')
+    assert '苹果' in response.content.decode()
+
+    response = async_to_sync(views.lookup_english_async)(factory.get('/api/dict/en/apple/'), 'apple')
+    assert json.loads(response.content)['source'] == 'cache'
+
+    response = async_to_sync(views.lookup_english_async)(factory.post('/api/dict/en/apple/'), 'apple')
+    assert response.status_code == 405
+
+
+def test_views_are_throttled(db, monkeypatch):
+    from rest_framework.throttling import SimpleRateThrottle
+
+    monkeypatch.setattr(SimpleRateThrottle, 'THROTTLE_RATES', {'anon': '2/hour', 'user': '1000/hour'})
+    ECDict.objects.create(word='apple', translation='苹果')
+    factory = AsyncRequestFactory()
+
+    statuses = [
+        async_to_sync(views.lookup_english_async)(factory.get('/api/dict/en/apple/'), 'apple').status_code
+        for _ in range(2)
+    ]
+    response = async_to_sync(views.lookup_hanzi_async)(factory.get('/api/dict/zh/学/'), '学')
+
+    assert statuses == [200, 200]
+    assert response.status_code == 429
+    assert int(response['Retry-After']) > 0
+    # 其他 IP 不受影响
+    other = factory.get('/api/dict/en/apple/', headers={'X-Forwarded-For': '10.0.0.2'})
+    assert async_to_sync(views.lookup_english_async)(other, 'apple').status_code == 200
+
+
+def test_async_client_closed_with_loop():
+    async def get_client():
+        client = BaiduHanyuService._async_client()
+        assert BaiduHanyuService._async_client() is client
+        return client
+
+    # WSGI 下 async_to_sync 每次调用都在新的事件循环中执行
+    first = async_to_sync(get_client)()
+    second = async_to_sync(get_client)()
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
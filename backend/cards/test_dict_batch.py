@@ -0,0 +1,91 @@
+"""
+批量字典查询测试
+"""
+import sqlite3
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from cards.models import ECDict
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def hanzi_db(tmp_path, monkeypatch):
+    """临时本地汉字数据库: 学 在 hanzi_baidu 中，人 只在原有 hanzi 表中"""
+    path = str(tmp_path / 'hanzi_local.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE hanzi (id INTEGER PRIMARY KEY, character TEXT UNIQUE, decomposition TEXT, '
+                 'rationality_score REAL, pinyin TEXT, traditional TEXT, network_level INTEGER, '
+                 'frequency_1 REAL, frequency_order_1 INTEGER, learning_order_1 INTEGER)')
+    conn.execute("INSERT INTO hanzi VALUES (1, '人', '人', 5.0, 'rén', '人', 1, 0.8, 7, 3), "
+                 "(2, '学', '⿱⺍子', 4.0, 'xué', '學', 1, 0.4, 60, 40), "
+                 "(3, '中', '⿻口丨', 3.0, 'zhōng zhòng', '中', 1, 0.9, 14, 5)")
+    conn.execute('CREATE TABLE hanzi_baidu (char TEXT PRIMARY KEY, pinyin TEXT, radical TEXT, strokes INTEGER, '
+                 'frequency INTEGER, meaning TEXT, examples TEXT, traditional TEXT)')
+    conn.execute("INSERT INTO hanzi_baidu VALUES ('学', 'xué', '子', 8, 5, '学习', '学生|学校', '學')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: path)
+    return path
+
+
+def test_english_batch(db, django_assert_num_queries):
+    ECDict.objects.create(word='Apple', translation='苹果', tag='b1')
+    ECDict.objects.create(word='pear', translation='梨')
+    client = APIClient()
+    cache.set('dict:en:pear', {'word': 'pear', 'meaning_zh': '梨', 'source': 'local-dict'})
+
+    with django_assert_num_queries(1):
+        response = client.post('/api/dict/en/batch/', {'items': ['APPLE', 'pear', 'nope', 'APPLE']}, format='json')
+
+    assert response.status_code == 200
+    results = response.data['results']
+    assert (results['APPLE']['meaning_zh'], results['APPLE']['cefr'], results['APPLE']['source']) == ('苹果', 'B1', 'local-dict')
+    assert results['pear']['source'] == 'cache'
+    assert results['nope']['source'] == 'manual'
+    assert (response.data['found'], response.data['missing']) == (2, ['nope'])
+
+    # 批量查询的结果与单个查询共用缓存
+    assert client.get('/api/dict/en/apple/').data['source'] == 'cache'
+
+
+def test_hanzi_batch(db, hanzi_db):
+    response = APIClient().post('/api/dict/zh/batch/', {'items': ['学', '人', '龘']}, format='json')
+
+    results = response.data['results']
+    assert (results['学']['radical'], results['学']['examples']) == ('子', ['学生', '学校'])
+    assert (results['人']['pinyin'], results['人']['source']) == (['rén'], 'local-dict')
+    assert response.data['missing'] == ['龘']
+
+
+def test_hanzi_repository_merges_tables(hanzi_db):
+    from cards.services.hanzi import hanzi_repository
+    from cards.services.hanzi_db import read_connection
+
+    statements = []
+    read_connection().set_trace_callback(statements.append)
+    entries = hanzi_repository.get_many(['学', '中', '龘'])
+
+    # 一次查询同时关联两张表
+    assert len([sql for sql in statements if sql.lstrip().startswith('WITH')]) == 1
+    assert set(entries) == {'学', '中'}
+
+    xue = entries['学']
+    assert (xue.radical, xue.strokes, xue.meaning_zh) == ('子', 8, '学习')
+    assert (xue.decomposition, xue.frequency_order, xue.learning_order) == ('⿱⺍子', 60, 40)
+
+    # hanzi 表的多音字拼音以空格分隔
+    assert entries['中'].pinyin == ('zhōng', 'zhòng')
+    assert entries['中'].to_result()['pinyin'] == ['zhōng', 'zhòng']
+
+
+@pytest.mark.parametrize('items', [[], 'abc', ['x'] * 501])
+def test_invalid_batch(db, items):
+    response = APIClient().post('/api/dict/en/batch/', {'items': items}, format='json')
+    assert response.status_code == 400
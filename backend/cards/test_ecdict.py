@@ -0,0 +1,60 @@
+"""
+ECDICT 查询测试
+"""
+import csv
+import os
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from cards.models import ECDict
+from cards.services.ecdict import get_entry
+from cards.services.ecdict_loader import ECDICT_COLUMNS, build_sidecar
+
+
+def write_csv(path, words):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ECDICT_COLUMNS)
+        for word in words:
+            writer.writerow([word, 'fə', 'def', f'{word} 释义', 'n', 3, '1', 'cet4 b1', '', '7', '', '', ''])
+    return str(path)
+
+
+@pytest.fixture
+def sidecar(db, settings, tmp_path):
+    path = str(tmp_path / 'ecdict.db')
+    build_sidecar(write_csv(tmp_path / 'a.csv', ['Apple', 'pear']), path)
+    settings.ECDICT_SIDECAR_PATH = path
+    return path
+
+
+def test_main_database(db):
+    ECDict.objects.create(word='Apple', translation='苹果')
+
+    with CaptureQueriesContext(connection) as queries:
+        assert get_entry('aPPLE').translation == '苹果'
+    assert get_entry('missing') is None
+
+    # 查询命中 LOWER(word) 表达式索引而不是扫描全表
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {queries[0]["sql"]}')
+        plan = ' '.join(row[-1] for row in cursor.fetchall())
+    assert 'USING INDEX ecdict_word_lower_idx' in plan
+
+
+def test_sidecar_lookup(sidecar, tmp_path):
+    # 主数据库中没有数据，查询走独立文件
+    entry = get_entry('APPLE')
+    assert (entry.word, entry.oxford, entry.bnc, entry.frq) == ('Apple', True, None, 7)
+    assert get_entry('a%') is None
+
+    response = APIClient().get('/api/dict/en/pear/')
+    assert response.status_code == 200
+    assert (response.data['meaning_zh'], response.data['cefr']) == ('pear 释义', 'B1')
+
+    # 重新生成的文件整体替换旧文件，已打开的连接会重新打开
+    build_sidecar(write_csv(tmp_path / 'b.csv', ['plum']), sidecar)
+    assert get_entry('pear') is None
+    assert get_entry('plum').translation == 'plum 释义'
+    assert not os.path.exists(f'{sidecar}.building')
@@ -0,0 +1,77 @@
+"""
+ECDICT 快速导入测试
+"""
+import csv
+import sqlite3
+import pytest
+from django.db import connection
+from cards.services.ecdict_loader import ECDICT_COLUMNS, load_ecdict
+
+
+@pytest.fixture
+def db_path(db, tmp_path):
+    """按测试库中 ecdict 的表结构创建独立的 SQLite 文件"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = 'ecdict' AND sql IS NOT NULL")
+        statements = [row[0] for row in cursor.fetchall()]
+
+    path = str(tmp_path / 'db.sqlite3')
+    conn = sqlite3.connect(path)
+    for sql in statements:
+        conn.execute(sql)
+    conn.execute("INSERT INTO ecdict (word, phonetic, definition, translation, pos, collins, oxford, tag, exchange, detail, audio) "
+                 "VALUES ('old', '', '', '', '', 0, 0, '', '', '', '')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'stardict.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ECDICT_COLUMNS)
+        for i in range(10):
+            writer.writerow([f'w{i}', 'wɜːd', 'def', '释义', 'n', i % 6, '1' if i % 2 else '', 'cet4', '', str(i), '', '', ''])
+        writer.writerow(['w3', '', 'duplicate', '', '', '', '', '', '', '', '', '', ''])
+        writer.writerow(['', '', 'no word', '', '', '', '', '', '', '', '', '', ''])
+    return str(path)
+
+
+def fetch(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_load_swaps_table(db_path, csv_path):
+    indexes = fetch(db_path, "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name")
+
+    result = load_ecdict(csv_path, db_path, batch_size=4)
+
+    assert (result['records'], result['rows'], result['resumed_from']) == (12, 10, 0)
+    assert fetch(db_path, 'SELECT COUNT(*) FROM ecdict WHERE word = "old"') == [(0,)]
+    assert fetch(db_path, "SELECT definition, oxford, bnc, frq FROM ecdict WHERE word = 'w3'") == [('def', 1, None, 3)]
+    assert fetch(db_path, "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name") == indexes
+    assert fetch(db_path, "SELECT name FROM sqlite_master WHERE name LIKE 'ecdict_%' AND type = 'table'") == []
+
+
+def test_resume_after_interrupt(db_path, csv_path):
+    def interrupt(records, rows):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        load_ecdict(csv_path, db_path, batch_size=4, progress_callback=interrupt)
+    # 中断时线上表未被替换
+    assert fetch(db_path, 'SELECT word FROM ecdict') == [('old',)]
+
+    result = load_ecdict(csv_path, db_path, batch_size=4)
+
+    assert result['resumed_from'] == 4
+    assert fetch(db_path, 'SELECT COUNT(*) FROM ecdict') == [(10,)]
+
+    # --restart 忽略进度，--limit 只读取前几行
+    assert load_ecdict(csv_path, db_path, limit=3, restart=True)['rows'] == 3
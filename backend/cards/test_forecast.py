@@ -0,0 +1,189 @@
+"""
+批量 SM-2 与复习负荷预测测试
+"""
+import itertools
+import pytest
+import numpy as np
+from datetime import timedelta
+from types import SimpleNamespace
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from cards.models import Deck, Card
+from cards.services.sm2 import calculate_ef, calculate_interval, get_next_learning_step
+from cards.services.schedulers import FSRSScheduler
+from cards.services.forecast import (
+    STATE_CODES,
+    STATE_LEARNING,
+    STATE_NEW,
+    STATE_REVIEW,
+    apply_fsrs_review_batch,
+    apply_review_batch,
+    calculate_ef_batch,
+    calculate_interval_batch,
+    get_next_learning_step_batch,
+    forecast_workload,
+    simulate_workload,
+)
+
+QUALITIES = [0, 2, 4, 5]
+EFS = [1.3, 1.7, 2.5, 2.8]
+INTERVALS = [0, 1, 6, 15, 40]
+
+
+class TestBatchMatchesScalar:
+    """测试批量函数与单卡函数逐项一致"""
+
+    def test_calculate_ef_batch(self):
+        grid = list(itertools.product(EFS, QUALITIES))
+        ef, quality = (np.array(col) for col in zip(*grid))
+
+        expected = [calculate_ef(e, q) for e, q in grid]
+        np.testing.assert_allclose(calculate_ef_batch(ef, quality), expected)
+
+    def test_calculate_interval_batch(self):
+        grid = list(itertools.product(INTERVALS, EFS, QUALITIES))
+        interval, ef, quality = (np.array(col) for col in zip(*grid))
+
+        expected = [calculate_interval(i, e, q) for i, e, q in grid]
+        np.testing.assert_array_equal(calculate_interval_batch(interval, ef, quality), expected)
+
+    def test_get_next_learning_step_batch(self):
+        grid = list(itertools.product([0, 1], EFS, QUALITIES))
+        step, ef, quality = (np.array(col) for col in zip(*grid))
+
+        delta, state, new_step = get_next_learning_step_batch(step, ef, quality)
+
+        for i, (s, e, q) in enumerate(grid):
+            card = SimpleNamespace(learning_step=s, ef=e)
+            expected_delta, expected_state = get_next_learning_step(card, q)
+            assert delta[i] == pytest.approx(expected_delta / timedelta(days=1))
+            assert state[i] == (STATE_REVIEW if expected_state == 'review' else STATE_LEARNING)
+            assert new_step[i] == card.learning_step
+
+    def test_apply_review_batch_review_state(self):
+        """测试复习阶段: 通过时 EF/间隔更新，失败时回到学习阶段"""
+        state = np.array([STATE_REVIEW] * 4)
+        ef = np.full(4, 2.5)
+        interval = np.full(4, 6)
+        step = np.zeros(4, dtype=int)
+        quality = np.array(QUALITIES)
+
+        new_state, new_ef, new_interval, _, delta = apply_review_batch(state, ef, interval, step, quality)
+
+        np.testing.assert_array_equal(new_state, [STATE_LEARNING, STATE_LEARNING, STATE_REVIEW, STATE_REVIEW])
+        assert new_ef[0] == 2.5 and new_interval[0] == 6
+        assert new_ef[3] == calculate_ef(2.5, 5)
+        assert new_interval[3] == delta[3] == calculate_interval(6, calculate_ef(2.5, 5), 5)
+
+
+def test_apply_fsrs_review_batch_matches_scheduler():
+    """测试 FSRS 批量复习与 FSRSScheduler 逐项一致"""
+    scheduler = FSRSScheduler()
+    now = timezone.now()
+    cases = [
+        (state, stability, quality)
+        for state, stability in [('new', 0.0), ('learning', 3.0), ('review', 3.0), ('review', 40.0)]
+        for quality in QUALITIES
+    ]
+    states, stabilities, qualities = (np.array(column) for column in zip(*cases))
+    interval, elapsed = 5, 7.0
+
+    new_state, new_stability, new_difficulty, new_interval, delta = apply_fsrs_review_batch(
+        np.array([STATE_CODES[state] for state in states]),
+        stabilities.astype(float),
+        np.full(len(cases), 5.0),
+        np.full(len(cases), interval),
+        np.full(len(cases), elapsed),
+        qualities,
+        scheduler.weights,
+        scheduler.desired_retention,
+    )
+
+    for i, (state, stability, quality) in enumerate(cases):
+        card = SimpleNamespace(
+            state=state, stability=stability, difficulty=5.0, interval=interval,
+            due_at=now - timedelta(days=elapsed - interval), lapses=0, learning_step=0,
+        )
+        scheduler.review(card, quality, now)
+        assert new_state[i] == STATE_CODES[card.state]
+        assert new_stability[i] == pytest.approx(card.stability)
+        assert new_difficulty[i] == pytest.approx(card.difficulty)
+        assert new_interval[i] == card.interval
+        assert delta[i] == pytest.approx((card.due_at - now).total_seconds() / 86400)
+
+
+class TestSimulateWorkload:
+    """测试负荷模拟"""
+
+    def test_overdue_cards_land_on_day_zero(self):
+        n = 100
+        workload = simulate_workload(
+            state=np.full(n, STATE_REVIEW),
+            ef=np.full(n, 2.5),
+            interval=np.full(n, 10),
+            learning_step=np.zeros(n, dtype=int),
+            due_days=np.full(n, -3.0),
+            days=5,
+            rating_distribution={4: 1.0},
+            seed=1,
+        )
+        # 全部 Good: 第 0 天复习一次，下一次在 25 天后
+        np.testing.assert_array_equal(workload, [n, 0, 0, 0, 0])
+
+    def test_new_cards_introduced_per_day(self):
+        n = 10
+        workload = simulate_workload(
+            state=np.full(n, STATE_NEW),
+            ef=np.full(n, 2.5),
+            interval=np.zeros(n, dtype=int),
+            learning_step=np.zeros(n, dtype=int),
+            due_days=np.full(n, np.inf),
+            days=3,
+            rating_distribution={4: 1.0},
+            new_per_day=5,
+            seed=1,
+        )
+        # 第 0 天引入 5 张；第 1 天引入 5 张并复习第 0 天的 5 张（1 天学习小步）
+        assert workload[0] == 5
+        assert workload[1] == 10
+
+
+@pytest.mark.django_db
+def test_forecast_endpoint():
+    user = User.objects.create_user(username='testuser', password='testpass123')
+    deck = Deck.objects.create(user=user, name='Test Deck')
+    for i in range(20):
+        Card.objects.create(
+            user=user, deck=deck, word=f'w{i}', card_type='en',
+            state='review', interval=3, due_at=timezone.now() + timedelta(days=i % 5),
+        )
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    response = client.get('/api/review/forecast/', {'days': 30})
+
+    assert response.status_code == 200
+    assert len(response.data['forecast']) == 30
+    assert response.data['total_reviews'] >= 20
+
+    assert client.get('/api/review/forecast/', {'days': 0}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_forecast_uses_fsrs_for_fsrs_decks():
+    """测试 FSRS 卡组按 FSRS 模拟: 稳定度很高的卡片 30 天内只复习一次"""
+    user = User.objects.create_user(username='testuser', password='testpass123')
+    sm2_deck = Deck.objects.create(user=user, name='SM-2')
+    fsrs_deck = Deck.objects.create(user=user, name='FSRS', scheduler='fsrs')
+    for deck in (sm2_deck, fsrs_deck):
+        for i in range(10):
+            Card.objects.create(
+                user=user, deck=deck, word=f'{deck.name}{i}', card_type='en',
+                state='review', interval=3, stability=100, difficulty=5, due_at=timezone.now(),
+            )
+
+    result = forecast_workload(user, days=30, rating_distribution={4: 1.0})
+
+    # SM-2: 第 0、7、24 天各复习一次；FSRS: 只在第 0 天复习一次
+    assert result['total_reviews'] == 10 * 3 + 10
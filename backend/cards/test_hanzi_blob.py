@@ -0,0 +1,75 @@
+"""
+本地汉字字典快照测试
+"""
+import sqlite3
+from io import StringIO
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from cards.services import hanzi_blob, hanzi_db
+from cards.services.hanzi import hanzi_repository
+
+
+@pytest.fixture
+def hanzi_path(tmp_path, monkeypatch):
+    """人 只在 hanzi 表中，学 两张表都有，习 只在 hanzi_baidu 中"""
+    path = str(tmp_path / 'hanzi_local.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE hanzi (id INTEGER PRIMARY KEY, character TEXT UNIQUE, decomposition TEXT, '
+                 'rationality_score REAL, pinyin TEXT, traditional TEXT, network_level INTEGER, '
+                 'frequency_1 REAL, frequency_order_1 INTEGER, learning_order_1 INTEGER)')
+    conn.execute("INSERT INTO hanzi VALUES (1, '人', '人', 5.0, 'rén', '人', 1, 0.8, 7, 3), "
+                 "(2, '学', '⿱⺍子', 4.0, 'xué', '學', 1, 0.4, 60, 40)")
+    conn.execute(hanzi_db.HANZI_BAIDU_SCHEMA)
+    conn.execute("INSERT INTO hanzi_baidu (char, pinyin, radical, strokes, meaning, examples) "
+                 "VALUES ('学', 'xué', '子', 8, '学习', '学生|学校'), ('习', 'xí', '乙', 3, '练习', '')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: path)
+    cache.clear()
+    yield path
+    cache.clear()
+    hanzi_db.close_connections()
+
+
+@pytest.fixture
+def blob_path(hanzi_path, tmp_path, settings):
+    settings.HANZI_BLOB_PATH = str(tmp_path / 'hanzi_local.bin')
+    call_command('build_hanzi_blob', stdout=StringIO())
+    return settings.HANZI_BLOB_PATH
+
+
+def test_blob_matches_repository(blob_path):
+    blob = hanzi_blob.get_blob()
+    assert len(blob) == 3
+    for char in '人学习':
+        assert blob.get(char) == hanzi_repository.get(char)
+    assert blob.get('龘') is None
+    assert blob.get('学习') is None
+    assert hanzi_blob.get_blob() is blob
+
+
+def test_rebuilt_blob_is_remapped(blob_path, hanzi_path, monkeypatch):
+    monkeypatch.setattr(hanzi_blob, 'RELOAD_CHECK_INTERVAL', 0)
+    assert hanzi_blob.lookup('中') is None
+
+    conn = sqlite3.connect(hanzi_path)
+    conn.execute("INSERT INTO hanzi_baidu (char, pinyin) VALUES ('中', 'zhōng,zhòng')")
+    conn.commit()
+    conn.close()
+    hanzi_blob.build_blob(blob_path)
+
+    assert hanzi_blob.lookup('中').pinyin == ('zhōng', 'zhòng')
+
+
+def test_lookup_hanzi_uses_blob_without_sqlite(db, blob_path, monkeypatch, tmp_path):
+    # 快照生成后不再需要本地数据库
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: str(tmp_path / 'missing.db'))
+    client = APIClient()
+
+    response = client.get('/api/dict/zh/学/')
+    assert (response.data['radical'], response.data['learning_order'], response.data['source']) == ('子', 40, 'local-dict')
+
+    response = client.post('/api/dict/zh/batch/', {'items': ['人', '习']}, format='json')
+    assert response.data['found'] == 2
@@ -0,0 +1,71 @@
+"""
+本地汉字数据库连接管理测试
+"""
+import sqlite3
+import threading
+import pytest
+from cards.services import hanzi_db
+from cards.services.hanzi import hanzi_repository
+from cards.views import _save_hanzi_to_local
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'data' / 'hanzi_local.db')
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: path)
+    yield path
+    hanzi_db.close_connections()
+
+
+def test_read_connection_reused_per_thread(db_path):
+    assert hanzi_db.read_connection() is None
+
+    # 第一次写入时创建文件和表结构
+    _save_hanzi_to_local('学', {'pinyin': ['xué'], 'radical': '子', 'strokes': 8, 'examples': ['学生']})
+
+    conn = hanzi_db.read_connection()
+    assert hanzi_db.read_connection() is conn
+    assert hanzi_repository.get('学').radical == '子'
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM hanzi_baidu")
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(hanzi_db.read_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_concurrent_writes(db_path):
+    chars = [chr(0x4e00 + i) for i in range(40)]
+    threads = [
+        threading.Thread(target=_save_hanzi_to_local, args=(char, {'pinyin': ['yī']}))
+        for char in chars
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    count = hanzi_db.read_connection().execute('SELECT COUNT(*) FROM hanzi_baidu').fetchone()[0]
+    assert count == len(chars)
+
+
+def test_write_rolls_back_on_error(db_path):
+    with pytest.raises(RuntimeError):
+        with hanzi_db.write_connection() as conn:
+            conn.execute("INSERT INTO hanzi_baidu (char) VALUES ('错')")
+            raise RuntimeError
+
+    assert hanzi_repository.get('错') is None
+
+
+def test_svg_fills_missing_pinyin_from_local_dict(db_path):
+    from cards.services.svg_generator import generate_svg_card
+
+    _save_hanzi_to_local('学', {'pinyin': ['xué'], 'radical': '子', 'strokes': 8})
+
+    front, _ = generate_svg_card('学', 'zh', {'meaning_zh': '学习'})
+    assert 'xué' in front
+    front, _ = generate_svg_card('学', 'zh', {'pinyin': ['xue2']})
+    assert 'xue2' in front
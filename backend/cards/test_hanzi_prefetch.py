@@ -0,0 +1,117 @@
+"""
+预取百度汉语数据测试（本地 HTTP 服务模拟百度汉语）
+"""
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+import pytest
+from django.core.management import call_command
+from cards.services import hanzi_db
+from cards.services.baidu_hanyu import BaiduHanyuService, CircuitBreaker
+from cards.services.hanzi import hanzi_repository
+from cards.services.hanzi_prefetch import RateLimiter, pending_chars
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """按 wd 参数返回: 龘 未收录，failing 中的字返回 503，其余返回一条结果"""
+    requested = []
+    failing = set()
+
+    def do_GET(self):
+        char = parse_qs(urlparse(self.path).query)['wd'][0]
+        self.requested.append(char)
+        if char in self.failing:
+            self.send_response(503)
+            self.end_headers()
+            return
+        items = [] if char == '龘' else [{'pinyin': [f'{char}-py'], 'radicals': ['部'], 'stroke_count': [3]}]
+        body = json.dumps({'ret_array': items}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.requested = []
+    StubHandler.failing = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/hanyu/ajax/search_list'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def hanzi_path(tmp_path, monkeypatch):
+    """字频顺序: 的 一 是 龘 不 人（人 的字频为空，排在最后）；一 已在 hanzi_baidu 中"""
+    path = str(tmp_path / 'hanzi_local.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE hanzi (id INTEGER PRIMARY KEY, character TEXT UNIQUE, decomposition TEXT, '
+                 'rationality_score REAL, pinyin TEXT, traditional TEXT, network_level INTEGER, '
+                 'frequency_1 REAL, frequency_order_1 INTEGER, learning_order_1 INTEGER)')
+    conn.executemany(
+        'INSERT INTO hanzi (character, frequency_order_1) VALUES (?, ?)',
+        [('人', None), ('不', 5), ('龘', 4), ('是', 3), ('一', 2), ('的', 1)],
+    )
+    conn.execute(hanzi_db.HANZI_BAIDU_SCHEMA)
+    conn.execute("INSERT INTO hanzi_baidu (char, pinyin) VALUES ('一', 'yī')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: path)
+    monkeypatch.setattr(BaiduHanyuService, 'breaker', CircuitBreaker(failure_threshold=2, cooldown=60))
+    yield path
+    hanzi_db.close_connections()
+
+
+def test_pending_chars_in_frequency_order(hanzi_path):
+    assert pending_chars() == ['的', '是', '龘', '不', '人']
+    assert pending_chars(limit=3) == ['的', '是']
+
+
+def test_prefetch_and_resume(hanzi_path, stub_url):
+    out = StringIO()
+    call_command('prefetch_hanzi', '--limit', '4', '--rate', '0', '--base-url', stub_url, stdout=out)
+
+    assert sorted(StubHandler.requested) == sorted(['的', '是', '龘'])
+    assert hanzi_repository.get('的').pinyin == ('的-py',)
+    assert hanzi_repository.get('一').pinyin == ('yī',)
+    assert '保存: 2 个' in out.getvalue() and '未收录: 1 个' in out.getvalue()
+
+    # 再次运行只请求还没有的字（未收录的字会重试）
+    StubHandler.requested = []
+    call_command('prefetch_hanzi', '--rate', '0', '--base-url', stub_url, stdout=StringIO())
+    assert sorted(StubHandler.requested) == sorted(['龘', '不', '人'])
+    assert pending_chars() == ['龘']
+
+
+def test_prefetch_stops_when_breaker_opens(hanzi_path, stub_url):
+    StubHandler.failing = {'的', '是', '龘', '不', '人'}
+
+    out = StringIO()
+    call_command('prefetch_hanzi', '--workers', '1', '--rate', '0', '--base-url', stub_url, stdout=out)
+
+    # 连续失败 2 次后熔断，不再请求剩下的字
+    assert StubHandler.requested == ['的', '是']
+    assert '剩余 3 个字' in out.getvalue()
+
+
+def test_rate_limiter_spaces_calls(monkeypatch):
+    clock = [0.0]
+    sleeps = []
+    monkeypatch.setattr('cards.services.hanzi_prefetch.time.monotonic', lambda: clock[0])
+    monkeypatch.setattr('cards.services.hanzi_prefetch.time.sleep', sleeps.append)
+
+    limiter = RateLimiter(rate=4)
+    for _ in range(3):
+        limiter.wait()
+    assert sleeps == [0.25, 0.5]
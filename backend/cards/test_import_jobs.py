@@ -0,0 +1,118 @@
+"""
+后台导入任务测试
+"""
+import os
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+from cards.models import Deck, Card, ImportJob
+from cards.services.import_jobs import create_import_job, run_import_job
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(settings, tmp_path):
+    settings.IMPORT_UPLOAD_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def deck(user):
+    """创建测试卡组"""
+    return Deck.objects.create(user=user, name='Test Deck')
+
+
+def upload(content: str, name='cards.csv'):
+    return SimpleUploadedFile(name, ('﻿' + content).encode('utf-8'), content_type='text/csv')
+
+
+def test_job_runs_after_commit(user, deck, upload_dir, django_capture_on_commit_callbacks, monkeypatch):
+    submitted = []
+    monkeypatch.setattr('cards.services.import_jobs.get_executor', lambda: type(
+        'Executor', (), {'submit': staticmethod(lambda fn, job_id: submitted.append(job_id))}
+    ))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        job = create_import_job(user, deck, upload('Front,Back\napple,苹果\n'), 'csv', 'en', 'skip')
+
+    assert submitted == [job.id]
+    assert job.status == 'pending'
+    assert os.listdir(upload_dir)
+
+    run_import_job(job.id)
+    job.refresh_from_db()
+    assert (job.status, job.total, job.imported, job.batches) == ('completed', 1, 1, 1)
+    assert job.started_at and job.finished_at
+    assert not job.file
+    assert not any(files for _, _, files in os.walk(upload_dir))
+
+    # 已完成的任务不会重复执行
+    run_import_job(job.id)
+    assert Card.objects.filter(user=user).count() == 1
+
+
+def test_failed_job(user, deck):
+    job = ImportJob.objects.create(user=user, deck=deck, file='missing.csv', file_format='csv')
+
+    run_import_job(job.id)
+
+    job.refresh_from_db()
+    assert job.status == 'failed'
+    assert job.error_message
+
+
+def test_import_endpoint_and_polling(user, deck, settings):
+    settings.IMPORT_JOBS_EAGER = True
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.post('/api/cards/import/', {
+        'file': upload('Front,Back,Tags\napple,苹果,"fruit,food"\n,missing,\n'),
+        'format': 'csv',
+        'deck_id': deck.id,
+        'enrich': 'true',
+    }, format='multipart')
+
+    assert response.status_code == 202
+    assert response.data['enrich'] is True
+    job_id = response.data['job_id']
+
+    response = client.get(f'/api/cards/import/{job_id}/')
+    assert response.status_code == 200
+    assert response.data['status'] == 'completed'
+    assert (response.data['imported'], response.data['failed']) == (1, 1)
+    assert response.data['throughput'] >= 0
+    card = Card.objects.get(user=user)
+    assert (card.word, card.tags) == ('apple', ['fruit', 'food'])
+
+    other = User.objects.create_user(username='other', password='testpass123')
+    client.force_authenticate(user=other)
+    assert client.get(f'/api/cards/import/{job_id}/').status_code == 404
+
+
+def test_stale_job_marked_failed(user, deck, upload_dir, settings):
+    from datetime import timedelta
+    from django.utils import timezone
+
+    settings.IMPORT_JOB_STALE_TIMEOUT = 600
+    client = APIClient()
+    client.force_authenticate(user=user)
+    # 模拟执行任务的进程已重启: 任务停留在 running，进度很久没有更新
+    stale = create_import_job(user, deck, upload('Front,Back\napple,苹果\n'), 'csv', 'en', 'skip')
+    ImportJob.objects.filter(pk=stale.pk).update(
+        status='running', updated_at=timezone.now() - timedelta(seconds=601)
+    )
+    fresh = ImportJob.objects.create(user=user, deck=deck, file_format='csv', status='running')
+
+    response = client.get(f'/api/cards/import/{stale.id}/')
+    assert (response.data['status'], response.data['finished_at'] is not None) == ('failed', True)
+    assert '重新上传' in response.data['error_message']
+    assert not any(files for _, _, files in os.walk(upload_dir))
+
+    assert client.get(f'/api/cards/import/{fresh.id}/').data['status'] == 'running'
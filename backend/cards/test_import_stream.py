@@ -0,0 +1,240 @@
+"""
+流式导入测试
+"""
+import json
+import pytest
+from io import StringIO
+from django.contrib.auth.models import User
+from cards.models import Deck, Card, ECDict
+from cards.services.import_export import ImportExportService, iter_json_array
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def deck(user):
+    """创建测试卡组"""
+    return Deck.objects.create(user=user, name='Test Deck')
+
+
+class TestIterJsonArray:
+    """测试增量 JSON 解析"""
+
+    @pytest.mark.parametrize('read_size', [1, 3, 1024])
+    def test_formats(self, read_size):
+        items = [{'Front': 'a', 'Back': '啊'}, 12345, [1, {'x': '}]'}], 'str,]']
+
+        assert list(iter_json_array(StringIO(json.dumps(items)), read_size)) == items
+        wrapped = json.dumps({'version': 2.5, 'meta': {'cards': 1}, 'cards': items})
+        assert list(iter_json_array(StringIO(wrapped), read_size)) == items
+        assert list(iter_json_array(StringIO(' [ ] '), read_size)) == []
+
+    @pytest.mark.parametrize('content', ['{"a": 1}', '"x"', '[{"a": 1} {"b": 2}]', '[{"a": 1},'])
+    def test_invalid(self, content):
+        with pytest.raises(ValueError):
+            list(iter_json_array(StringIO(content), 4))
+
+
+class TestImportCardsStream:
+    """测试流式导入"""
+
+    def test_batches_and_progress(self, user, deck):
+        Card.objects.create(
+            user=user, deck=deck, word='w1', card_type='en',
+            metadata={'meaning': 'm1'},
+        )
+        lines = ['Front,Back,Tags'] + [f'w{i},m{i},t' for i in range(5)] + [',missing,']
+        progress = []
+
+        result = ImportExportService.import_cards_stream(
+            StringIO('\n'.join(lines)), 'csv', user, deck, batch_size=2,
+            progress_callback=lambda r: progress.append(r['total']),
+        )
+
+        assert (result['total'], result['imported'], result['skipped'], result['failed']) == (6, 4, 1, 1)
+        assert result['duplicates'][0]['index'] == 1
+        assert result['errors'] == ['第 7 行: 缺少 Front 或 Back 字段']
+        assert progress == [2, 4, 6]
+        assert Card.objects.filter(user=user).count() == 5
+
+    def test_json_parse_error_keeps_parsed_rows(self, user, deck):
+        content = '[' + ','.join(json.dumps({'Front': f'w{i}', 'Back': 'm'}) for i in range(3)) + ', oops]'
+
+        result = ImportExportService.import_cards_stream(StringIO(content), 'json', user, deck, batch_size=2)
+
+        # 出错前已解析的记录（包括未凑满一批的）都写入
+        assert (result['total'], result['imported']) == (3, 3)
+        assert result['errors'][0].startswith('JSON 解析失败')
+
+    def test_decode_error_flushes_pending_batch(self, user, deck):
+        import io
+
+        # 文本流按块解码，错误字节放在第一块之后
+        lines = ['Front,Back'] + [f'w{i},m{i}' for i in range(2000)]
+        content = '\n'.join(lines).encode('utf-8') + b'\n\xff\xfe,x\n'
+        stream = io.TextIOWrapper(io.BytesIO(content), encoding='utf-8', newline='')
+
+        result = ImportExportService.import_cards_stream(stream, 'csv', user, deck, batch_size=5000)
+
+        assert result['total'] > 0
+        assert result['imported'] == result['total'] == Card.objects.filter(user=user).count()
+        assert '文件编码错误' in result['errors'][0]
+
+    def test_bad_rows_do_not_split_batches(self, user, deck):
+        Card.objects.create(user=user, deck=deck, word='w3', card_type='en', metadata={'meaning': 'm3'})
+        lines = ['Front,Back'] + [f'w{i},m{i}' if i % 2 else ',' for i in range(8)]
+
+        result = ImportExportService.import_cards_stream(StringIO('\n'.join(lines)), 'csv', user, deck, batch_size=4)
+
+        assert (result['total'], result['imported'], result['skipped'], result['failed']) == (8, 3, 1, 4)
+        assert result['batches'] == 1
+        assert result['duplicates'][0]['index'] == 3
+
+
+
+class TestConflictResolution:
+    """测试重复卡片的批量覆盖与合并"""
+
+    @pytest.fixture
+    def existing(self, user, deck):
+        return [
+            Card.objects.create(
+                user=user, deck=deck, word=f'w{i}', card_type='en', tags=['old'],
+                metadata={'meaning': f'm{i}', 'svg_front': '<svg/>'},
+            )
+            for i in range(3)
+        ]
+
+    def rows(self, tags='new'):
+        return '\n'.join(['Front,Back,Tags'] + [f'W{i},m{i},{tags}' for i in range(3)] + ['w0,m0,again'])
+
+    def test_overwrite(self, user, deck, existing, django_assert_max_num_queries):
+        other_deck = Deck.objects.create(user=user, name='Other')
+
+        with django_assert_max_num_queries(8):
+            result = ImportExportService.import_cards_stream(
+                StringIO(self.rows()), 'csv', user, other_deck, conflict_strategy='overwrite'
+            )
+
+        assert (result['imported'], result['failed']) == (4, 0)
+        card = Card.objects.get(pk=existing[1].pk)
+        assert (card.word, card.deck_id, card.tags) == ('W1', other_deck.id, ['new'])
+        assert card.metadata == {'meaning_zh': 'm1', 'meaning': 'm1'}
+        # 同一张卡片出现两次时以最后一条为准
+        assert Card.objects.get(pk=existing[0].pk).tags == ['again']
+
+    def test_merge(self, user, deck, existing):
+        result = ImportExportService.import_cards_stream(
+            StringIO(self.rows()), 'csv', user, deck, conflict_strategy='merge'
+        )
+
+        assert result['imported'] == 4
+        card = Card.objects.get(pk=existing[0].pk)
+        assert sorted(card.tags) == ['again', 'new', 'old']
+        assert card.metadata['svg_front'] == '<svg/>'
+        assert card.metadata['meaning_zh'] == 'm0'
+        assert card.word == 'w0'
+        assert card.updated_at > existing[0].updated_at
+
+
+class TestInFileDuplicates:
+    """测试文件内重复与分块查重"""
+
+    content = 'Front,Back,Tags\napple,苹果,a\nApple,苹果,b\npear,梨,c\n'
+
+    @pytest.mark.parametrize('strategy, tags', [('skip', ['a']), ('overwrite', ['b']), ('merge', ['a', 'b'])])
+    def test_strategies(self, user, deck, strategy, tags):
+        result = ImportExportService.import_cards_stream(
+            StringIO(self.content), 'csv', user, deck, conflict_strategy=strategy
+        )
+
+        assert Card.objects.filter(user=user).count() == 2
+        assert Card.objects.get(user=user, semantic_hash=ImportExportService.generate_semantic_hash('apple', '苹果')).tags == tags
+        if strategy == 'skip':
+            assert (result['imported'], result['skipped']) == (2, 1)
+            assert result['duplicates'] == [{'index': 1, 'word': 'Apple', 'existing_id': None, 'reason': '文件内重复'}]
+        else:
+            assert (result['imported'], result['skipped']) == (3, 0)
+
+    def test_chunked_lookup(self, user, deck, monkeypatch, django_assert_num_queries):
+        monkeypatch.setattr('cards.services.import_export.HASH_LOOKUP_CHUNK_SIZE', 2)
+        for word in ['a', 'b', 'c']:
+            Card.objects.create(
+                user=user, deck=deck, word=word, card_type='en',
+                metadata={'meaning': 'm'},
+            )
+        rows = [ImportExportService.convert_anki_to_card_data({'Front': w, 'Back': 'm'}, user, deck) for w in 'abcde']
+
+        with django_assert_num_queries(3):
+            check = ImportExportService.check_duplicates(rows, user)
+
+        assert [idx for idx, _ in check['duplicates']] == [0, 1, 2]
+        assert [data['word'] for data in check['unique']] == ['d', 'e']
+
+    def test_unique_constraint(self, user, deck):
+        from django.db import IntegrityError, transaction
+
+        Card.objects.bulk_create([
+            Card(user=user, deck=deck, word='a', card_type='en', semantic_hash=''),
+            Card(user=user, deck=deck, word='b', card_type='en', semantic_hash=''),
+            Card(user=user, deck=deck, word='c', card_type='en', semantic_hash='x' * 32),
+        ])
+        # 未计算指纹的卡片不受唯一约束限制
+        Card.objects.filter(word__in=['a', 'b']).update(semantic_hash='')
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Card.objects.bulk_create([Card(user=user, deck=deck, word='d', card_type='en', semantic_hash='x' * 32)])
+
+
+class TestEnrichment:
+    """测试导入时用本地字典补全元数据"""
+
+    def test_english(self, user, deck, django_assert_num_queries):
+        ECDict.objects.create(word='Apple', phonetic='ˈæpl', pos='n', frq=500, tag='zk b1')
+        ECDict.objects.create(word='pear', phonetic='peə', pos='', frq=None)
+        content = 'Front,Back\napple,苹果\npear,梨\nunknown,未知\n'
+
+        # 整批只增加一次字典查询
+        with django_assert_num_queries(4):
+            result = ImportExportService.import_cards_stream(StringIO(content), 'csv', user, deck, enrich=True)
+
+        assert result['imported'] == 3
+        metadata = {card.word: card.metadata for card in Card.objects.filter(user=user)}
+        assert metadata['apple'] == {
+            'meaning_zh': '苹果', 'meaning': '苹果', 'ipa': 'ˈæpl', 'pos': 'n', 'frequency': 500, 'cefr': 'B1',
+        }
+        assert metadata['pear'] == {'meaning_zh': '梨', 'meaning': '梨', 'ipa': 'peə'}
+        assert 'ipa' not in metadata['unknown']
+
+    def test_chinese(self, user, deck, tmp_path, monkeypatch):
+        import sqlite3
+
+        path = str(tmp_path / 'hanzi_local.db')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE hanzi (id INTEGER PRIMARY KEY, character TEXT, decomposition TEXT, '
+                     'rationality_score REAL, pinyin TEXT, traditional TEXT, network_level INTEGER, '
+                     'frequency_1 REAL, frequency_order_1 INTEGER, learning_order_1 INTEGER)')
+        conn.execute('CREATE TABLE hanzi_baidu (char TEXT PRIMARY KEY, pinyin TEXT, radical TEXT, strokes INTEGER, '
+                     'frequency INTEGER, meaning TEXT, examples TEXT, traditional TEXT)')
+        conn.execute("INSERT INTO hanzi_baidu VALUES ('学', 'xué', '子', 8, 5, '学习', '', '學')")
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr('cards.services.hanzi_db.get_hanzi_db_path', lambda: path)
+
+        content = 'Front,Back\n学,study\n'
+        ImportExportService.import_cards_stream(StringIO(content), 'csv', user, deck, card_type='zh', enrich=True)
+
+        metadata = Card.objects.get(user=user).metadata
+        assert (metadata['pinyin'], metadata['radical'], metadata['strokes']) == (['xué'], '子', 8)
+
+    def test_lookup_failure_does_not_abort(self, user, deck, monkeypatch):
+        def broken(words):
+            raise RuntimeError('dictionary unavailable')
+
+        monkeypatch.setattr('cards.services.ecdict.get_entries', broken)
+        result = ImportExportService.import_cards_stream(StringIO('Front,Back\napple,苹果\n'), 'csv', user, deck, enrich=True)
+
+        assert result['imported'] == 1
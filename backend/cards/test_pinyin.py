@@ -0,0 +1,79 @@
+"""
+多音字读音推断测试
+"""
+import threading
+from unittest import mock
+import pytest
+from rest_framework.test import APIClient
+from cards.services import pinyin
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    pinyin._infer.cache_clear()
+    yield
+    pinyin._infer.cache_clear()
+
+
+def test_infer_pinyin_uses_context():
+    client = APIClient()
+
+    response = client.post('/api/dict/zh/infer-pinyin/', {'char': '行', 'context': '我去银行取钱'}, format='json')
+    assert (response.data['pinyin'], response.data['word'], response.data['confidence']) == ('háng', '银行', 0.9)
+
+    response = client.post('/api/dict/zh/infer-pinyin/', {'char': '行'}, format='json')
+    assert (response.data['pinyin'], response.data['confidence']) == (None, 0)
+
+    response = client.post('/api/dict/zh/infer-pinyin/', {'context': '银行'}, format='json')
+    assert response.status_code == 400
+
+
+def test_infer_pinyin_invalid():
+    client = APIClient()
+
+    for data in [{'char': '银行'}, {'char': '行', 'context': ['银行']}, {'char': '行', 'context': '行' * 2001}]:
+        response = client.post('/api/dict/zh/infer-pinyin/', data, format='json')
+        assert response.status_code == 400
+
+
+def test_long_context_not_memoized():
+    context = '我去银行取钱' * 40
+    assert pinyin.infer('行', context)['pinyin'] == 'háng'
+    assert pinyin._infer.cache_info().currsize == 0
+
+
+def test_no_warm_up_outside_server():
+    # 只有 config.wsgi / config.asgi 会启动预热线程
+    assert 'pinyin-warm-up' not in {thread.name for thread in threading.enumerate()}
+
+
+def test_infer_is_memoized():
+    with mock.patch('jieba.lcut', wraps=__import__('jieba').lcut) as lcut:
+        first = pinyin.infer('长', '他长大了')
+        first['alternatives'].append('x')
+        second = pinyin.infer('长', '他长大了')
+
+    assert lcut.call_count == 1
+    assert second['pinyin'] == 'zhǎng'
+    assert 'x' not in second['alternatives']
+
+
+def test_infer_pinyin_batch():
+    with mock.patch('jieba.lcut', wraps=__import__('jieba').lcut) as lcut:
+        response = APIClient().post(
+            '/api/dict/zh/infer-pinyin/batch/', {'text': '他长大了，去银行上班。ok行'}, format='json'
+        )
+
+    assert lcut.call_count == 1
+    results = {(item['index'], item['char']): item for item in response.data['results']}
+    assert results[1, '长']['pinyin'] == 'zhǎng'
+    assert (results[7, '行']['pinyin'], results[7, '行']['word']) == ('háng', '银行')
+    assert {'xíng', 'háng'} <= set(results[7, '行']['alternatives'])
+    # 非多音字和非汉字不返回
+    assert not {(9, '班'), (11, 'o')} & set(results)
+    assert all(response.data['text'][index] == char for index, char in results)
+
+
+def test_infer_pinyin_batch_invalid():
+    response = APIClient().post('/api/dict/zh/infer-pinyin/batch/', {'text': ''}, format='json')
+    assert response.status_code == 400
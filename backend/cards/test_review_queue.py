@@ -0,0 +1,195 @@
+"""
+物化复习队列测试
+"""
+import pytest
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from cards.models import Deck, Card, ReviewQueue
+from cards.services.sm2 import generate_review_queue, process_review, undo_review
+from cards.services.review_queue import load_review_queue
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def deck(user):
+    """创建测试卡组"""
+    return Deck.objects.create(user=user, name='Test Deck', daily_new_limit=3)
+
+
+@pytest.fixture
+def cards(user, deck):
+    """创建到期卡片和新卡"""
+    due = [
+        Card.objects.create(
+            user=user, deck=deck, word=f'due{i}', card_type='en',
+            state='review', interval=6, due_at=timezone.now() - timedelta(days=i + 1),
+        )
+        for i in range(2)
+    ]
+    new = [
+        Card.objects.create(user=user, deck=deck, word=f'new{i}', card_type='en', state='new')
+        for i in range(5)
+    ]
+    return due, new
+
+
+def queue_ids(result):
+    return [card.id for card in result['cards']]
+
+
+class TestLoadReviewQueue:
+    """测试队列读取与重建"""
+
+    def test_matches_generated_queue(self, user, cards):
+        """测试物化队列与直接生成的队列一致"""
+        assert queue_ids(load_review_queue(user, 10)) == queue_ids(generate_review_queue(user, 10))
+        assert ReviewQueue.objects.filter(user=user).exists()
+
+    def test_reads_without_rebuilding(self, user, cards, django_assert_num_queries):
+        """测试已物化的队列直接读取"""
+        first = load_review_queue(user, 10)
+
+        with django_assert_num_queries(2):
+            second = load_review_queue(user, 10)
+
+        assert queue_ids(second) == queue_ids(first)
+        assert second['stats']['total_new'] == 5
+
+    def test_rebuilds_when_limit_changes(self, user, cards):
+        """测试队列上限变化时重建"""
+        load_review_queue(user, 10)
+        result = load_review_queue(user, 1)
+
+        assert result['stats']['returned_count'] == 1
+        assert ReviewQueue.objects.get(user=user).session_limit == 1
+
+    def test_rebuilds_when_card_becomes_due(self, user, cards):
+        """测试有卡片到期后重建"""
+        load_review_queue(user, 10)
+        due, _ = cards
+        queue = ReviewQueue.objects.get(user=user)
+        queue.valid_until = timezone.now() - timedelta(seconds=1)
+        queue.save()
+
+        later = Card.objects.get(id=due[0].id)
+        assert queue_ids(load_review_queue(user, 10))[:2] == [due[1].id, later.id]
+        assert ReviewQueue.objects.get(user=user).valid_until is None
+
+    def test_self_heals_on_drift(self, user, cards):
+        """测试卡片被绕过维护逻辑删除或修改后自愈"""
+        due, new = cards
+        load_review_queue(user, 10)
+
+        Card.objects.filter(id=new[0].id).delete()
+        Card.objects.filter(id=due[0].id).update(due_at=timezone.now() + timedelta(days=3))
+
+        result = load_review_queue(user, 10)
+        assert queue_ids(result) == queue_ids(generate_review_queue(user, 10))
+        assert new[0].id not in queue_ids(result)
+
+
+class TestIncrementalMaintenance:
+    """测试增量维护"""
+
+    def test_review_removes_card(self, user, cards):
+        """测试复习后卡片移出队列且无需重建"""
+        due, _ = cards
+        load_review_queue(user, 10)
+
+        process_review(Card.objects.get(id=due[0].id), quality=4, time_taken=1000)
+
+        queue = ReviewQueue.objects.get(user=user)
+        assert not queue.is_stale
+        assert due[0].id not in [card_id for card_id, _ in queue.entries]
+        assert queue.valid_until is not None
+
+    def test_new_card_review_updates_total_new(self, user, cards):
+        """测试新卡复习后新卡总数减少"""
+        _, new = cards
+        load_review_queue(user, 10)
+
+        process_review(Card.objects.get(id=new[0].id), quality=4, time_taken=1000)
+
+        assert ReviewQueue.objects.get(user=user).total_new == 4
+
+    def test_create_appends_within_quota(self, user, deck):
+        """测试新建卡片在配额内追加到队尾"""
+        first = Card.objects.create(user=user, deck=deck, word='a', card_type='en')
+        load_review_queue(user, 10)
+
+        second = Card.objects.create(user=user, deck=deck, word='b', card_type='en')
+
+        queue = ReviewQueue.objects.get(user=user)
+        assert [card_id for card_id, _ in queue.entries] == [first.id, second.id]
+        assert queue.total_new == 2
+
+    def test_truncated_tier_refills(self, user, deck):
+        """测试到期卡片多于队列上限时，复习完队列中的卡片后补上剩余的到期卡片"""
+        Card.objects.bulk_create([
+            Card(
+                user=user, deck=deck, word=f'due{i}', card_type='en',
+                state='review', interval=6, due_at=timezone.now() - timedelta(days=i + 1),
+            )
+            for i in range(60)
+        ])
+        first = load_review_queue(user, 50)
+        assert first['stats']['due_count'] == 50
+
+        for card in first['cards']:
+            process_review(Card.objects.get(id=card.id), quality=4, time_taken=1000)
+
+        result = load_review_queue(user, 50)
+        assert result['stats']['due_count'] == generate_review_queue(user, 50)['stats']['due_count'] == 10
+        assert queue_ids(result) == queue_ids(generate_review_queue(user, 50))
+
+    def test_card_update_invalidates_queue(self, user, cards):
+        """测试编辑卡片后队列重建"""
+        _, new = cards
+        load_review_queue(user, 10)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.patch(f'/api/cards/{new[0].id}/', {'state': 'review', 'interval': 6}, format='json')
+
+        assert response.status_code == 200
+        assert ReviewQueue.objects.get(user=user).is_stale
+
+    def test_deck_new_limit_invalidates_queue(self, user, deck, cards):
+        """测试修改卡组每日新卡上限后队列重建"""
+        load_review_queue(user, 10)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.patch(f'/api/decks/{deck.id}/', {'daily_new_limit': 5}, format='json')
+
+        assert response.status_code == 200
+        assert ReviewQueue.objects.get(user=user).is_stale
+        assert load_review_queue(user, 10)['stats']['returned_count'] == 7
+
+    def test_undo_invalidates_queue(self, user, cards):
+        """测试撤销复习后队列重建"""
+        due, _ = cards
+        load_review_queue(user, 10)
+        review_log = process_review(Card.objects.get(id=due[0].id), quality=4, time_taken=1000)
+
+        undo_review(review_log)
+
+        assert ReviewQueue.objects.get(user=user).is_stale
+        assert due[0].id in queue_ids(load_review_queue(user, 10))
+
+    def test_rebuild_command(self, user, cards):
+        """测试重建命令"""
+        call_command('rebuild_review_queues', limit=10, stdout=StringIO())
+
+        queue = ReviewQueue.objects.get(user=user)
+        assert len(queue.entries) == 5
+        assert queue.session_limit == 10
@@ -0,0 +1,163 @@
+"""
+调度器与 FSRS 测试
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from cards.models import Deck, Card, ReviewLog
+from cards.services import fsrs
+from cards.services.schedulers import FSRSScheduler, SM2Scheduler, get_scheduler
+from cards.services.sm2 import process_review, undo_review
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def fsrs_deck(user):
+    """创建使用 FSRS 的卡组"""
+    return Deck.objects.create(user=user, name='FSRS Deck', scheduler='fsrs')
+
+
+@pytest.fixture
+def card(user, fsrs_deck):
+    """创建 FSRS 卡组中的新卡"""
+    return Card.objects.create(user=user, deck=fsrs_deck, word='test', card_type='en')
+
+
+def test_get_scheduler(fsrs_deck):
+    assert isinstance(get_scheduler(fsrs_deck), FSRSScheduler)
+    assert isinstance(get_scheduler(None), SM2Scheduler)
+
+
+class TestFSRSScheduler:
+    """测试 FSRS 调度"""
+
+    def test_new_card_good_graduates(self, card):
+        process_review(card, quality=4, time_taken=1000)
+
+        card.refresh_from_db()
+        assert card.state == 'review'
+        assert card.stability == pytest.approx(fsrs.DEFAULT_WEIGHTS[2])
+        assert card.interval == fsrs.next_interval(fsrs.DEFAULT_WEIGHTS[2])
+        # FSRS 不修改 SM-2 的 EF
+        assert card.ef == 2.5
+
+    def test_review_again_lapses_and_undo_restores(self, card):
+        process_review(card, quality=4, time_taken=1000)
+        card.refresh_from_db()
+        stability = card.stability
+
+        review_log = process_review(card, quality=0, time_taken=1000)
+        card.refresh_from_db()
+        assert card.state == 'learning'
+        assert card.lapses == 1
+        assert card.stability < stability
+
+        undo_review(review_log)
+        card.refresh_from_db()
+        assert card.state == 'review'
+        assert card.lapses == 0
+        assert card.stability == stability
+
+    def test_hard_is_a_pass(self, card):
+        process_review(card, quality=4, time_taken=1000)
+        card.refresh_from_db()
+
+        process_review(card, quality=2, time_taken=1000)
+        card.refresh_from_db()
+        assert card.state == 'review'
+        assert card.lapses == 0
+
+
+def _synthetic_history(weights, cards=200, reviews=8, seed=0):
+    """用给定参数生成复习历史（回忆与否按模型概率采样）"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    rows = []
+    for card_id in range(cards):
+        rating = int(rng.choice([1, 2, 3, 4], p=[0.2, 0.1, 0.6, 0.1]))
+        s = float(fsrs.init_stability(weights, rating))
+        d = float(fsrs.init_difficulty(weights, rating))
+        t = start
+        rows.append((card_id, t, {1: 0, 2: 2, 3: 4, 4: 5}[rating]))
+        for _ in range(reviews - 1):
+            gap = max(1, int(fsrs.next_interval(s) * rng.uniform(0.5, 2)))
+            t = t + timedelta(days=gap)
+            r = float(fsrs.retrievability(gap, s))
+            rating = 3 if rng.random() < r else 1
+            rows.append((card_id, t, 4 if rating == 3 else 0))
+            if rating == 1:
+                s = float(fsrs.forget_stability(weights, d, s, r))
+            else:
+                s = float(fsrs.recall_stability(weights, d, s, r, rating))
+            d = float(fsrs.next_difficulty(weights, d, rating))
+    return rows
+
+
+class TestOptimizer:
+    """测试参数优化"""
+
+    def test_optimizer_reduces_log_loss(self):
+        true_weights = list(fsrs.DEFAULT_WEIGHTS)
+        true_weights[8] = 2.2
+        true_weights[11] = 1.2
+        rows = _synthetic_history(true_weights)
+
+        result = fsrs.optimize_weights(rows, iterations=30)
+
+        assert result['optimized']
+        assert result['reviews'] == 200 * 7
+        assert result['log_loss_after'] < result['log_loss_before']
+        assert abs(result['predicted_retention'] - result['actual_retention']) < 0.05
+
+    def test_time_limit_stops_early(self):
+        rows = _synthetic_history(fsrs.DEFAULT_WEIGHTS)
+
+        result = fsrs.optimize_weights(rows, iterations=1000, time_limit=0)
+
+        assert result['optimized']
+        assert result['iterations'] == 1
+        assert result['log_loss_after'] <= result['log_loss_before']
+
+    def test_too_few_reviews(self):
+        result = fsrs.optimize_weights(_synthetic_history(fsrs.DEFAULT_WEIGHTS, cards=3, reviews=3))
+
+        assert not result['optimized']
+        assert result['weights'] == [round(w, 4) for w in fsrs.DEFAULT_WEIGHTS]
+
+    def test_optimize_endpoint(self, user, fsrs_deck):
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.post(f'/api/decks/{fsrs_deck.id}/optimize-scheduler/')
+        assert response.status_code == 400
+
+        rows = _synthetic_history(fsrs.DEFAULT_WEIGHTS, cards=20, reviews=5)
+        cards = {}
+        logs = []
+        for card_id, reviewed_at, quality in rows:
+            if card_id not in cards:
+                cards[card_id] = Card.objects.create(
+                    user=user, deck=fsrs_deck, word=f'w{card_id}', card_type='en'
+                )
+            logs.append(ReviewLog(
+                card=cards[card_id], user=user, quality=quality, time_taken=1000,
+                before_state='review', before_ef=2.5, before_interval=1, before_due_at=timezone.now(),
+                after_state='review', after_ef=2.5, after_interval=1, after_due_at=timezone.now(),
+                reviewed_at=reviewed_at,
+            ))
+        ReviewLog.objects.bulk_create(logs)
+
+        response = client.post(f'/api/decks/{fsrs_deck.id}/optimize-scheduler/')
+        assert response.status_code == 200
+        assert response.data['reviews'] == 80
+
+        fsrs_deck.refresh_from_db()
+        assert len(fsrs_deck.scheduler_params['weights']) == len(fsrs.DEFAULT_WEIGHTS)
@@ -0,0 +1,117 @@
+"""
+语义指纹测试
+"""
+import pytest
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from cards.models import Deck, Card, generate_semantic_hash
+
+
+@pytest.fixture
+def user(db):
+    """创建测试用户"""
+    return User.objects.create_user(username='testuser', password='testpass123')
+
+
+@pytest.fixture
+def deck(user):
+    """创建测试卡组"""
+    return Deck.objects.create(user=user, name='Test Deck')
+
+
+def test_save_computes_hash(user, deck):
+    card = Card.objects.create(user=user, deck=deck, word='Apple', card_type='en', metadata={'meaning_zh': '苹果'})
+    assert card.semantic_hash == generate_semantic_hash('apple', '苹果')
+
+    card.metadata = {'meaning': '苹果公司'}
+    card.save(update_fields=['metadata'])
+    card.refresh_from_db()
+    assert card.semantic_hash == generate_semantic_hash('apple', '苹果公司')
+
+    # 重复卡片可以创建，但不占用指纹
+    duplicate = Card.objects.create(user=user, deck=deck, word='apple', card_type='en', metadata={'meaning': '苹果公司'})
+    assert duplicate.semantic_hash == ''
+
+
+def test_review_save_skips_hash(user, deck, django_assert_num_queries):
+    card = Card.objects.create(user=user, deck=deck, word='apple', card_type='en')
+
+    with django_assert_num_queries(1):
+        card.save(update_fields=['state'])
+
+
+def test_bulk_create_fills_hash(user, deck):
+    Card.objects.create(user=user, deck=deck, word='a', card_type='en')
+
+    cards = Card.objects.bulk_create([
+        Card(user=user, deck=deck, word=word, card_type='en') for word in ['a', 'b', 'B']
+    ])
+
+    assert [card.semantic_hash for card in cards] == ['', generate_semantic_hash('b', ''), '']
+
+
+def test_api_created_card_is_found_by_import(user, deck):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.post('/api/cards/', {
+        'deck': deck.id, 'word': 'apple', 'card_type': 'en', 'metadata': {'meaning_zh': '苹果'},
+    }, format='json')
+
+    from cards.services.import_export import ImportExportService
+    result = ImportExportService.import_cards_stream(StringIO('Front,Back\napple,苹果\n'), 'csv', user, deck)
+    assert result['skipped'] == 1
+
+
+def test_delete_hands_hash_to_oldest_duplicate(user, deck):
+    holder, first, second = (
+        Card.objects.create(user=user, deck=deck, word=word, card_type='en', metadata={'meaning_zh': '苹果'})
+        for word in ['apple', 'Apple', ' APPLE']
+    )
+    other_deck = Deck.objects.create(user=user, name='Other')
+    Card.objects.create(user=user, deck=other_deck, word='pineapple', card_type='en')
+
+    holder.delete()
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.semantic_hash, second.semantic_hash) == (generate_semantic_hash('apple', '苹果'), '')
+
+    # 导入仍能识别为重复
+    from cards.services.import_export import ImportExportService
+    result = ImportExportService.import_cards_stream(StringIO('Front,Back\napple,苹果\n'), 'csv', user, deck)
+    assert result['skipped'] == 1
+
+    # 删除整个卡组时交给其他卡组中的重复卡片
+    moved = Card.objects.create(user=user, deck=other_deck, word='apple', card_type='en', metadata={'meaning_zh': '苹果'})
+    deck.delete()
+    moved.refresh_from_db()
+    assert moved.semantic_hash == generate_semantic_hash('apple', '苹果')
+
+
+def test_concurrent_duplicate_gets_blank_hash(user, deck):
+    Card.objects.create(user=user, deck=deck, word='apple', card_type='en')
+
+    # 模拟查重之后、写入之前另一个请求创建了同一张卡片
+    with mock.patch('cards.models.clear_taken_semantic_hashes'):
+        card = Card.objects.create(user=user, deck=deck, word='apple', card_type='en')
+
+    assert card.pk and card.semantic_hash == ''
+    assert Card.objects.filter(user=user).count() == 2
+
+
+def test_backfill_command(user, deck):
+    Card.objects.bulk_create([
+        Card(user=user, deck=deck, word=f'w{i % 4}', card_type='en', semantic_hash=f'x{i}') for i in range(5)
+    ])
+    Card.objects.update(semantic_hash='')
+
+    out = StringIO()
+    call_command('backfill_semantic_hashes', batch_size=2, stdout=out)
+
+    hashes = list(Card.objects.order_by('id').values_list('semantic_hash', flat=True))
+    assert hashes[:4] == [generate_semantic_hash(f'w{i}', '') for i in range(4)]
+    assert hashes[4] == ''
+    assert '写入指纹 4 张' in out.getvalue()
@@ -164,6 +164,66 @@ class TestQueueGeneration:
         assert cards[0].id == due_card.id  # 到期卡片在前
 
 
+    def test_tiers_and_quotas(self, user, deck):
+        """测试到期/难项/新卡分层顺序及新卡配额"""
+        deck.daily_new_limit = 2
+        deck.save()
+
+        now = timezone.now()
+        later_due = Card.objects.create(
+            user=user, deck=deck, word='due2', card_type='en',
+            state='review', due_at=now - timedelta(hours=1),
+        )
+        earlier_due = Card.objects.create(
+            user=user, deck=deck, word='due1', card_type='en',
+            state='review', due_at=now - timedelta(days=2), lapses=4,
+        )
+        leech = Card.objects.create(
+            user=user, deck=deck, word='leech', card_type='en',
+            state='review', due_at=now + timedelta(days=3), lapses=5,
+        )
+        new_cards = [
+            Card.objects.create(user=user, deck=deck, word=f'new{i}', card_type='en', state='new')
+            for i in range(4)
+        ]
+        # 未到期且非难项的卡片不应进入队列
+        Card.objects.create(
+            user=user, deck=deck, word='future', card_type='en',
+            state='review', due_at=now + timedelta(days=1),
+        )
+
+        result = generate_review_queue(user, limit=10)
+        ids = [c.id for c in result['cards']]
+
+        assert ids == [earlier_due.id, later_due.id, leech.id, new_cards[0].id, new_cards[1].id]
+        assert result['stats']['due_count'] == 2
+        assert result['stats']['leech_count'] == 1
+        assert result['stats']['new_count'] == 2
+        assert result['stats']['total_new'] == 4
+
+    def test_query_budget(self, user, deck, django_assert_max_num_queries):
+        """测试队列生成的查询次数预算: 非空队列 1 次, 空队列最多 2 次"""
+        for i in range(30):
+            Card.objects.create(
+                user=user, deck=deck, word=f'due{i}', card_type='en',
+                state='review', due_at=timezone.now() - timedelta(days=1), lapses=i % 5,
+            )
+            Card.objects.create(user=user, deck=deck, word=f'new{i}', card_type='en', state='new')
+
+        with django_assert_max_num_queries(1):
+            result = generate_review_queue(user, limit=20)
+            # 访问关联对象不应触发额外查询
+            [(c.deck.name, c.user.username) for c in result['cards']]
+
+        assert result['stats']['returned_count'] == 20
+
+        other = User.objects.create_user(username='empty', password='testpass123')
+        with django_assert_max_num_queries(2):
+            result = generate_review_queue(other, limit=20)
+
+        assert result['cards'] == []
+
+
 class TestMarkLeech:
     """测试难项标记"""
 
@@ -476,4 +476,95 @@ class ReviewAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('card', response.data)
 
+    def test_submit_review_batch(self):
+        """测试批量提交复习"""
+        first = Card.objects.create(user=self.user, deck=self.deck, word='first', card_type='en', state='new')
+        second = Card.objects.create(user=self.user, deck=self.deck, word='second', card_type='en', state='new')
+        reviewed_at = timezone.now() - timezone.timedelta(hours=2)
+
+        data = {'reviews': [
+            {'card_id': first.id, 'quality': 4, 'time_taken': 3000, 'reviewed_at': reviewed_at.isoformat()},
+            {'card_id': 999999, 'quality': 4},
+            {'card_id': first.id, 'quality': 4, 'time_taken': 2000},
+            {'card_id': second.id, 'quality': 0, 'time_taken': 1000},
+        ]}
+        response = self.client.post('/api/review/submit-batch/', data, format='json')
 
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['applied'], 3)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertFalse(response.data['results'][1]['ok'])
+
+        # 同一张卡片按顺序应用两次: 学习步骤 0 -> 1 -> 毕业
+        first.refresh_from_db()
+        self.assertEqual(first.state, 'review')
+        self.assertEqual(first.interval, 1)
+        self.assertEqual(response.data['results'][2]['state'], 'review')
+
+        logs = ReviewLog.objects.filter(card=first).order_by('reviewed_at')
+        self.assertEqual(logs.count(), 2)
+        self.assertEqual(logs[0].reviewed_at, reviewed_at)
+        self.assertEqual(logs[1].before_state, 'learning')
+
+    def test_submit_review_batch_query_count(self):
+        """测试批量提交的查询次数不随条目数增长"""
+        cards = [
+            Card.objects.create(user=self.user, deck=self.deck, word=f'w{i}', card_type='en', state='new')
+            for i in range(20)
+        ]
+        data = {'reviews': [{'card_id': card.id, 'quality': 4} for card in cards]}
+        # 每日统计按日期写入: 当天行不存在时为 UPDATE + 保存点内 INSERT
+
+        with self.assertNumQueries(12):
+            response = self.client.post('/api/review/submit-batch/', data, format='json')
+
+        self.assertEqual(response.data['applied'], 20)
+
+    def test_submit_review_batch_invalid_quality(self):
+        """测试批量提交无效评分"""
+        card = Card.objects.create(user=self.user, deck=self.deck, word='test', card_type='en')
+
+        response = self.client.post('/api/review/submit-batch/', {
+            'reviews': [{'card_id': card.id, 'quality': 3}]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ReviewLog.objects.exists())
+
+
+class ExportAPITestCase(APITestCase):
+    """导出 API 测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.deck = Deck.objects.create(user=self.user, name='Test Deck')
+        for i in range(3):
+            Card.objects.create(
+                user=self.user, deck=self.deck, word=f'w{i}', card_type='en', tags=['a', 'b'],
+                metadata={'meaning': f'释义{i}', 'svg_front': '<svg/>', 'svg_back': '<svg/>'},
+            )
+
+    def test_export_csv_streaming(self):
+        """测试流式导出 CSV"""
+        response = self.client.get('/api/cards/export/', {'format': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(lines[0], 'Front,Back,Tags,State,Interval,EF,Created')
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith('w0,释义0,"a,b",'))
+
+    def test_export_json_compact(self):
+        """测试流式导出 JSON 及精简模式"""
+        import json
+
+        response = self.client.get('/api/cards/export/', {'format': 'json'})
+        cards = json.loads(b''.join(response.streaming_content))['cards']
+        self.assertEqual([card['Front'] for card in cards], ['w0', 'w1', 'w2'])
+        self.assertIn('svg_front', cards[0]['Metadata'])
+
+        response = self.client.get('/api/cards/export/', {'format': 'json', 'compact': 'true'})
+        cards = json.loads(b''.join(response.streaming_content))['cards']
+        self.assertEqual(cards[0]['Metadata'], {'meaning': '释义0'})
@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 
+# ASGI 部署时单个字典查询使用异步视图
+if settings.DICT_ASYNC_VIEWS:
+    lookup_english, lookup_hanzi = views.lookup_english_async, views.lookup_hanzi_async
+else:
+    lookup_english, lookup_hanzi = views.lookup_english, views.lookup_hanzi
+
 router = DefaultRouter()
 router.register(r'decks', views.DeckViewSet, basename='deck')
 router.register(r'cards', views.CardViewSet, basename='card')
@@ -18,15 +25,27 @@ urlpatterns = [
     # 复习相关
     path('review/queue/', views.get_review_queue, name='review-queue'),
     path('review/submit/', views.submit_review, name='review-submit'),
+    path('review/submit-batch/', views.submit_review_batch, name='review-submit-batch'),
     path('review/undo/', views.undo_review, name='review-undo'),
+    path('review/forecast/', views.review_forecast, name='review-forecast'),
+
+    # 复习分析相关
+    path('analytics/heatmap/', views.analytics_heatmap, name='analytics-heatmap'),
+    path('analytics/retention/', views.analytics_retention, name='analytics-retention'),
+    path('analytics/time/', views.analytics_time, name='analytics-time'),
+    path('analytics/lapses/', views.analytics_lapses, name='analytics-lapses'),
 
     # 字典查询相关
-    path('dict/en/<str:word>/', views.lookup_english, name='lookup-english'),
-    path('dict/zh/<str:char>/', views.lookup_hanzi, name='lookup-hanzi'),
+    path('dict/en/batch/', views.lookup_english_batch, name='lookup-english-batch'),
+    path('dict/zh/batch/', views.lookup_hanzi_batch, name='lookup-hanzi-batch'),
     path('dict/zh/infer-pinyin/', views.infer_pinyin, name='infer-pinyin'),
+    path('dict/zh/infer-pinyin/batch/', views.infer_pinyin_batch, name='infer-pinyin-batch'),
+    path('dict/en/<str:word>/', lookup_english, name='lookup-english'),
+    path('dict/zh/<str:char>/', lookup_hanzi, name='lookup-hanzi'),
 
     # 导入导出相关
     path('cards/import/', views.import_cards, name='cards-import'),
+    path('cards/import/<int:job_id>/', views.import_job_status, name='cards-import-job'),
     path('cards/export/', views.export_cards, name='cards-export'),
 
     # AI相关
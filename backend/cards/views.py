@@ -1,10 +1,12 @@
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes, throttle_classes
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.throttling import AnonRateThrottle
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
+from django.views.decorators.http import require_GET
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
@@ -12,7 +14,8 @@ from .models import Deck, Card, ReviewLog, AIConfig
 from .serializers import (
     UserSerializer, UserRegistrationSerializer,
     DeckSerializer, CardSerializer, CardListSerializer,
-    ReviewLogSerializer, AIConfigSerializer, AISummarizeRequestSerializer
+    ReviewLogSerializer, AIConfigSerializer, AISummarizeRequestSerializer,
+    ReviewBatchSerializer, CardImportSerializer, CardExportSerializer, ImportJobSerializer
 )
 
 
@@ -25,6 +28,21 @@ class RegisterRateThrottle(AnonRateThrottle):
     rate = '5/hour'
 
 
+class CSVRenderer(BaseRenderer):
+    """
+    CSV 渲染器
+
+    DRF 会把查询参数 format=csv 当作输出格式，需要有对应的渲染器才能进入视图；
+    导出内容由视图直接流式返回，这里只负责渲染错误信息。
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data)
+
+
 # 认证相关视图
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -99,6 +117,32 @@ class DeckViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def perform_update(self, serializer):
+        from .services.review_queue import invalidate_review_queue
+
+        old_limit = serializer.instance.daily_new_limit
+        deck = serializer.save()
+        # 新卡配额来自卡组的每日新卡上限
+        if deck.daily_new_limit != old_limit:
+            invalidate_review_queue(deck.user_id)
+
+    @action(detail=True, methods=['post'], url_path='optimize-scheduler')
+    def optimize_scheduler(self, request, pk=None):
+        """根据卡组的复习记录拟合 FSRS 参数"""
+        from .services.fsrs import MIN_REVIEWS_FOR_OPTIMIZATION
+        from .services.schedulers import optimize_deck_scheduler
+
+        deck = self.get_object()
+        result = optimize_deck_scheduler(deck)
+
+        if not result['optimized']:
+            return Response({
+                **result,
+                'message': f"复习记录不足，至少需要 {MIN_REVIEWS_FOR_OPTIMIZATION} 次复习",
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({**result, 'message': '参数优化完成'})
+
 
 class CardViewSet(viewsets.ModelViewSet):
     """卡片 ViewSet"""
@@ -130,6 +174,22 @@ class CardViewSet(viewsets.ModelViewSet):
             card.due_at = timezone.now() + timedelta(minutes=LEARNING_STEPS[0])
             card.save(update_fields=['due_at'])
 
+    def perform_update(self, serializer):
+        from .services.analytics import invalidate_analytics
+        from .services.review_queue import invalidate_review_queue
+
+        # 编辑可能改变卡片的状态、到期时间等，队列层级无法逐条判断
+        card = serializer.save()
+        invalidate_review_queue(card.user_id)
+        invalidate_analytics(card.user_id)
+
+    def perform_destroy(self, instance):
+        from .services.review_queue import invalidate_review_queue
+
+        user_id = instance.user_id
+        instance.delete()
+        invalidate_review_queue(user_id)
+
     @action(detail=False, methods=['get'])
     def due_today(self, request):
         """获取今日到期卡片"""
@@ -152,36 +212,26 @@ class CardViewSet(viewsets.ModelViewSet):
     def stats(self, request):
         """获取用户卡片统计信息"""
         from django.utils import timezone
-        from django.db.models import Count
-        from datetime import timedelta
-
-        user_cards = self.get_queryset()
-        today = timezone.now().date()
-
-        # 今日待复习数量
-        due_today = user_cards.filter(
-            due_at__date__lte=today,
-            state__in=['learning', 'review']
-        ).count()
+        from django.db.models import Count, Q
+        from datetime import datetime, time, timedelta
 
-        # 新卡片数量
-        new_cards = user_cards.filter(state='new').count()
+        from .services.daily_stats import get_streak
 
-        # 总卡片数
-        total_cards = user_cards.count()
+        today = timezone.localdate()
+        end_of_today = timezone.make_aware(datetime.combine(today + timedelta(days=1), time.min))
 
-        # 计算连续打卡天数
-        review_logs = ReviewLog.objects.filter(user=request.user).values('reviewed_at__date').distinct().order_by('-reviewed_at__date')
-        streak = 0
-        check_date = today
+        # 一次聚合查询得到各项计数；到期条件使用 due_at 范围以便命中 (user, due_at) 索引
+        counts = self.get_queryset().aggregate(
+            due_today=Count('id', filter=Q(state__in=['learning', 'review'], due_at__lt=end_of_today)),
+            new_cards=Count('id', filter=Q(state='new')),
+            total_cards=Count('id'),
+        )
+        due_today = counts['due_today']
+        new_cards = counts['new_cards']
+        total_cards = counts['total_cards']
 
-        for log in review_logs:
-            log_date = log['reviewed_at__date']
-            if log_date == check_date:
-                streak += 1
-                check_date -= timedelta(days=1)
-            elif log_date < check_date:
-                break
+        # 连续打卡天数（读取每日统计表）
+        streak = get_streak(request.user, today)
 
         return Response({
             'due_today': due_today,
@@ -255,10 +305,11 @@ def get_review_queue(request):
     如果有待复习卡片，返回正常的复习队列
     如果没有待复习卡片，返回掌握度最低的 10 张卡片用于巩固练习
     """
-    from .services.sm2 import generate_review_queue, get_lowest_mastery_cards
+    from .services.sm2 import get_lowest_mastery_cards
+    from .services.review_queue import load_review_queue
 
     limit = int(request.query_params.get('limit', 50))
-    result = generate_review_queue(request.user, limit)
+    result = load_review_queue(request.user, limit)
 
     # 如果没有待复习卡片，返回掌握度最低的卡片
     if not result['cards']:
@@ -307,7 +358,15 @@ def submit_review(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        card = Card.objects.get(id=card_id, user=request.user)
+        quality = int(quality)
+        time_taken = int(time_taken)
+    except (TypeError, ValueError):
+        return Response({
+            'error': 'quality 和 time_taken 必须是整数'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        card = Card.objects.select_related('deck').get(id=card_id, user=request.user)
     except Card.DoesNotExist:
         return Response({
             'error': '卡片不存在'
@@ -323,6 +382,66 @@ def submit_review(request):
     })
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_review_batch(request):
+    """
+    批量提交复习评分（离线客户端重连后一次性同步）
+
+    POST /api/review/submit-batch/
+    {
+        "reviews": [
+            {"card_id": 1, "quality": 4, "time_taken": 5000, "reviewed_at": "2025-01-01T08:00:00Z"},
+            ...
+        ]
+    }
+
+    返回:
+    {
+        "results": [
+            {"card_id": 1, "ok": true, "state": "review", "interval": 1, "ef": 2.5,
+             "due_at": "...", "review_log_id": 10},
+            {"card_id": 2, "ok": false, "error": "卡片不存在"},
+            ...
+        ],
+        "applied": 1,
+        "failed": 1
+    }
+    """
+    from .services.sm2 import process_review_batch
+
+    serializer = ReviewBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    items = serializer.validated_data['reviews']
+    outcomes = process_review_batch(request.user, items)
+
+    results = []
+    for item, outcome in zip(items, outcomes):
+        if outcome is None:
+            results.append({'card_id': item['card_id'], 'ok': False, 'error': '卡片不存在'})
+            continue
+
+        card, review_log = outcome
+        results.append({
+            'card_id': card.id,
+            'ok': True,
+            'state': review_log.after_state,
+            'interval': review_log.after_interval,
+            'ef': review_log.after_ef,
+            'due_at': review_log.after_due_at,
+            'review_log_id': review_log.id,
+        })
+
+    applied = sum(1 for result in results if result['ok'])
+    return Response({
+        'results': results,
+        'applied': applied,
+        'failed': len(results) - applied,
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def undo_review(request):
@@ -355,13 +474,140 @@ def undo_review(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def review_forecast(request):
+    """
+    预测未来每天的复习负荷
+
+    GET /api/review/forecast/?days=90
+
+    参数:
+    - days: 预测天数 (1-365)，默认 90
+
+    返回:
+    {
+        "days": 90,
+        "start_date": "2025-01-01",
+        "forecast": [{"date": "2025-01-01", "reviews": 42}, ...],
+        "total_reviews": 1234,
+        "rating_distribution": {"0": 0.1, "2": 0.15, "4": 0.6, "5": 0.15},
+        "new_per_day": 20
+    }
+    """
+    from .services.forecast import forecast_workload
+
+    try:
+        days = int(request.query_params.get('days', 90))
+    except ValueError:
+        return Response({'error': 'days 必须是整数'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not 1 <= days <= 365:
+        return Response({'error': 'days 必须在 1 到 365 之间'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(forecast_workload(request.user, days=days))
+
+
+# 复习分析相关视图
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def analytics_heatmap(request):
+    """
+    活动热力图
+
+    GET /api/analytics/heatmap/?days=365
+
+    参数:
+    - days: 天数 (1-730)，默认 365
+
+    返回:
+    {
+        "start_date": "2024-01-02",
+        "end_date": "2025-01-01",
+        "days": [{"date": "2024-12-31", "reviews": 42, "time_spent": 360000}, ...],
+        "total_reviews": 1234,
+        "active_days": 180
+    }
+    """
+    from .services.analytics import get_heatmap
+
+    try:
+        days = int(request.query_params.get('days', 365))
+    except ValueError:
+        return Response({'error': 'days 必须是整数'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not 1 <= days <= 730:
+        return Response({'error': 'days 必须在 1 到 730 之间'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(get_heatmap(request.user, days=days))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def analytics_retention(request):
+    """
+    按复习前间隔分段的真实保持率
+
+    GET /api/analytics/retention/
+
+    返回:
+    {
+        "buckets": [{"bucket": "1d", "reviews": 100, "passed": 85, "retention": 0.85}, ...],
+        "overall": 0.88
+    }
+    """
+    from .services.analytics import get_retention
+
+    return Response(get_retention(request.user))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def analytics_time(request):
+    """
+    平均每张卡片的复习耗时
+
+    GET /api/analytics/time/
+
+    返回:
+    {
+        "reviews": 1234,
+        "total_time": 7404000,
+        "average_time": 6000,
+        "by_quality": {"0": 9000, "2": 7500, "4": 5000, "5": 3000}
+    }
+    """
+    from .services.analytics import get_time_stats
+
+    return Response(get_time_stats(request.user))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def analytics_lapses(request):
+    """
+    卡片遗忘次数分布
+
+    GET /api/analytics/lapses/
+
+    返回:
+    {
+        "histogram": [{"lapses": 0, "cards": 500}, {"lapses": 1, "cards": 80}, ...],
+        "max_bucket": 10
+    }
+    """
+    from .services.analytics import get_lapse_histogram
+
+    return Response(get_lapse_histogram(request.user))
+
+
 # 字典查询 API
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def lookup_english(request, word):
     """查询英语单词"""
-    from .models import ECDict
     from django.core.cache import cache
+    from .services.ecdict import entry_to_result, get_entry
 
     # 尝试从缓存获取
     cache_key = f'dict:en:{word.lower()}'
@@ -370,47 +616,23 @@ def lookup_english(request, word):
         cached_result['source'] = 'cache'
         return Response(cached_result)
 
-    # 从数据库查询
-    try:
-        entry = ECDict.objects.get(word__iexact=word)
-
-        # 提取 CEFR 等级 (从 tag 字段)
-        cefr = None
-        if entry.tag:
-            tags = entry.tag.lower().split()
-            cefr_levels = ['a1', 'a2', 'b1', 'b2', 'c1', 'c2']
-            for tag in tags:
-                if tag in cefr_levels:
-                    cefr = tag.upper()
-                    break
-
-        result = {
-            'word': entry.word,
-            'ipa': entry.phonetic,
-            'pos': entry.pos,
-            'meaning_en': entry.definition,
-            'meaning_zh': entry.translation,
-            'frequency': entry.frq,
-            'cefr': cefr,
-            'examples': [],  # ECDICT 无例句
-            'collins': entry.collins,
-            'oxford': entry.oxford,
-            'source': 'local-dict'
-        }
+    # 从字典库查询（主数据库或独立字典文件）
+    entry = get_entry(word)
+    if entry is not None:
+        result = entry_to_result(entry)
 
         # 缓存结果（1天）
         cache.set(cache_key, result, timeout=86400)
 
         return Response(result)
 
-    except ECDict.DoesNotExist:
-        return Response({
-            'error': 'Word not found',
-            'source': 'manual'
-        }, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'error': 'Word not found',
+        'source': 'manual'
+    }, status=status.HTTP_404_NOT_FOUND)
 
 
-def _save_hanzi_to_local(char: str, result: dict, db_path: str):
+def _save_hanzi_to_local(char: str, result: dict):
     """
     将百度汉语查询结果保存到本地数据库
     使用单独的 hanzi_baidu 表避免与原有 hanzi 表冲突
@@ -418,56 +640,14 @@ def _save_hanzi_to_local(char: str, result: dict, db_path: str):
     Args:
         char: 汉字
         result: 百度汉语返回的结果字典
-        db_path: 数据库路径
     """
-    import sqlite3
-    import os
     import logging
+    from .services.hanzi import hanzi_repository
 
     logger = logging.getLogger(__name__)
 
     try:
-        # 确保数据库目录存在
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # 创建专用表 hanzi_baidu（如果不存在）
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS hanzi_baidu (
-                char TEXT PRIMARY KEY,
-                pinyin TEXT,
-                radical TEXT,
-                strokes INTEGER,
-                frequency INTEGER DEFAULT 0,
-                meaning TEXT,
-                examples TEXT,
-                traditional TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # 插入或更新数据
-        cursor.execute("""
-            INSERT OR REPLACE INTO hanzi_baidu
-            (char, pinyin, radical, strokes, frequency, meaning, examples, traditional, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (
-            char,
-            ','.join(result.get('pinyin', [])) if isinstance(result.get('pinyin'), list) else str(result.get('pinyin', '')),
-            result.get('radical', ''),
-            result.get('strokes', 0),
-            result.get('frequency', 0),
-            result.get('meaning_zh', ''),
-            '|'.join(result.get('examples', [])) if isinstance(result.get('examples'), list) else '',
-            result.get('traditional', '')
-        ))
-
-        conn.commit()
-        conn.close()
-
+        hanzi_repository.save(char, result)
         logger.info(f"汉字 '{char}' 已保存到本地数据库 (hanzi_baidu 表)")
 
     except Exception as e:
@@ -480,15 +660,19 @@ def lookup_hanzi(request, char):
     """
     查询汉字 - 四层降级策略
     L1: 缓存 (cache)
+    L1.5: 本地字典快照 (local-dict，配置 HANZI_BLOB_PATH 时启用，内存映射查找)
     L2: 本地字典库 (local-dict)
     L3: 百度汉语API (baidu-hanyu)
     L4: 手动输入 (manual)
+
+    百度汉语也未收录的字会缓存“未找到”（HANZI_NEGATIVE_CACHE_TIMEOUT 秒），期间不再请求百度汉语；
+    百度汉语不可用（熔断中）时直接降级到 L4。
     """
-    import sqlite3
     from django.conf import settings
     from django.core.cache import cache
-    import os
-    from .services.baidu_hanyu import BaiduHanyuService
+    from .services import hanzi_blob
+    from .services.baidu_hanyu import BaiduHanyuService, BaiduHanyuUnavailable
+    from .services.hanzi import hanzi_repository
 
     # L1: 尝试从缓存获取
     cache_key = f'dict:zh:{char}'
@@ -497,82 +681,54 @@ def lookup_hanzi(request, char):
         cached_result['source'] = 'cache'
         return Response(cached_result)
 
+    # L1.5: 本地字典快照（进程内存映射，比缓存更快，命中时不再写缓存）
+    try:
+        entry = hanzi_blob.lookup(char)
+        if entry:
+            return Response(entry.to_result())
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"本地汉字快照查询失败: {e}")
+
     # L2: 从本地汉字数据库查询
-    hanzi_db_path = os.path.join(settings.BASE_DIR.parent, 'data', 'hanzi_local.db')
+    try:
+        entry = hanzi_repository.get(char)
+        if entry:
+            local_result = entry.to_result()
+            # 缓存结果（1天）
+            cache.set(cache_key, local_result, timeout=86400)
+            return Response(local_result)
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"本地汉字数据库查询失败: {e}")
 
-    local_result = None
-    if os.path.exists(hanzi_db_path):
+    # L3: 本地未找到,调用百度汉语API（之前确认百度汉语也未收录时跳过）
+    missing_key = f'dict:zh:missing:{char}'
+    if not cache.get(missing_key):
         try:
-            conn = sqlite3.connect(hanzi_db_path)
-            cursor = conn.cursor()
+            baidu_result = BaiduHanyuService.fetch(char)
 
-            # 先查询 hanzi_baidu 表（百度API缓存）
-            cursor.execute(
-                "SELECT char, pinyin, radical, strokes, frequency, meaning, examples, traditional FROM hanzi_baidu WHERE char = ?",
-                (char,)
-            )
-            row = cursor.fetchone()
-
-            # 如果 hanzi_baidu 没有，再查询原有的 hanzi 表
-            if not row:
-                cursor.execute(
-                    "SELECT * FROM hanzi WHERE character = ?",
-                    (char,)
-                )
-                row = cursor.fetchone()
-
-                # 旧表结构兼容处理
-                if row and len(row) > 5:
-                    # 旧结构: id, character, decomposition, rationality_score, pinyin, traditional, ...
-                    local_result = {
-                        'char': row[1],  # character
-                        'pinyin': row[4].split(',') if row[4] else [],  # pinyin
-                        'traditional': row[5] if len(row) > 5 else '',  # traditional
-                        'source': 'local-dict'
-                    }
-            else:
-                # 新表结构 hanzi_baidu
-                local_result = {
-                    'char': row[0],
-                    'pinyin': row[1].split(',') if row[1] else [],
-                    'radical': row[2] or '',
-                    'strokes': row[3] or 0,
-                    'frequency': row[4] or 0,
-                    'meaning_zh': row[5] or '',
-                    'examples': row[6].split('|') if row[6] else [],
-                    'traditional': row[7] or '',
-                    'source': 'local-dict'
-                }
-
-            conn.close()
-
-            if local_result:
+            if baidu_result:
                 # 缓存结果（1天）
-                cache.set(cache_key, local_result, timeout=86400)
-                return Response(local_result)
-
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"本地汉字数据库查询失败: {e}")
+                cache.set(cache_key, baidu_result, timeout=86400)
 
-    # L3: 本地未找到,调用百度汉语API
-    try:
-        baidu_result = BaiduHanyuService.lookup(char)
+                # 自动保存到本地数据库
+                _save_hanzi_to_local(char, baidu_result)
 
-        if baidu_result:
-            # 缓存结果（1天）
-            cache.set(cache_key, baidu_result, timeout=86400)
+                return Response(baidu_result)
 
-            # 自动保存到本地数据库
-            _save_hanzi_to_local(char, baidu_result, hanzi_db_path)
+            # 百度汉语未收录: 缓存“未找到”，有效期比正常结果短
+            cache.set(missing_key, True, timeout=settings.HANZI_NEGATIVE_CACHE_TIMEOUT)
 
-            return Response(baidu_result)
-
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"百度汉语查询失败: {e}")
+        except BaiduHanyuUnavailable:
+            # 请求失败或熔断中，不缓存“未找到”
+            pass
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning(f"百度汉语查询失败: {e}")
 
     # L4: 所有数据源均失败,返回手动输入提示
     return Response({
@@ -582,56 +738,211 @@ def lookup_hanzi(request, char):
     }, status=status.HTTP_404_NOT_FOUND)
 
 
+def _check_throttles(request):
+    """
+    按 DRF 默认限流规则（DEFAULT_THROTTLE_CLASSES）检查异步视图的请求
+
+    异步视图不经过 DRF 的 APIView，这里用与同步视图相同的认证和限流类计数，
+    两者共用同一份缓存计数。
+
+    Returns:
+        超出频率时返回 429 响应，否则返回 None
+    """
+    from django.http import JsonResponse
+    from rest_framework.exceptions import Throttled
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    waits = [
+        throttle.wait()
+        for throttle in (throttle_class() for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES)
+        if not throttle.allow_request(drf_request, None)
+    ]
+    if not waits:
+        return None
+
+    waits = [wait for wait in waits if wait is not None]
+    exc = Throttled(max(waits, default=None))
+    response = JsonResponse({'detail': exc.detail}, status=exc.status_code, json_dumps_params={'ensure_ascii': False})
+    if exc.wait is not None:
+        response['Retry-After'] = '%d' % exc.wait
+    return response
+
+
+@require_GET
+async def lookup_english_async(request, word):
+    """查询英语单词（异步版本，DICT_ASYNC_VIEWS 开启时替代 lookup_english）"""
+    from asgiref.sync import sync_to_async
+    from django.http import JsonResponse
+    from .services.dict_async import lookup_english
+
+    throttled = await sync_to_async(_check_throttles)(request)
+    if throttled is not None:
+        return throttled
+
+    result = await lookup_english(word)
+    if result is None:
+        result, status_code = {'error': 'Word not found', 'source': 'manual'}, status.HTTP_404_NOT_FOUND
+    else:
+        status_code = status.HTTP_200_OK
+    return JsonResponse(result, status=status_code, json_dumps_params={'ensure_ascii': False})
+
+
+@require_GET
+async def lookup_hanzi_async(request, char):
+    """
+    查询汉字（异步版本，DICT_ASYNC_VIEWS 开启时替代 lookup_hanzi）
+
+    降级策略与 lookup_hanzi 相同；等待百度汉语时不占用线程，
+    同一个字的并发请求只向百度汉语查询一次。
+    """
+    from asgiref.sync import sync_to_async
+    from django.http import JsonResponse
+    from .services.dict_async import lookup_hanzi
+
+    throttled = await sync_to_async(_check_throttles)(request)
+    if throttled is not None:
+        return throttled
+
+    result = await lookup_hanzi(char)
+    if result is None:
+        result, status_code = {
+            'error': 'Character not found in any data source',
+            'source': 'manual',
+            'message': '未找到该字的字典信息,请手动输入释义'
+        }, status.HTTP_404_NOT_FOUND
+    else:
+        status_code = status.HTTP_200_OK
+    return JsonResponse(result, status=status_code, json_dumps_params={'ensure_ascii': False})
+
+
+def _batch_lookup(request, cache_key, lookup_many):
+    """
+    批量字典查询: 先 cache.get_many，未命中的再一次批量查询字典库
+
+    Args:
+        request: 请求对象
+        cache_key: 输入项 -> 缓存键
+        lookup_many: 未命中的输入项列表 -> {输入项: 查询结果}
+
+    Returns:
+        Response: {'results': {输入项: 查询结果}, 'found': 找到的数量, 'missing': [未找到的输入项]}
+    """
+    from django.core.cache import cache
+    from .serializers import DictBatchLookupSerializer
+
+    serializer = DictBatchLookupSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    items = list(dict.fromkeys(serializer.validated_data['items']))
+
+    keys = {item: cache_key(item) for item in items}
+    cached = cache.get_many(keys.values())
+    results = {}
+    for item, key in keys.items():
+        if cached.get(key):
+            results[item] = {**cached[key], 'source': 'cache'}
+
+    found = lookup_many([item for item in items if item not in results])
+    # 缓存结果（1天）
+    cache.set_many({keys[item]: result for item, result in found.items()}, timeout=86400)
+    results.update(found)
+
+    missing = [item for item in items if item not in results]
+    for item in missing:
+        results[item] = {'error': 'Not found', 'source': 'manual'}
+
+    return Response({
+        'results': results,
+        'found': len(items) - len(missing),
+        'missing': missing,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def lookup_english_batch(request):
+    """
+    批量查询英语单词（不调用外部接口）
+
+    请求: {"items": ["apple", "Banana", ...]}（最多 500 个）
+    返回: 按输入单词索引的查询结果，source 标明来自缓存（cache）、字典库（local-dict）
+          还是未找到（manual）
+    """
+    from .services.ecdict import entry_to_result, get_entries, normalize_word
+
+    def lookup_many(words):
+        entries = get_entries(words)
+        return {
+            word: entry_to_result(entries[normalize_word(word)])
+            for word in words
+            if normalize_word(word) in entries
+        }
+
+    return _batch_lookup(request, lambda word: f'dict:en:{word.lower()}', lookup_many)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def lookup_hanzi_batch(request):
+    """
+    批量查询汉字（只查缓存、本地字典快照和本地字典库，不逐字调用百度汉语）
+
+    请求: {"items": ["学", "习", ...]}（最多 500 个）
+    返回: 同 lookup_english_batch
+    """
+    from .services import hanzi_blob
+    from .services.hanzi import hanzi_repository
+
+    def lookup_many(chars):
+        blob = hanzi_blob.get_blob()
+        entries = {char: entry for char in chars if blob and (entry := blob.get(char))}
+        rest = [char for char in chars if char not in entries]
+        if rest:
+            entries.update(hanzi_repository.get_many(rest))
+        return {char: entry.to_result() for char, entry in entries.items()}
+
+    return _batch_lookup(request, lambda char: f'dict:zh:{char}', lookup_many)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def infer_pinyin(request):
-    """基于语境推断多音字读音"""
-    import jieba
-    from pypinyin import lazy_pinyin, Style
+    """
+    基于语境推断多音字读音
 
-    char = request.data.get('char')
-    context = request.data.get('context', '')
+    请求: {"char": "行", "context": "我去银行取钱"}（语境可省略，最多 2000 字）
+    """
+    from .serializers import InferPinyinSerializer
+    from .services.pinyin import infer
 
-    if not char:
-        return Response({
-            'error': '缺少必需参数: char'
-        }, status=status.HTTP_400_BAD_REQUEST)
+    serializer = InferPinyinSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(infer(serializer.validated_data['char'], serializer.validated_data['context']))
 
-    if not context:
-        # 无语境，返回所有候选
-        return Response({
-            'char': char,
-            'pinyin': None,
-            'confidence': 0,
-            'alternatives': lazy_pinyin(char, style=Style.TONE)
-        })
 
-    # 使用 jieba 分词
-    words = jieba.lcut(context)
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def infer_pinyin_batch(request):
+    """
+    推断句子中所有多音字的读音（整句只分词一次）
 
-    # 查找包含该字的词
-    for word in words:
-        if char in word:
-            # 使用 pypinyin 获取词组读音
-            pinyins = lazy_pinyin(word, style=Style.TONE)
-            char_index = word.index(char)
+    请求: {"text": "我去银行取钱"}（最多 2000 字）
+    返回: {"text": ..., "results": [{"index": 3, "char": "行", "pinyin": "háng", "confidence": 0.9,
+                                     "word": "银行", "alternatives": ["xíng", "háng", ...]}, ...]}
+    """
+    from .serializers import PinyinBatchSerializer
+    from .services.pinyin import infer_text
 
-            return Response({
-                'char': char,
-                'pinyin': pinyins[char_index],
-                'confidence': 0.9,  # 高置信度
-                'word': word,
-                'alternatives': lazy_pinyin(char, style=Style.TONE)
-            })
+    serializer = PinyinBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    # 降级：使用字符级推断
-    pinyin = lazy_pinyin(char, style=Style.TONE)[0]
-    return Response({
-        'char': char,
-        'pinyin': pinyin,
-        'confidence': 0.6,  # 中等置信度
-        'alternatives': lazy_pinyin(char, style=Style.TONE)
-    })
+    text = serializer.validated_data['text']
+    return Response({'text': text, 'results': infer_text(text)})
 
 
 # ==================== 导入导出功能 ====================
@@ -640,7 +951,7 @@ def infer_pinyin(request):
 @permission_classes([IsAuthenticated])
 def import_cards(request):
     """
-    导入卡片
+    创建导入任务（后台执行，立即返回任务 ID）
 
     POST /api/cards/import/
     Content-Type: multipart/form-data
@@ -651,78 +962,96 @@ def import_cards(request):
     - deck_id: 目标卡组ID
     - card_type: 卡片类型 ('en' 或 'zh')，默认 'en'
     - conflict_strategy: 冲突处理策略 ('skip', 'overwrite', 'merge')，默认 'skip'
+    - enrich: 是否用本地字典补全元数据（英语: 音标、词性、词频、CEFR；汉字: 拼音、部首、笔画），默认 false
 
-    返回:
+    文件按流式读取、分批写入（见 ImportExportService.import_cards_stream），
+    格式错误的记录会被跳过并计入 failed。进度通过 GET /api/cards/import/<job_id>/ 查询。
+
+    返回 (202):
     {
-        "total": 1000,
-        "imported": 850,
-        "skipped": 100,
-        "failed": 50,
-        "errors": ["错误信息1", ...],
-        "duplicates": [{"index": 1, "word": "apple", ...}, ...]
+        "job_id": 1,
+        "status": "pending",
+        "total": 0,
+        ...
     }
     """
-    from .services.import_export import ImportExportService
+    from .services.import_jobs import create_import_job
 
     serializer = CardImportSerializer(data=request.data, context={'request': request})
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    # 获取参数
-    uploaded_file = serializer.validated_data['file']
-    file_format = serializer.validated_data['format']
-    deck_id = serializer.validated_data['deck_id']
-    card_type = serializer.validated_data['card_type']
-    conflict_strategy = serializer.validated_data['conflict_strategy']
+    deck = Deck.objects.get(id=serializer.validated_data['deck_id'], user=request.user)
+    job = create_import_job(
+        user=request.user,
+        deck=deck,
+        uploaded_file=serializer.validated_data['file'],
+        file_format=serializer.validated_data['format'],
+        card_type=serializer.validated_data['card_type'],
+        conflict_strategy=serializer.validated_data['conflict_strategy'],
+        enrich=serializer.validated_data['enrich'],
+    )
 
-    try:
-        # 读取文件内容
-        file_content = uploaded_file.read().decode('utf-8')
-
-        # 获取卡组
-        deck = Deck.objects.get(id=deck_id, user=request.user)
-
-        # 执行导入
-        result = ImportExportService.import_cards(
-            file_content=file_content,
-            file_format=file_format,
-            user=request.user,
-            deck=deck,
-            card_type=card_type,
-            conflict_strategy=conflict_strategy
-        )
+    return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-        return Response(result, status=status.HTTP_200_OK)
 
-    except UnicodeDecodeError:
-        return Response(
-            {'error': '文件编码错误，请使用 UTF-8 编码'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    except Exception as e:
-        return Response(
-            {'error': f'导入失败: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_job_status(request, job_id):
+    """
+    查询导入任务进度
+
+    GET /api/cards/import/<job_id>/
+
+    返回:
+    {
+        "job_id": 1,
+        "status": "running",         // pending / running / completed / failed
+        "total": 5000,               // 已处理条数
+        "imported": 4800,
+        "skipped": 150,
+        "failed": 50,
+        "batches": 5,
+        "errors": ["错误信息1", ...],
+        "duplicates": [{"index": 1, "word": "apple", ...}, ...],
+        "error_message": "",
+        "throughput": 2500.0,        // 条/秒
+        ...
+    }
+    """
+    from .models import ImportJob
+    from .services.import_jobs import fail_stale_job
+
+    try:
+        job = ImportJob.objects.get(id=job_id, user=request.user)
+    except ImportJob.DoesNotExist:
+        return Response({'error': '导入任务不存在'}, status=status.HTTP_404_NOT_FOUND)
+
+    # 执行任务的进程已重启时，任务不会再有进展
+    fail_stale_job(job)
+    return Response(ImportJobSerializer(job).data)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, CSVRenderer])
 def export_cards(request):
     """
-    导出卡片
+    导出卡片（流式响应，内存占用与卡片数量无关）
 
     GET /api/cards/export/?format=csv&deck_id=1
 
     参数:
     - format: 导出格式 ('csv' 或 'json')，默认 'csv'
     - deck_id: 卡组ID（可选），不指定则导出所有卡片
+    - compact: 是否省略 SVG 等体积较大的元数据（仅 JSON），默认 false
 
     返回:
     文件下载（CSV 或 JSON）
     """
     from .services.import_export import ImportExportService
-    from django.http import HttpResponse
+    from django.http import StreamingHttpResponse
+    from django.utils import timezone
 
     serializer = CardExportSerializer(data=request.query_params)
     if not serializer.is_valid():
@@ -730,33 +1059,27 @@ def export_cards(request):
 
     file_format = serializer.validated_data['format']
     deck_id = serializer.validated_data.get('deck_id')
-
-    try:
-        # 查询卡片
-        cards = Card.objects.filter(user=request.user).select_related('deck')
-        if deck_id:
-            cards = cards.filter(deck_id=deck_id)
-
-        # 导出
-        if file_format == 'csv':
-            content = ImportExportService.export_cards_to_csv(cards)
-            content_type = 'text/csv'
-            filename = f'cards_export_{timezone.now().strftime("%Y%m%d")}.csv'
-        else:  # json
-            content = ImportExportService.export_cards_to_json(cards)
-            content_type = 'application/json'
-            filename = f'cards_export_{timezone.now().strftime("%Y%m%d")}.json'
-
-        # 创建响应
-        response = HttpResponse(content, content_type=content_type)
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
-
-    except Exception as e:
-        return Response(
-            {'error': f'导出失败: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    compact = serializer.validated_data['compact']
+
+    # 查询卡片
+    cards = Card.objects.filter(user=request.user).order_by('id')
+    if deck_id:
+        cards = cards.filter(deck_id=deck_id)
+
+    # 导出
+    if file_format == 'csv':
+        content = ImportExportService.iter_cards_csv(cards)
+        content_type = 'text/csv; charset=utf-8'
+        filename = f'cards_export_{timezone.now().strftime("%Y%m%d")}.csv'
+    else:  # json
+        content = ImportExportService.iter_cards_json(cards, compact=compact)
+        content_type = 'application/json'
+        filename = f'cards_export_{timezone.now().strftime("%Y%m%d")}.json'
+
+    # 创建流式响应
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
 
 # AI配置相关视图
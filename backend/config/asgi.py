@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# 只在服务进程中预热拼音服务（manage.py 命令和测试不加载本模块）
+from django.conf import settings  # noqa: E402
+
+if settings.PINYIN_WARM_UP:
+    from cards.services.pinyin import warm_up
+
+    warm_up()
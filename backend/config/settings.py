@@ -185,3 +185,39 @@ REST_FRAMEWORK = {
         'register': '5/hour',  # 注册接口每小时5次
     }
 }
+
+# 后台导入任务
+# 上传文件暂存目录（任务结束后删除）
+IMPORT_UPLOAD_DIR = os.environ.get('DJANGO_IMPORT_UPLOAD_DIR', str(BASE_DIR / 'data' / 'imports'))
+# 导入线程数
+IMPORT_JOB_WORKERS = int(os.environ.get('DJANGO_IMPORT_JOB_WORKERS', '2'))
+# 为 True 时在请求线程内同步执行导入任务（测试用）
+IMPORT_JOBS_EAGER = False
+# 未完成的任务超过多少秒没有写回进度即视为已丢失（执行它的进程已重启），查询进度时标记为失败
+IMPORT_JOB_STALE_TIMEOUT = int(os.environ.get('DJANGO_IMPORT_JOB_STALE_TIMEOUT', '600'))
+
+# FSRS 参数拟合（optimize-scheduler 接口）的最长耗时（秒），超时后保存当前最优参数
+FSRS_OPTIMIZE_TIME_LIMIT = float(os.environ.get('DJANGO_FSRS_OPTIMIZE_TIME_LIMIT', '10'))
+
+# ECDICT 独立只读字典文件（如 BASE_DIR.parent / 'data' / 'ecdict.db'），为空时查询主数据库的 ecdict 表
+# 由 python manage.py import_ecdict stardict.csv --sidecar 生成
+ECDICT_SIDECAR_PATH = os.environ.get('DJANGO_ECDICT_SIDECAR_PATH', '')
+
+# 本地汉字字典的只读快照（如 BASE_DIR.parent / 'data' / 'hanzi_local.bin'），汉字查询在缓存之后、
+# 本地数据库之前先查快照；为空时不使用。由 python manage.py build_hanzi_blob 生成
+HANZI_BLOB_PATH = os.environ.get('DJANGO_HANZI_BLOB_PATH', '')
+
+# 百度汉语回退（汉字查询 L3）
+# 本地和百度汉语都查不到的字，缓存“未找到”结果的秒数（比正常结果的 1 天短）
+HANZI_NEGATIVE_CACHE_TIMEOUT = int(os.environ.get('DJANGO_HANZI_NEGATIVE_CACHE_TIMEOUT', '3600'))
+# 连续失败多少次后熔断，熔断后多少秒内不再请求百度汉语
+BAIDU_HANYU_FAILURE_THRESHOLD = int(os.environ.get('DJANGO_BAIDU_HANYU_FAILURE_THRESHOLD', '5'))
+BAIDU_HANYU_COOLDOWN = int(os.environ.get('DJANGO_BAIDU_HANYU_COOLDOWN', '60'))
+
+# 单个字典查询（dict/en/<word>/、dict/zh/<char>/）使用异步视图，ASGI 部署（config.asgi）时开启
+DICT_ASYNC_VIEWS = os.environ.get('DJANGO_DICT_ASYNC_VIEWS', 'False') == 'True'
+
+# 多音字读音推断: 服务进程（config.wsgi / config.asgi）启动时在后台预加载 jieba 词典；
+# (汉字, 语境) 推断结果的 LRU 缓存条数
+PINYIN_WARM_UP = os.environ.get('DJANGO_PINYIN_WARM_UP', 'True') == 'True'
+PINYIN_CACHE_SIZE = int(os.environ.get('DJANGO_PINYIN_CACHE_SIZE', '4096'))
@@ -6,23 +6,45 @@ import Papa from 'papaparse'
  * 提供卡片的导入导出功能
  */
 
+// 导入任务轮询间隔（毫秒）
+const IMPORT_POLL_INTERVAL = 1000
+
+// 导入任务连续多久没有进展后停止轮询（毫秒），略长于服务端判定任务丢失的时间（10 分钟）
+const IMPORT_STALL_TIMEOUT = 11 * 60 * 1000
+
+/**
+ * 查询导入任务进度
+ * @param {number} jobId - 导入任务ID
+ * @returns {Promise<object>} 任务状态（status, total, imported, skipped, failed, throughput ...）
+ */
+export async function getImportJob(jobId) {
+  const response = await axios.get(`/api/cards/import/${jobId}/`)
+  return response.data
+}
+
 /**
  * 导入卡片
+ *
+ * 上传后服务器在后台执行导入，这里轮询任务进度直到完成。
+ *
  * @param {File} file - 文件对象 (CSV 或 JSON)
  * @param {string} format - 文件格式 ('csv' 或 'json')
  * @param {number} deckId - 目标卡组ID
  * @param {string} cardType - 卡片类型 ('en' 或 'zh')
  * @param {string} conflictStrategy - 冲突策略 ('skip', 'overwrite', 'merge')
- * @param {function} onProgress - 进度回调函数
+ * @param {function} onProgress - 上传进度回调函数（百分比）
+ * @param {function} onJobProgress - 导入进度回调函数（任务状态）
+ * @param {boolean} enrich - 是否用本地字典补全音标、拼音等元数据
  * @returns {Promise<object>} 导入结果
  */
-export async function importCards(file, format, deckId, cardType = 'en', conflictStrategy = 'skip', onProgress = null) {
+export async function importCards(file, format, deckId, cardType = 'en', conflictStrategy = 'skip', onProgress = null, onJobProgress = null, enrich = false) {
   const formData = new FormData()
   formData.append('file', file)
   formData.append('format', format)
   formData.append('deck_id', deckId)
   formData.append('card_type', cardType)
   formData.append('conflict_strategy', conflictStrategy)
+  formData.append('enrich', enrich)
 
   try {
     const response = await axios.post('/api/cards/import/', formData, {
@@ -37,9 +59,38 @@ export async function importCards(file, format, deckId, cardType = 'en', conflic
       }
     })
 
+    let job = response.data
+    let lastProgress = null
+    let lastProgressAt = Date.now()
+    while (job.status === 'pending' || job.status === 'running') {
+      const progress = `${job.status}:${job.batches}:${job.total}`
+      if (progress !== lastProgress) {
+        lastProgress = progress
+        lastProgressAt = Date.now()
+      } else if (Date.now() - lastProgressAt > IMPORT_STALL_TIMEOUT) {
+        return {
+          success: false,
+          error: '导入任务长时间没有进展，请重新上传文件'
+        }
+      }
+
+      await new Promise(resolve => setTimeout(resolve, IMPORT_POLL_INTERVAL))
+      job = await getImportJob(job.job_id)
+      if (onJobProgress) {
+        onJobProgress(job)
+      }
+    }
+
+    if (job.status === 'failed') {
+      return {
+        success: false,
+        error: job.error_message || '导入失败'
+      }
+    }
+
     return {
       success: true,
-      data: response.data
+      data: job
     }
   } catch (error) {
     return {